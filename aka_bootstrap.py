@@ -0,0 +1,89 @@
+"""
+Bootstrap-Konfidenzintervalle für die Zonen-Anteile aller Teams auf einmal.
+
+Die Zonen-Prozente beruhen oft auf 10-30 Toren; zone_bootstrap() zieht für
+jede Gruppe (Team x Seite x Datenart) BOOTSTRAP_RESAMPLES Stichproben mit
+Zurücklegen aus ihren Zonen-Nummern. Statt einzelne Punkte zu ziehen, wird
+pro Gruppe gezählt, wie viele Punkte jede Zonen-Signatur (Standard-Zone plus
+Kombination eigener Zonen) hat; das Ziehen mit Zurücklegen von n Punkten ist
+dann genau eine Multinomial-Verteilung über die Signaturen. Ein einziger
+Aufruf von Generator.multinomial erzeugt alle Stichproben (Stichproben x
+Gruppen x Signaturen), unabhängig von der Anzahl Punkte.
+
+select_zone_intervals() liefert daraus die Intervall-Grenzen in Prozent für
+ein Team oder (team=None) alle Teams zusammen; dann, und bei "both", werden
+die Stichproben der einzelnen Gruppen addiert (geschichteter Bootstrap).
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from aka_data import SIDES
+from aka_zones import DATA_TYPES, PARTITION_SIZE, ZONE_NAMES, ZONES, as_points, zone_membership
+
+# Anzahl Bootstrap-Stichproben und Konfidenzniveau
+BOOTSTRAP_RESAMPLES = 2000
+CONFIDENCE = 0.95
+# Fester Startwert: gleiche Daten ergeben gleiche Intervalle (keine springenden Beschriftungen)
+BOOTSTRAP_SEED = 0
+
+
+def zone_bootstrap(teams_data: Dict[str, Dict[str, Any]], resamples: int = BOOTSTRAP_RESAMPLES,
+                   seed: int = BOOTSTRAP_SEED) -> Dict[str, Any]:
+    """
+    Bootstrap-Zählungen aller Teams: "resampled" hat die Form (Stichproben,
+    Teams, Seiten, Datenarten, Zonen), "totals" (Teams, Seiten, Datenarten);
+    Achsen-Beschriftungen wie bei aka_zones.zone_stats().
+    """
+    teams = list(teams_data)
+    point_sets = [as_points(teams_data[team][side][data_type])
+                  for team in teams for side in SIDES for data_type in DATA_TYPES]
+    shape = (len(teams), len(SIDES), len(DATA_TYPES))
+    n_groups = len(point_sets)
+    sizes = np.array([len(points) for points in point_sets], dtype=np.int64)
+    groups = np.repeat(np.arange(n_groups), sizes)
+    ids, member = zone_membership(np.concatenate(point_sets) if point_sets else np.empty((0, 2)))
+
+    # Signatur pro Punkt: Standard-Zone und Kombination der eigenen Zonen
+    if member.shape[1]:
+        overlay = np.unique(member, axis=0, return_inverse=True)[1].reshape(-1)
+    else:
+        overlay = np.zeros(len(ids), dtype=np.int64)
+    signature_keys, first, signature = np.unique(overlay * PARTITION_SIZE + ids, return_index=True,
+                                                 return_inverse=True)
+    signature = signature.reshape(-1)
+    n_signatures = max(len(signature_keys), 1)
+    # Zonen jeder Signatur (Signaturen x Zonen)
+    zones_of = np.zeros((n_signatures, len(ZONES)), dtype=np.int64)
+    zones_of[np.arange(len(first)), ids[first]] = 1
+    zones_of[:len(first), PARTITION_SIZE:] = member[first]
+
+    counts = np.bincount(groups * n_signatures + signature,
+                         minlength=n_groups * n_signatures).reshape(n_groups, n_signatures)
+    pvals = np.divide(counts, sizes[:, None], out=np.zeros(counts.shape), where=sizes[:, None] > 0)
+    pvals[sizes == 0, 0] = 1.0
+    rng = np.random.default_rng(seed)
+    resampled = rng.multinomial(sizes, pvals, size=(resamples, n_groups)) @ zones_of
+    return {"teams": teams, "sides": list(SIDES), "data_types": list(DATA_TYPES), "zones": list(ZONE_NAMES),
+            "totals": sizes.reshape(shape),
+            "resampled": resampled.astype(np.int32).reshape((resamples,) + shape + (len(ZONES),))}
+
+
+def select_zone_intervals(bootstrap: Dict[str, Any], side: str, data_type: str, team: Optional[str] = None,
+                          confidence: float = CONFIDENCE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Untere und obere Grenze des Konfidenzintervalls (Prozent) pro Zone für eine Seite.
+    team=None summiert über alle Teams, data_type="both" über Tore und Assists.
+    """
+    team_index = slice(None) if team is None else [bootstrap["teams"].index(team)]
+    type_index = slice(None) if data_type == "both" else [bootstrap["data_types"].index(data_type)]
+    side_index = bootstrap["sides"].index(side)
+    total = int(np.asarray(bootstrap["totals"])[team_index, side_index][:, type_index].sum())
+    if total == 0:
+        empty = np.zeros(len(bootstrap["zones"]))
+        return empty, empty.copy()
+    resampled = np.asarray(bootstrap["resampled"])[:, team_index, side_index][:, :, type_index]
+    shares = resampled.sum(axis=(1, 2)) * (100.0 / total)
+    tail = (1 - confidence) / 2 * 100
+    lower, upper = np.percentile(shares, [tail, 100 - tail], axis=0)
+    return lower, upper
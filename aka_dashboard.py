@@ -2,13 +2,36 @@ import streamlit as st
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import matplotlib.image as mpimg
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 import numpy as np
 import os
-import re
-import ast
-import time
-from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Tuple, Any
+
+from aka_bootstrap import CONFIDENCE, select_zone_intervals, zone_bootstrap
+from aka_data import SIDES, STORE_DIR, read_only
+from aka_figures import ImageCache, figure_diagnostics, new_figure
+from aka_hotspots import team_hotspots
+from aka_passes import PASS_ZONE_NAMES, pass_stats, select_pass_stats
+from aka_pitch import draw_pitch
+from aka_sqlite import SQLITE_FILE, SqliteEventIndex
+from aka_vega import field_spec, zone_label_rows
+from aka_watch import LiveEventStore
+from aka_zones import (OVERLAY_ZONES, REST_ZONE, ZONE_BY_NAME, ZONE_CONFIG_ERRORS, ZONE_NAMES, ZONES,
+                       ZoneHistograms, as_points, percentages_by_zone, percentages_from_counts, select_zone_stats,
+                       zone_stats)
+
+# SV Ried Logo als Spielfeld-Hintergrund (falls vorhanden)
+FIELD_LOGO_PATH = "C:\\Temp\\SV_Ried.png"
+# Markergröße (scatter s) der Tore und Assists auf dem Spielfeld
+EVENT_MARKER_SIZE = 50
+
+# Darstellung der Spielfeld- und Ecken-Ansicht (pro Ansicht in der Sidebar wählbar):
+# "matplotlib" (Bild vom Server, gecacht) oder "vega" (Vega-Lite im Browser, nur Koordinaten, mit Tooltip und Zoom)
+FIELD_RENDERERS = {"Bild": "matplotlib", "Interaktiv": "vega"}
+
+# Backend für Zonen-Abfragen: "memory" (NumPy) oder "sqlite" (R*Tree-Index)
+EVENT_BACKEND = os.environ.get("AKA_EVENT_BACKEND", "memory")
 
 # Konfiguration der Seite
 st.set_page_config(
@@ -73,231 +96,164 @@ st.markdown("""
 
 # Dark Mode CSS bereits oben definiert
 
-@st.cache_data(ttl=300, max_entries=20)
-def extract_goals_and_assists_from_file(file_path: str, file_mod_time: float) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+@st.cache_resource
+def get_live_event_store(base_path: str = ".") -> LiveEventStore:
     """
-    Extrahiert Goals und Assists aus einer Python-Datei.
-    Sucht nach Zeilen mit 'goals = [...]' und 'assists = [...]'
-    file_mod_time wird als Cache-Key verwendet, um Cache-Invalidierung bei Dateiänderungen zu gewährleisten.
+    Prozessweiter Event-Store mit Datei-Watcher (einmal pro Server-Prozess).
+    Änderungen an den Team-Dateien werden per Ereignis gemeldet und nur die
+    betroffenen Segmente neu eingelesen.
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # Regex-Pattern für goals und assists
-        goals_pattern = r'goals\s*=\s*\[(.*?)\]'
-        assists_pattern = r'assists\s*=\s*\[(.*?)\]'
-        
-        goals_match = re.search(goals_pattern, content, re.DOTALL)
-        assists_match = re.search(assists_pattern, content, re.DOTALL)
-        
-        goals = []
-        assists = []
-        
-        if goals_match:
-            goals_str = goals_match.group(1).strip()
-            if goals_str:
-                # Parse die Liste von Tupeln
-                try:
-                    goals = ast.literal_eval(f'[{goals_str}]')
-                except:
-                    # Fallback: manuell parsen
-                    goals = parse_coordinates(goals_str)
-        
-        if assists_match:
-            assists_str = assists_match.group(1).strip()
-            if assists_str:
-                try:
-                    assists = ast.literal_eval(f'[{assists_str}]')
-                except:
-                    assists = parse_coordinates(assists_str)
-        
-        return goals, assists
-    
-    except Exception as e:
-        return [], []
+    return LiveEventStore(base_path)
 
-def parse_coordinates(coord_str: str) -> List[Tuple[int, int]]:
+@st.cache_resource(max_entries=200)
+def get_team_side_data(season: str, team: str, goal_type_key: str, segment_version: int,
+                       situation: str = None, match: str = None) -> Dict[str, Any]:
     """
-    Parst Koordinaten aus einem String.
-    Behandelt verschiedene Formate wie (x,y), (x, y), etc.
+    Daten einer Team-Seite einer Saison aus dem Live-Store (read-only, prozessweit geteilt).
+    segment_version ist der Cache-Key: der Eintrag wird nur ungültig, wenn sich
+    genau diese Team-Datei ändert. situation/match filtern über den Index des Stores.
     """
-    coordinates = []
-    # Entferne Leerzeichen und teile bei Kommas
-    coord_str = coord_str.replace(' ', '')
-    
-    # Finde alle Tupel-Pattern
-    pattern = r'\((\d+(?:\.\d+)?),(\d+(?:\.\d+)?)\)'
-    matches = re.findall(pattern, coord_str)
-    
-    for match in matches:
-        try:
-            x = int(float(match[0]))
-            y = int(float(match[1]))
-            coordinates.append((x, y))
-        except ValueError:
-            continue
-    
-    return coordinates
+    return read_only(get_live_event_store().store.side_data(team, goal_type_key, season,
+                                                            situation=situation, match=match))
 
-# Ecken-Positionen: Assists mit (0,100) = linke Ecke, (68,100) = rechte Ecke (Torlinie)
-CORNER_ASSIST_POSITIONS = [(0, 100), (68, 100)]
+def get_teams_data(live_store: LiveEventStore, season: str = None,
+                   situation: str = None, match: str = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Team-Daten als prozessweiter, unveränderlicher Snapshot: alle Sessions erhalten
+    dieselben Objekte (read-only NumPy-Arrays, keine Kopie pro Rerun).
+    season=None kombiniert alle Saisons eines Teams; situation/match filtern die Events.
+    """
+    return get_dataset_snapshot(live_store, live_store.version, season, situation, match)
 
-def filter_corner_goals_and_assists(goals: List[Tuple[int, int]], assists: List[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+@st.cache_resource(max_entries=32)
+def get_dataset_snapshot(_live_store: LiveEventStore, version: int, season: str = None,
+                         situation: str = None, match: str = None) -> Dict[str, Dict[str, Any]]:
     """
-    Filtert Tore und Assists auf Ecken-Tore: nur Paare, bei denen der Assist
-    an der Position (0, 100) oder (68, 100) erfolgte (Eckball-Positionen).
+    Setzt die Team-Daten aus den (pro Datei gecachten) Segmenten zusammen.
+    version ist der Cache-Key des Live-Stores; unveränderte Segmente werden wiederverwendet.
     """
-    filtered_goals = []
-    filtered_assists = []
-    for i in range(min(len(goals), len(assists))):
-        assist_pos = assists[i]
-        # Unterstütze sowohl Tuple als auch einzelne Werte (falls in Daten mal anders)
-        if isinstance(assist_pos, tuple) and len(assist_pos) >= 2:
-            if (int(assist_pos[0]), int(assist_pos[1])) in CORNER_ASSIST_POSITIONS:
-                filtered_goals.append(goals[i])
-                filtered_assists.append(assists[i])
-        elif assist_pos in CORNER_ASSIST_POSITIONS:
-            filtered_goals.append(goals[i])
-            filtered_assists.append(assists[i])
-    return filtered_goals, filtered_assists
+    live_store = _live_store
+    store = live_store.store
+    seasons = store.seasons if season is None else [season]
+    teams_data = {}
+    for team in store.season_teams(season):
+        teams_data[team] = {}
+        for goal_type_key in ("eigene_tore", "gegentore"):
+            parts = [
+                get_team_side_data(s, team, goal_type_key, live_store.segment_versions.get((s, team, goal_type_key), 0),
+                                   situation, match)
+                for s in seasons if (s, team, goal_type_key) in store.segments
+            ]
+            if len(parts) == 1:
+                teams_data[team][goal_type_key] = parts[0]
+            else:
+                teams_data[team][goal_type_key] = read_only({
+                    "goals": np.concatenate([p["goals"] for p in parts]),
+                    "assists": np.concatenate([p["assists"] for p in parts]),
+                    "pairs": np.concatenate([p["pairs"] for p in parts]),
+                    "title": parts[0]["title"],
+                    "additional_info": " / ".join(p["additional_info"] for p in parts if p["additional_info"]),
+                    "parse_errors": [e for p in parts for e in p["parse_errors"]],
+                })
+    return read_only(teams_data)
 
-@st.cache_data(ttl=300, max_entries=20)
-def extract_additional_info_from_file(file_path: str, file_mod_time: float) -> str:
+@st.cache_resource(max_entries=32)
+def get_corner_snapshot(_live_store: LiveEventStore, version: int, season: str = None,
+                        situation: str = None, match: str = None) -> Dict[str, Dict[str, Any]]:
     """
-    Extrahiert zusätzliche Informationen aus dem plt.title() einer Python-Datei.
-    Sucht nach Zeilen wie plt.title("U18 - Gegentore\n 2 Elfmeter n.b.")
-    file_mod_time wird als Cache-Key verwendet, um Cache-Invalidierung bei Dateiänderungen zu gewährleisten.
+    Ecken-Tore (read-only), einmal pro Datenstand über die beim Einlesen berechnete
+    Standardsituations-Maske des Event-Stores gefiltert (Assist an einer Eckfahne).
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-        
-        # Regex-Pattern für plt.title() mit zusätzlichen Informationen
-        title_pattern = r'plt\.title\(".*?\\n\s*(.*?)"\)'
-        match = re.search(title_pattern, content, re.DOTALL)
-        
-        if match:
-            additional_info = match.group(1).strip()
-            # Entferne führende/trailing Leerzeichen und Zeilenumbrüche
-            additional_info = additional_info.replace('\n', ' ').strip()
-            return additional_info
-        
-        return ""
-    
-    except Exception as e:
-        return ""
+    store = _live_store.store
+    titles = {"eigene_tore": "Eigene Ecken-Tore", "gegentore": "Ecken-Gegentore"}
+    ecken_teams_data = {}
+    for team in store.season_teams(season):
+        ecken_teams_data[team] = {}
+        for side in SIDES:
+            pairs = store.pairs(team, side, season, situation=situation, match=match, set_piece="Ecke")
+            ecken_teams_data[team][side] = {"goals": pairs[:, :2], "assists": pairs[:, 2:], "pairs": pairs,
+                                            "title": f"{team} - {titles[side]}", "additional_info": ""}
+    return read_only(ecken_teams_data)
 
-@st.cache_data(ttl=60, max_entries=1)
-def get_file_modification_times(base_path: str = ".") -> str:
+@st.cache_resource
+def get_zone_histograms() -> ZoneHistograms:
+    """Prozessweite Zonen-Histogramme pro Segment (bei Änderungen werden nur neue/gelöschte Events gezählt)."""
+    return ZoneHistograms()
+
+@st.cache_resource(max_entries=32)
+def get_zone_stats(_live_store: LiveEventStore, version: int, season: str = None,
+                   situation: str = None, match: str = None, corners: bool = False) -> Dict[str, Any]:
     """
-    Erstellt einen String mit den Modifikationszeiten aller relevanten Dateien.
-    Wird als Cache-Key verwendet, um automatisch zu erkennen, wenn Dateien geändert wurden.
+    Zonen-Statistik (Teams x Seiten x Datenarten x Zonen) eines Snapshots, einmal pro
+    Datenstand berechnet; Diagramme und Sidebar lesen nur noch Ausschnitte daraus.
+    Ohne Filter kommt sie aus den inkrementellen Zonen-Histogrammen;
+    corners=True zählt nur die Ecken-Tore (Ecken-Ansicht).
     """
-    teams = ["U15", "U16", "U18", "JWR", "Profis"]
-    modification_times = []
-    
-    for team in teams:
-        if team == "JWR":
-            # Spezielle Behandlung für JWR
-            team_folder = os.path.join(base_path, team)
-            if os.path.exists(team_folder):
-                eigene_tore_file = os.path.join(team_folder, "EigeneToreJWR.py")
-                gegentore_file = os.path.join(team_folder, "GegentoreJWR.py")
-                
-                if os.path.exists(eigene_tore_file):
-                    mod_time = os.path.getmtime(eigene_tore_file)
-                    modification_times.append(f"{team}_eigene_{mod_time}")
-                
-                if os.path.exists(gegentore_file):
-                    mod_time = os.path.getmtime(gegentore_file)
-                    modification_times.append(f"{team}_gegentore_{mod_time}")
-        else:
-            team_folder = os.path.join(base_path, team)
-            if os.path.exists(team_folder):
-                # Prüfe EigeneTore und Gegentore Dateien
-                eigene_tore_file = os.path.join(team_folder, f"EigeneTore{team}.py")
-                gegentore_file = os.path.join(team_folder, f"Gegentore{team}.py")
-                
-                if os.path.exists(eigene_tore_file):
-                    mod_time = os.path.getmtime(eigene_tore_file)
-                    modification_times.append(f"{team}_eigene_{mod_time}")
-                
-                if os.path.exists(gegentore_file):
-                    mod_time = os.path.getmtime(gegentore_file)
-                    modification_times.append(f"{team}_gegentore_{mod_time}")
-    
-    return "_".join(modification_times)
+    if corners:
+        return read_only(zone_stats(get_corner_snapshot(_live_store, version, season, situation, match)))
+    snapshot = get_dataset_snapshot(_live_store, version, season, situation, match)
+    if situation is None and match is None:
+        histograms = get_zone_histograms()
+        histograms.sync(_live_store.store)
+        return read_only(histograms.zone_stats(list(snapshot.keys()), season))
+    return read_only(zone_stats(snapshot))
 
-def load_team_data_from_files(base_path: str = ".") -> Dict[str, Dict[str, Any]]:
+@st.cache_resource(max_entries=32)
+def get_zone_bootstrap(_live_store: LiveEventStore, version: int, season: str = None,
+                       situation: str = None, match: str = None, corners: bool = False) -> Dict[str, Any]:
     """
-    Lädt alle Team-Daten automatisch aus den Dateien im AKA-Ordner.
+    Bootstrap-Stichproben der Zonen-Anteile aller Teams (Konfidenzintervalle),
+    einmal pro Datenstand; corners=True für die Ecken-Tore (Ecken-Ansicht).
     """
-    teams_data = {}
-    
-    # Definiere die verfügbaren Teams und deren Ordner
-    teams = ["U15", "U16", "U18", "JWR", "Profis"]
-    
-    for team in teams:
-        if team == "JWR":
-            # Spezielle Behandlung für JWR
-            team_folder = os.path.join(base_path, team)
-            
-            if not os.path.exists(team_folder):
-                continue
-            
-            # Lade eigene Tore
-            eigene_tore_file = os.path.join(team_folder, "EigeneToreJWR.py")
-            eigene_mod_time = os.path.getmtime(eigene_tore_file) if os.path.exists(eigene_tore_file) else 0
-            eigene_goals, eigene_assists = extract_goals_and_assists_from_file(eigene_tore_file, eigene_mod_time)
-            eigene_additional_info = extract_additional_info_from_file(eigene_tore_file, eigene_mod_time)
-            
-            # Lade Gegentore
-            gegentore_file = os.path.join(team_folder, "GegentoreJWR.py")
-            gegentore_mod_time = os.path.getmtime(gegentore_file) if os.path.exists(gegentore_file) else 0
-            gegentore_goals, gegentore_assists = extract_goals_and_assists_from_file(gegentore_file, gegentore_mod_time)
-            gegentore_additional_info = extract_additional_info_from_file(gegentore_file, gegentore_mod_time)
-        else:
-            team_folder = os.path.join(base_path, team)
-            
-            if not os.path.exists(team_folder):
-                continue
-            
-            # Lade eigene Tore
-            eigene_tore_file = os.path.join(team_folder, f"EigeneTore{team}.py")
-            eigene_mod_time = os.path.getmtime(eigene_tore_file) if os.path.exists(eigene_tore_file) else 0
-            eigene_goals, eigene_assists = extract_goals_and_assists_from_file(eigene_tore_file, eigene_mod_time)
-            eigene_additional_info = extract_additional_info_from_file(eigene_tore_file, eigene_mod_time)
-            
-            # Lade Gegentore
-            gegentore_file = os.path.join(team_folder, f"Gegentore{team}.py")
-            gegentore_mod_time = os.path.getmtime(gegentore_file) if os.path.exists(gegentore_file) else 0
-            gegentore_goals, gegentore_assists = extract_goals_and_assists_from_file(gegentore_file, gegentore_mod_time)
-            gegentore_additional_info = extract_additional_info_from_file(gegentore_file, gegentore_mod_time)
-        
-        # Erstelle Team-Datenstruktur
-        teams_data[team] = {
-        "eigene_tore": {
-                "goals": eigene_goals,
-                "assists": eigene_assists,
-                "title": f"{team} - Eigene Tore",
-                "additional_info": eigene_additional_info
-        },
-        "gegentore": {
-                "goals": gegentore_goals,
-                "assists": gegentore_assists,
-                "title": f"{team} - Gegentore",
-                "additional_info": gegentore_additional_info
-            }
-        }
-    
-    return teams_data
+    if corners:
+        snapshot = get_corner_snapshot(_live_store, version, season, situation, match)
+    else:
+        snapshot = get_dataset_snapshot(_live_store, version, season, situation, match)
+    return read_only(zone_bootstrap(snapshot))
+
+@st.cache_resource(max_entries=32)
+def get_pass_stats(_live_store: LiveEventStore, version: int, season: str = None,
+                   situation: str = None, match: str = None) -> Dict[str, Any]:
+    """Passweg-Verteilungen (Teams x Seiten x Klassen) eines Snapshots, einmal pro Datenstand berechnet."""
+    return read_only(pass_stats(get_dataset_snapshot(_live_store, version, season, situation, match)))
+
+@st.cache_resource(max_entries=32)
+def get_hotspots(_live_store: LiveEventStore, version: int, season: str = None, situation: str = None,
+                 match: str = None, team: str = None, side: str = "eigene_tore") -> Dict[str, Any]:
+    """Hotspots der Tore und Assists eines Teams (team=None: alle Teams), einmal pro Datenstand berechnet."""
+    snapshot = get_dataset_snapshot(_live_store, version, season, situation, match)
+    return read_only(team_hotspots(snapshot, side, None if team is None else [team]))
+
+@st.cache_resource(max_entries=8)
+def get_sqlite_corner_snapshot(_index: SqliteEventIndex, generation: int, teams: Tuple[str, ...],
+                               season: str = None) -> Dict[str, Dict[str, Any]]:
+    """Ecken-Tore über den SQLite-Index (generation ist der Datenstand des Index)."""
+    return read_only(_index.corner_teams_data(list(teams), season))
 
-# Lade Team-Daten automatisch
-@st.cache_data(ttl=300, max_entries=5)  # Cache für 5 Minuten, max 5 Einträge
-def get_teams_data(file_modification_key: str):
-    """Lädt die Team-Daten mit Caching für bessere Performance."""
-    return load_team_data_from_files()
+@st.cache_resource(max_entries=8)
+def get_sqlite_zone_stats(_index: SqliteEventIndex, generation: int, teams: Tuple[str, ...],
+                          season: str = None, corners: bool = False) -> Dict[str, Any]:
+    """Zonen-Statistik über den SQLite-Index (generation ist der Datenstand des Index)."""
+    if corners:
+        return read_only(zone_stats(get_sqlite_corner_snapshot(_index, generation, teams, season)))
+    return read_only(_index.zone_stats(list(teams), season))
+
+@st.cache_resource
+def get_sqlite_index(base_path: str = "."):
+    """
+    SQLite-Index der Events (nur bei AKA_EVENT_BACKEND=sqlite).
+    Gibt None zurück, wenn SQLite ohne R*Tree-Modul kompiliert ist.
+    """
+    try:
+        return SqliteEventIndex(os.path.join(base_path, STORE_DIR, SQLITE_FILE))
+    except RuntimeError:
+        return None
+
+@st.fragment(run_every=1.0)
+def watch_for_data_changes(seen_version: int):
+    """Startet einen Rerun, sobald der Watcher neue Daten gemeldet hat (ohne Datei-Zugriff)."""
+    if get_live_event_store().version != seen_version:
+        st.rerun()
 
 # Datenstrukturen für alle Teams (wird automatisch aktualisiert)
 # TEAMS_DATA wird jetzt in main() geladen mit automatischer Datei-Erkennung
@@ -312,179 +268,120 @@ def load_logo_image(logo_path: str):
             return None
     return None
 
-@st.cache_data(ttl=300, max_entries=50)
-def count_goals_in_dashed_zones(goals_tuple):
-    """Zählt Tore in den gestrichelten Zonen und gibt Prozentsätze zurück, getrennt nach goldenen und roten Zonen"""
-    # Konvertiere Tuple zurück zu Liste für Caching (Tuples sind hashable)
-    goals = list(goals_tuple) if isinstance(goals_tuple, tuple) else goals_tuple
-    total_goals = len(goals)
-    if total_goals == 0:
-        return {
-            'goldene_zone': 0,  # x: 25-43, y: 84-100 (goldene Zone)
-            'rote_zone': 0,     # x: 25-43, y: 75-84 (rote Zone)
-            'zone2': 0,  # x: 14-25, y: 75-84 (links oben)
-            'zone3': 0,  # x: 43-54, y: 75-84 (rechts oben)
-            'zone4': 0,  # x: 0-14, y: 75-90 (links unten)
-            'zone5': 0,  # x: 54-68, y: 75-90 (rechts unten)
-            'zone6': 0,  # x: 14-25, y: 84-100 (links oben erweitert)
-            'zone7': 0,  # x: 43-54, y: 84-100 (rechts oben erweitert)
-            'restliches_spielfeld': 0,  # Alle Tore außerhalb der gestrichelten Zonen
-            'total': 0
-        }
-    
-    goldene_zone_count = 0  # x: 25-43, y: 84-100 (goldene Zone)
-    rote_zone_count = 0      # x: 25-43, y: 75-84 (rote Zone)
-    zone2_count = 0  # x: 14-25, y: 75-84 (links oben)
-    zone3_count = 0  # x: 43-54, y: 75-84 (rechts oben)
-    zone4_count = 0  # x: 0-14, y: 75-90 (links unten)
-    zone5_count = 0  # x: 54-68, y: 75-90 (rechts unten)
-    zone6_count = 0  # x: 14-25, y: 84-100 (links oben erweitert)
-    zone7_count = 0  # x: 43-54, y: 84-100 (rechts oben erweitert)
-    restliches_spielfeld_count = 0  # Alle Tore außerhalb der gestrichelten Zonen
-    
-    for goal in goals:
-        x, y = goal
-        in_dashed_zone = False
-        
-        # Prüfe, ob das Tor in einer gestrichelten Zone liegt (y >= 75)
-        if y >= 75:
-            # Goldene Zone: zentral oben (x: 25-43, y: 84-100)
-            if 25 <= x <= 43 and 84 <= y <= 100:
-                goldene_zone_count += 1
-                in_dashed_zone = True
-            # Zone 14: zentral oben (x: 25-43, y: 75-84)
-            elif 25 <= x <= 43 and 75 <= y < 84:
-                rote_zone_count += 1
-                in_dashed_zone = True
-            # FDl: links oben (zwischen x=14 und x=25, unterhalb y=84)
-            elif 14 <= x < 25 and 75 <= y <= 84:
-                zone2_count += 1
-                in_dashed_zone = True
-            # FDr: rechts oben (zwischen x=43 und x=54, unterhalb y=84)
-            elif 43 < x <= 54 and 75 <= y <= 84:
-                zone3_count += 1
-                in_dashed_zone = True
-            # HFAl: links unten (zwischen x=0 und x=14)
-            elif 0 <= x < 14 and 75 <= y <= 90:
-                zone4_count += 1
-                in_dashed_zone = True
-            # HFAr: rechts unten (zwischen x=54 und x=68)
-            elif 54 < x <= 68 and 75 <= y <= 90:
-                zone5_count += 1
-                in_dashed_zone = True
-            # ND2l 1/2: links oben erweitert (zwischen x=14 und x=25, oberhalb y=84)
-            elif 14 <= x < 25 and 84 < y <= 100:
-                zone6_count += 1
-                in_dashed_zone = True
-            # ND2r 1/2: rechts oben erweitert (zwischen x=43 und x=54, oberhalb y=84)
-            elif 43 < x <= 54 and 84 < y <= 100:
-                zone7_count += 1
-                in_dashed_zone = True
-        
-        # Wenn das Tor nicht in einer gestrichelten Zone liegt, zähle es zum restlichen Spielfeld
-        if not in_dashed_zone:
-            restliches_spielfeld_count += 1
-    
-    return {
-        'goldene_zone': (goldene_zone_count / total_goals * 100) if total_goals > 0 else 0,
-        'rote_zone': (rote_zone_count / total_goals * 100) if total_goals > 0 else 0,
-        'zone2': (zone2_count / total_goals * 100) if total_goals > 0 else 0,
-        'zone3': (zone3_count / total_goals * 100) if total_goals > 0 else 0,
-        'zone4': (zone4_count / total_goals * 100) if total_goals > 0 else 0,
-        'zone5': (zone5_count / total_goals * 100) if total_goals > 0 else 0,
-        'zone6': (zone6_count / total_goals * 100) if total_goals > 0 else 0,
-        'zone7': (zone7_count / total_goals * 100) if total_goals > 0 else 0,
-        'restliches_spielfeld': (restliches_spielfeld_count / total_goals * 100) if total_goals > 0 else 0,
-        'total': total_goals
-    }
+@st.cache_resource
+def get_image_cache() -> ImageCache:
+    """Prozessweiter LRU-Cache der fertig kodierten Diagramm-Bilder (für alle Sitzungen)."""
+    return ImageCache()
 
-@st.cache_data(ttl=300, max_entries=50)
-def count_assists_in_dashed_zones(assists_tuple):
-    """Zählt Assists in den gestrichelten Zonen und gibt Prozentsätze zurück, getrennt nach goldenen und roten Zonen"""
-    # Konvertiere Tuple zurück zu Liste für Caching (Tuples sind hashable)
-    assists = list(assists_tuple) if isinstance(assists_tuple, tuple) else assists_tuple
-    total_assists = len(assists)
-    if total_assists == 0:
-        return {
-            'goldene_zone': 0,  # x: 25-43, y: 84-100 (goldene Zone)
-            'rote_zone': 0,     # x: 25-43, y: 75-84 (rote Zone)
-            'zone2': 0,  # x: 14-25, y: 75-84 (links oben)
-            'zone3': 0,  # x: 43-54, y: 75-84 (rechts oben)
-            'zone4': 0,  # x: 0-14, y: 75-90 (links unten)
-            'zone5': 0,  # x: 54-68, y: 75-90 (rechts unten)
-            'zone6': 0,  # x: 14-25, y: 84-100 (links oben erweitert)
-            'zone7': 0,  # x: 43-54, y: 84-100 (rechts oben erweitert)
-            'restliches_spielfeld': 0,  # Alle Assists außerhalb der gestrichelten Zonen
-            'total': 0
-        }
-    
-    goldene_zone_count = 0  # x: 25-43, y: 84-100 (goldene Zone)
-    rote_zone_count = 0      # x: 25-43, y: 75-84 (rote Zone)
-    zone2_count = 0  # x: 14-25, y: 75-84 (links oben)
-    zone3_count = 0  # x: 43-54, y: 75-84 (rechts oben)
-    zone4_count = 0  # x: 0-14, y: 75-90 (links unten)
-    zone5_count = 0  # x: 54-68, y: 75-90 (rechts unten)
-    zone6_count = 0  # x: 14-25, y: 84-100 (links oben erweitert)
-    zone7_count = 0  # x: 43-54, y: 84-100 (rechts oben erweitert)
-    restliches_spielfeld_count = 0  # Alle Assists außerhalb der gestrichelten Zonen
-    
-    for assist in assists:
-        x, y = assist
-        in_dashed_zone = False
-        
-        # Prüfe, ob der Assist in einer gestrichelten Zone liegt (y >= 75)
-        if y >= 75:
-            # Goldene Zone: zentral oben (x: 25-43, y: 84-100)
-            if 25 <= x <= 43 and 84 <= y <= 100:
-                goldene_zone_count += 1
-                in_dashed_zone = True
-            # Zone 14: zentral oben (x: 25-43, y: 75-84)
-            elif 25 <= x <= 43 and 75 <= y < 84:
-                rote_zone_count += 1
-                in_dashed_zone = True
-            # FDl: links oben (zwischen x=14 und x=25, unterhalb y=84)
-            elif 14 <= x < 25 and 75 <= y <= 84:
-                zone2_count += 1
-                in_dashed_zone = True
-            # FDr: rechts oben (zwischen x=43 und x=54, unterhalb y=84)
-            elif 43 < x <= 54 and 75 <= y <= 84:
-                zone3_count += 1
-                in_dashed_zone = True
-            # HFAl: links unten (zwischen x=0 und x=14)
-            elif 0 <= x < 14 and 75 <= y <= 90:
-                zone4_count += 1
-                in_dashed_zone = True
-            # HFAr: rechts unten (zwischen x=54 und x=68)
-            elif 54 < x <= 68 and 75 <= y <= 90:
-                zone5_count += 1
-                in_dashed_zone = True
-            # ND2l 1/2: links oben erweitert (zwischen x=14 und x=25, oberhalb y=84)
-            elif 14 <= x < 25 and 84 < y <= 100:
-                zone6_count += 1
-                in_dashed_zone = True
-            # ND2r 1/2: rechts oben erweitert (zwischen x=43 und x=54, oberhalb y=84)
-            elif 43 < x <= 54 and 84 < y <= 100:
-                zone7_count += 1
-                in_dashed_zone = True
-        
-        # Wenn der Assist nicht in einer gestrichelten Zone liegt, zähle ihn zum restlichen Spielfeld
-        if not in_dashed_zone:
-            restliches_spielfeld_count += 1
-    
-    return {
-        'goldene_zone': (goldene_zone_count / total_assists * 100) if total_assists > 0 else 0,
-        'rote_zone': (rote_zone_count / total_assists * 100) if total_assists > 0 else 0,
-        'zone2': (zone2_count / total_assists * 100) if total_assists > 0 else 0,
-        'zone3': (zone3_count / total_assists * 100) if total_assists > 0 else 0,
-        'zone4': (zone4_count / total_assists * 100) if total_assists > 0 else 0,
-        'zone5': (zone5_count / total_assists * 100) if total_assists > 0 else 0,
-        'zone6': (zone6_count / total_assists * 100) if total_assists > 0 else 0,
-        'zone7': (zone7_count / total_assists * 100) if total_assists > 0 else 0,
-        'restliches_spielfeld': (restliches_spielfeld_count / total_assists * 100) if total_assists > 0 else 0,
-        'total': total_assists
-    }
+def show_cached_figure(key, build):
+    """Zeigt ein Diagramm aus dem Bild-Cache an; build() zeichnet die Figur (aus new_figure) nur,
+    wenn zu key (Datenstand, Ansicht und Auswahl) noch kein Bild vorliegt"""
+    st.image(get_image_cache().get_or_render(key, build), width="stretch", output_format="PNG")
+
+def draw_zone_labels(ax, zone_percentages, zone_intervals=None):
+    """Zeigt die Prozentsätze der Zonen an den Beschriftungs-Positionen aus ZONES (leicht transparent),
+    optional mit Konfidenzintervall (untere, obere Grenzen pro Zone) in einer zweiten Zeile"""
+    # Eigene Zonen aus zonen.json als gestrichelte Umrisse
+    for zone in OVERLAY_ZONES:
+        ax.add_patch(patches.Polygon(zone["polygon"], closed=True, edgecolor=zone["color"], facecolor='none',
+                                     linestyle="--", linewidth=1.5, alpha=0.8))
+    for i, zone in enumerate(ZONES):
+        percentage = zone_percentages[zone["key"]]
+        if percentage <= 0:
+            continue
+        if zone["highlight"]:
+            # Goldene Zone / Zone 14: in Zonenfarbe mit farbigem Rahmen
+            style = dict(fontsize=12, color=zone["color"], alpha=0.8,
+                         bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.6, edgecolor=zone["color"], linewidth=1))
+        elif zone["name"] == REST_ZONE:
+            # Restliches Spielfeld: weiß mit weißem Rahmen
+            style = dict(fontsize=12, color='#ffffff', alpha=0.7,
+                         bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='#ffffff', linewidth=1))
+        elif zone.get("polygon") is not None:
+            # Eigene Zonen: Rahmen in Zonenfarbe
+            style = dict(fontsize=11, color='#ffffff', alpha=0.7,
+                         bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor=zone["color"], linewidth=1))
+        else:
+            style = dict(fontsize=11, color='#ffffff', alpha=0.7,
+                         bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
+        label = f"{percentage:.1f}%"
+        if zone_intervals is not None:
+            label += f"\n{zone_intervals[0][i]:.0f}–{zone_intervals[1][i]:.0f}%"
+        ax.text(*zone["label"], label, ha='center', va='center', fontweight='bold', **style)
+
+def draw_events(ax, points, color, edgecolor, marker, label=""):
+    """Zeichnet eine Serie (Tore oder Assists) als eine einzige PathCollection (ein scatter-Aufruf)"""
+    points = as_points(points)
+    if len(points):
+        ax.scatter(points[:, 0], points[:, 1], color=color, edgecolors=edgecolor, marker=marker,
+                   s=EVENT_MARKER_SIZE, label=label, zorder=10)
+    return points
+
+def draw_pass_lines(ax, pairs):
+    """Zeichnet alle Verbindungslinien Assist -> Tor (Passwege) als eine LineCollection"""
+    pairs = np.asarray(pairs, dtype=float).reshape(-1, 4)
+    if len(pairs):
+        # Zeilen (Tor x, Tor y, Assist x, Assist y) -> Segmente [(Assist), (Tor)]
+        segments = pairs[:, [2, 3, 0, 1]].reshape(-1, 2, 2)
+        ax.add_collection(LineCollection(segments, colors='#ffffff', linestyles="--", alpha=0.5, linewidths=1,
+                                         zorder=2), autolim=False)
+
+def event_legend_handle(color, edgecolor, marker):
+    """Legenden-Eintrag im Stil von draw_events (für Serien, die mehrere Legenden-Einträge abdecken)"""
+    return Line2D([], [], linestyle='none', marker=marker, markersize=np.sqrt(EVENT_MARKER_SIZE),
+                  markerfacecolor=color, markeredgecolor=edgecolor)
+
+def draw_hotspots(ax, hotspots, data_type="goals"):
+    """Zeichnet Hotspots (Ausdehnung, Schwerpunkt, Anzahl) über die Punkte; bei "both" Tore und Assists"""
+    data_types = ["goals", "assists"] if data_type == "both" else [data_type]
+    colors = {"goals": '#00e5ff', "assists": '#ff66ff'}
+    labels = {"goals": 'Tor-Hotspot', "assists": 'Assist-Hotspot'}
+    for current_type in data_types:
+        for i, hotspot in enumerate(hotspots[current_type]):
+            color = colors[current_type]
+            x_min, y_min, x_max, y_max = hotspot["bounds"]
+            # Ausdehnung mit 1 m Rand, damit auch Hotspots an einer Position sichtbar sind
+            ax.add_patch(patches.FancyBboxPatch((x_min, y_min), x_max - x_min, y_max - y_min,
+                                                boxstyle='round,pad=1', edgecolor=color, facecolor=color,
+                                                alpha=0.15, linewidth=0, zorder=8))
+            ax.add_patch(patches.FancyBboxPatch((x_min, y_min), x_max - x_min, y_max - y_min,
+                                                boxstyle='round,pad=1', edgecolor=color, facecolor='none',
+                                                linestyle="--", linewidth=1.5, zorder=11))
+            ax.scatter(*hotspot["center"], color=color, edgecolors='#000000', marker='X', s=120, zorder=12,
+                       label=labels[current_type] if i == 0 else "")
+            ax.text(hotspot["center"][0], min(y_max + 2.5, 98), f"{hotspot['count']} ({hotspot['share']:.0f}%)",
+                    ha='center', va='center', fontsize=9, fontweight='bold', color=color, zorder=12,
+                    bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.6, edgecolor=color, linewidth=1))
+
+def field_title(goal_type, teams_data, data_type="goals", team=None):
+    """Titel eines Spielfelds: Titel aus der Team-Datei (bei Assists angepasst) bzw. für team=None alle Teams"""
+    if team is None:
+        goal_type_display = "Eigene Tore" if goal_type == "eigene_tore" else "Gegentore"
+        return f"Alle Teams - {goal_type_display}"
+    title = teams_data[team][goal_type]["title"]
+    
+    # Passe Titel an, wenn Assists angezeigt werden
+    if data_type == "assists":
+        if goal_type == "eigene_tore":
+            title = title.replace("Eigene Tore", "Eigene Assists")
+        else:
+            title = title.replace("Gegentore", "Gegnerische Assists")
+    elif data_type == "both":
+        if goal_type == "eigene_tore":
+            title = title.replace("Eigene Tore", "Eigene Assists/Tore")
+        else:
+            title = title.replace("Gegentore", "Gegnerische Assists/Tore")
+    return title
+
+def field_colors(goal_type, data_type="goals", all_teams=False):
+    """Farben (Tor, Rand, Assist) abhängig vom Tor-Typ: eigene grün-schwarz, gegnerische rot-weiß;
+    Assists neben Toren (und bei allen Teams) gelb-orange bzw. orange, um sie von Toren zu unterscheiden"""
+    separate = data_type == "both" or all_teams
+    if goal_type == "eigene_tore":
+        return '#00ff00', '#000000', '#ffaa00' if separate else '#00ff00'
+    return '#ff4444', '#ffffff', '#ff8800' if separate else '#ff4444'
 
-def draw_field(team, goal_type, teams_data, data_type="goals"):
+def draw_field(team, goal_type, teams_data, data_type="goals", zone_stats=None, hotspots=None, zone_bootstrap=None):
     """Zeichnet das Spielfeld mit den entsprechenden Toren oder Assists
     
     Args:
@@ -492,221 +389,60 @@ def draw_field(team, goal_type, teams_data, data_type="goals"):
         goal_type: "eigene_tore" oder "gegentore"
         teams_data: Die Team-Daten
         data_type: "goals" für Tore oder "assists" für Assists
+        zone_stats: Optionale Zonen-Statistik zu teams_data (Prozentangaben ohne erneutes Zählen)
+        hotspots: Optionale Hotspots (team_hotspots) als Overlay
+        zone_bootstrap: Optionale Bootstrap-Stichproben zu teams_data (Konfidenzintervalle der Prozente)
     """
     # Dark Mode für Matplotlib
     plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(8, 12))
+    fig, ax = new_figure((8, 12))
     ax.set_facecolor('#1a1a1a')  # Dunkler Hintergrund
     ax.set_xlim(0, 68)  # Spielfeldbreite (m)
     ax.set_ylim(0, 100)  # Spielfeldtiefe (m)
     
-    # SV Ried Logo als Hintergrund einfügen (falls vorhanden)
-    logo_path = "C:\\Temp\\SV_Ried.png"
-    logo = load_logo_image(logo_path)
-    if logo is not None:
-        ax.imshow(logo, extent=[0, 68, 0, 100], alpha=0.05)
+    # Spielfeld aus der gecachten Vorlage (eine PathCollection); gezeichnet werden danach nur noch die Daten
+    draw_pitch(ax, "field", load_logo_image(FIELD_LOGO_PATH))
     
-    # Spielfeldlinien hinzufügen
-    ax.plot([0, 68], [50, 50], '#00ff88', linestyle="-", zorder=5, linewidth=2)  # Mittellinie
-    mittelkreis = patches.Circle((34, 50), 9, edgecolor='#00ff88', facecolor='none', linewidth=2)  # Mittelkreis
-    ax.add_patch(mittelkreis)
-
-    # Gestrichelte Linien hinzufügen
-    ax.plot([43, 43], [100, 75], '#00ff88', linestyle="--", linewidth=2)  # Erste gestrichelte Linie
-    ax.plot([25, 25], [100, 75], '#00ff88', linestyle="--", linewidth=2)  # Zweite gestrichelte Linie
-    ax.plot([43, 54, 54], [100, 84, 75], '#00ff88', linestyle="--", linewidth=2)  # Dritte gestrichelte Linie
-    ax.plot([25, 14, 14], [100, 84, 75], '#00ff88', linestyle="--", linewidth=2)  # Vierte gestrichelte Linie
-    ax.plot([14, 0], [90, 90], '#00ff88', linestyle="--", linewidth=2)  # Neue horizontale Linie links
-    ax.plot([54, 68], [90, 90], '#00ff88', linestyle="--", linewidth=2)  # Neue horizontale Linie rechts
-
-    # Fünfmeterraum hinzufügen (5m tief, 18m breit)
-    fuenfmeter_oben = patches.Rectangle((25, 100), 18, -5, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(fuenfmeter_oben)
-
-    fuenfmeter_unten = patches.Rectangle((25, 0), 18, 5, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(fuenfmeter_unten)
-
-    # Sechzehnmeterraum hinzufügen (16m tief, 40m breit)
-    sechzehn_oben = patches.Rectangle((14, 100), 40, -16, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(sechzehn_oben)
-
-    sechzehn_unten = patches.Rectangle((14, 0), 40, 16, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(sechzehn_unten)
-
-    # Goldene Zone im oberen Strafraum (zwischen Torlinie, 5m Raum und 16m Linie)
-    goldene_zone_oben = patches.Rectangle((25, 100), 18, -16, edgecolor='none', facecolor='gold', alpha=0.3)
-    ax.add_patch(goldene_zone_oben)
-
-    # Zone 14 mit 5m Raum Breite (18m) unterhalb der goldenen Zone bis zur gestrichelten Linie (y=75)
-    # Gleiche Breite wie 5m Raum: x von 25 bis 43 (18m breit), y von 75 bis 84 (16m Linie)
-    rote_zone_zentral = patches.Rectangle((25, 75), 18, 9, edgecolor='none', facecolor='red', alpha=0.3)
-    ax.add_patch(rote_zone_zentral)
-
-    # Elfmeterpunkte hinzufügen
-    ax.scatter(34, 89, color='#00ff88', marker='o')  # Elfmeterpunkt oben
-    ax.scatter(34, 11, color='#00ff88', marker='o')  # Elfmeterpunkt unten
-
-    # Halbkreise um die Elfmeterpunkte
-    halbkreis_oben = patches.Arc((34, 89), 18, 18, angle=0, theta1=215, theta2=325, edgecolor='#00ff88', linewidth=2)
-    ax.add_patch(halbkreis_oben)
-
-    halbkreis_unten = patches.Arc((34, 11), 18, 18, angle=0, theta1=35, theta2=145, edgecolor='#00ff88', linewidth=2)
-    ax.add_patch(halbkreis_unten)
-
     # Daten für das ausgewählte Team und Tor-Typ abrufen
     team_data = teams_data[team][goal_type]
     goals = team_data["goals"]
     assists = team_data["assists"]
-    title = team_data["title"]
-    
-    # Passe Titel an, wenn Assists angezeigt werden
-    if data_type == "assists":
-        if goal_type == "eigene_tore":
-            title = title.replace("Eigene Tore", "Eigene Assists")
-        else:
-            title = title.replace("Gegentore", "Gegnerische Assists")
-    elif data_type == "both":
-        if goal_type == "eigene_tore":
-            title = title.replace("Eigene Tore", "Eigene Assists/Tore")
-        else:
-            title = title.replace("Gegentore", "Gegnerische Assists/Tore")
+    pairs = team_data["pairs"]
+    title = field_title(goal_type, teams_data, data_type, team)
+    goal_color, edge, assist_color = field_colors(goal_type, data_type)
 
-    # Zeige Tore oder Assists basierend auf data_type
-    if data_type == "goals":
-        # Tore markieren (Farbe abhängig vom Tor-Typ)
-        if goal_type == "eigene_tore":
-            # Eigene Tore: grün-schwarz
-            for i, goal in enumerate(goals):
-                ax.scatter(goal[0], goal[1], color='#00ff00', edgecolors='#000000', marker='o', s=50, 
-                          label='Tor' if i == 0 else "", zorder=10)
-        else:
-            # Gegentore: rot-weiß
-            for i, goal in enumerate(goals):
-                ax.scatter(goal[0], goal[1], color='#ff4444', edgecolors='#ffffff', marker='o', s=50, 
-                          label='Tor' if i == 0 else "", zorder=10)
-        
+    # Jede Serie ist eine einzige PathCollection, alle Passwege eine LineCollection
+    if data_type in ("goals", "both"):
+        draw_events(ax, goals, goal_color, edge, 'o', 'Tor')
+    if data_type in ("assists", "both"):
+        draw_events(ax, assists, assist_color, edge, 's', 'Assist')
+    if data_type in ("goals", "both"):
         # Verbindungslinien zwischen Assist und Tor (Passwege)
-        for i in range(min(len(goals), len(assists))):
-            ax.plot([assists[i][0], goals[i][0]], [assists[i][1], goals[i][1]], 
-                    '#ffffff', linestyle="--", alpha=0.5, linewidth=1)
-        
-        # Berechne Prozentsätze für gestrichelte Zonen (Tore) - konvertiere zu Tuple für Caching
-        zone_percentages = count_goals_in_dashed_zones(tuple(goals))
-    elif data_type == "assists":
-        # Assists markieren (Farbe abhängig vom Tor-Typ)
-        if goal_type == "eigene_tore":
-            # Eigene Assists: grün-schwarz
-            for i, assist in enumerate(assists):
-                ax.scatter(assist[0], assist[1], color='#00ff00', edgecolors='#000000', marker='s', s=50, 
-                          label='Assist' if i == 0 else "", zorder=10)
-        else:
-            # Gegnerische Assists: rot-weiß
-            for i, assist in enumerate(assists):
-                ax.scatter(assist[0], assist[1], color='#ff4444', edgecolors='#ffffff', marker='s', s=50, 
-                          label='Assist' if i == 0 else "", zorder=10)
-        
-        # Berechne Prozentsätze für gestrichelte Zonen (Assists) - konvertiere zu Tuple für Caching
-        zone_percentages = count_assists_in_dashed_zones(tuple(assists))
-    else:  # both - zeige sowohl Tore als auch Assists
-        # Tore markieren (Farbe abhängig vom Tor-Typ)
-        if goal_type == "eigene_tore":
-            # Eigene Tore: grün-schwarz
-            for i, goal in enumerate(goals):
-                ax.scatter(goal[0], goal[1], color='#00ff00', edgecolors='#000000', marker='o', s=50, 
-                          label='Tor' if i == 0 else "", zorder=10)
-            # Eigene Assists: gelb-orange (um sie von Toren zu unterscheiden)
-            for i, assist in enumerate(assists):
-                ax.scatter(assist[0], assist[1], color='#ffaa00', edgecolors='#000000', marker='s', s=50, 
-                          label='Assist' if i == 0 else "", zorder=10)
-        else:
-            # Gegentore: rot-weiß
-            for i, goal in enumerate(goals):
-                ax.scatter(goal[0], goal[1], color='#ff4444', edgecolors='#ffffff', marker='o', s=50, 
-                          label='Tor' if i == 0 else "", zorder=10)
-            # Gegnerische Assists: orange-weiß
-            for i, assist in enumerate(assists):
-                ax.scatter(assist[0], assist[1], color='#ff8800', edgecolors='#ffffff', marker='s', s=50, 
-                          label='Assist' if i == 0 else "", zorder=10)
-        
-        # Verbindungslinien zwischen Assist und Tor (Passwege)
-        for i in range(min(len(goals), len(assists))):
-            ax.plot([assists[i][0], goals[i][0]], [assists[i][1], goals[i][1]], 
-                    '#ffffff', linestyle="--", alpha=0.5, linewidth=1)
-        
-        # Berechne Prozentsätze für gestrichelte Zonen (kombiniert: Tore + Assists)
-        # Verwende Tore für die Prozentsätze, da diese die primären Daten sind
-        zone_percentages = count_goals_in_dashed_zones(tuple(goals))
-    
-    # Zeige Prozentsätze in den gestrichelten Zonen (leicht transparent)
-    # Goldene Zone: zentral oben (x: 25-43, y: 84-100) - ganz oben positioniert
-    if zone_percentages['goldene_zone'] > 0:
-        ax.text(34, 100, f"{zone_percentages['goldene_zone']:.1f}%", 
-                ha='center', va='center', fontsize=12, fontweight='bold',
-                color='#ffd700', alpha=0.8, 
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.6, edgecolor='#ffd700', linewidth=1))
-    
-    # Zone 14: zentral oben (x: 25-43, y: 75-84) - ganz unten positioniert
-    if zone_percentages['rote_zone'] > 0:
-        ax.text(34, 75, f"{zone_percentages['rote_zone']:.1f}%", 
-                ha='center', va='center', fontsize=12, fontweight='bold',
-                color='#ff4444', alpha=0.8, 
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.6, edgecolor='#ff4444', linewidth=1))
-    
-    # FDl: links oben (x: 14-25, y: 75-84)
-    if zone_percentages['zone2'] > 0:
-        ax.text(19.5, 79.5, f"{zone_percentages['zone2']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # FDr: rechts oben (x: 43-54, y: 75-84)
-    if zone_percentages['zone3'] > 0:
-        ax.text(48.5, 79.5, f"{zone_percentages['zone3']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # HFAl: links unten (x: 0-14, y: 75-90)
-    if zone_percentages['zone4'] > 0:
-        ax.text(7, 82.5, f"{zone_percentages['zone4']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # HFAr: rechts unten (x: 54-68, y: 75-90)
-    if zone_percentages['zone5'] > 0:
-        ax.text(61, 82.5, f"{zone_percentages['zone5']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # ND2l 1/2: links oben erweitert (x: 14-25, y: 84-100)
-    if zone_percentages['zone6'] > 0:
-        ax.text(19.5, 92, f"{zone_percentages['zone6']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # ND2r 1/2: rechts oben erweitert (x: 43-54, y: 84-100)
-    if zone_percentages['zone7'] > 0:
-        ax.text(48.5, 92, f"{zone_percentages['zone7']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # Restliches Spielfeld: Alle Tore außerhalb der gestrichelten Zonen
-    if zone_percentages['restliches_spielfeld'] > 0:
-        ax.text(34, 55, f"{zone_percentages['restliches_spielfeld']:.1f}%", 
-                ha='center', va='center', fontsize=12, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='#ffffff', linewidth=1))
+        draw_pass_lines(ax, pairs)
+    
+    # Berechne Prozentsätze für gestrichelte Zonen (bei "both" aus den Toren, da diese die primären Daten sind)
+    label_type = "assists" if data_type == "assists" else "goals"
+    if zone_stats is not None:
+        zone_percentages = percentages_from_counts(*select_zone_stats(zone_stats, goal_type, label_type, team))
+    else:
+        zone_percentages = percentages_by_zone(assists if label_type == "assists" else goals)
+    zone_intervals = None
+    if zone_bootstrap is not None:
+        zone_intervals = select_zone_intervals(zone_bootstrap, goal_type, label_type, team)
+    
+    # Zeige Prozentsätze in den gestrichelten Zonen
+    draw_zone_labels(ax, zone_percentages, zone_intervals)
+    
+    # Hotspots (Häufungen) über den Punkten
+    if hotspots is not None:
+        draw_hotspots(ax, hotspots, data_type)
 
     # Legende
     ax.legend(loc="lower left", fontsize=10, framealpha=0.8)
 
-    plt.title(title, fontsize=16, fontweight='bold', pad=20)
-    plt.xlabel("Spielfeldbreite (m)", fontsize=12)
-    plt.ylabel("Spielfeldtiefe (m)", fontsize=12)
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel("Spielfeldbreite (m)", fontsize=12)
+    ax.set_ylabel("Spielfeldtiefe (m)", fontsize=12)
     
     # Achsenbeschriftungen entfernen für sauberes Aussehen
     ax.set_xticks([])
@@ -714,203 +450,83 @@ def draw_field(team, goal_type, teams_data, data_type="goals"):
     
     return fig
 
-def draw_all_teams_field(goal_type, teams_data, data_type="goals"):
+def draw_all_teams_field(goal_type, teams_data, data_type="goals", zone_stats=None, hotspots=None,
+                         zone_bootstrap=None):
     """Zeichnet ein Spielfeld mit allen Toren oder Assists aller Teams für einen bestimmten Tor-Typ
     
     Args:
         goal_type: "eigene_tore" oder "gegentore"
         teams_data: Die Team-Daten
         data_type: "goals" für Tore, "assists" für Assists oder "both" für beide
+        zone_stats: Optionale Zonen-Statistik zu teams_data (Prozentangaben ohne erneutes Zählen)
+        hotspots: Optionale Hotspots (team_hotspots) als Overlay
+        zone_bootstrap: Optionale Bootstrap-Stichproben zu teams_data (Konfidenzintervalle der Prozente)
     """
     # Dark Mode für Matplotlib
     plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(8, 12))
+    fig, ax = new_figure((8, 12))
     ax.set_facecolor('#1a1a1a')  # Dunkler Hintergrund
     ax.set_xlim(0, 68)  # Spielfeldbreite (m)
     ax.set_ylim(0, 100)  # Spielfeldtiefe (m)
     
-    # SV Ried Logo als Hintergrund einfügen (falls vorhanden)
-    logo_path = "C:\\Temp\\SV_Ried.png"
-    logo = load_logo_image(logo_path)
-    if logo is not None:
-        ax.imshow(logo, extent=[0, 68, 0, 100], alpha=0.05)
+    # Spielfeld aus der gecachten Vorlage (eine PathCollection); gezeichnet werden danach nur noch die Daten
+    draw_pitch(ax, "field", load_logo_image(FIELD_LOGO_PATH))
     
-    # Spielfeldlinien hinzufügen (gleiche wie in draw_field)
-    ax.plot([0, 68], [50, 50], '#00ff88', linestyle="-", zorder=5, linewidth=2)  # Mittellinie
-    mittelkreis = patches.Circle((34, 50), 9, edgecolor='#00ff88', facecolor='none', linewidth=2)  # Mittelkreis
-    ax.add_patch(mittelkreis)
-
-    # Gestrichelte Linien hinzufügen
-    ax.plot([43, 43], [100, 75], '#00ff88', linestyle="--", linewidth=2)  # Erste gestrichelte Linie
-    ax.plot([25, 25], [100, 75], '#00ff88', linestyle="--", linewidth=2)  # Zweite gestrichelte Linie
-    ax.plot([43, 54, 54], [100, 84, 75], '#00ff88', linestyle="--", linewidth=2)  # Dritte gestrichelte Linie
-    ax.plot([25, 14, 14], [100, 84, 75], '#00ff88', linestyle="--", linewidth=2)  # Vierte gestrichelte Linie
-    ax.plot([14, 0], [90, 90], '#00ff88', linestyle="--", linewidth=2)  # Neue horizontale Linie links
-    ax.plot([54, 68], [90, 90], '#00ff88', linestyle="--", linewidth=2)  # Neue horizontale Linie rechts
-
-    # Fünfmeterraum hinzufügen (5m tief, 18m breit)
-    fuenfmeter_oben = patches.Rectangle((25, 100), 18, -5, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(fuenfmeter_oben)
-
-    fuenfmeter_unten = patches.Rectangle((25, 0), 18, 5, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(fuenfmeter_unten)
-
-    # Sechzehnmeterraum hinzufügen (16m tief, 40m breit)
-    sechzehn_oben = patches.Rectangle((14, 100), 40, -16, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(sechzehn_oben)
-
-    sechzehn_unten = patches.Rectangle((14, 0), 40, 16, edgecolor='#00ff88', facecolor='none', linewidth=2)
-    ax.add_patch(sechzehn_unten)
-
-    # Goldene Zone im oberen Strafraum (zwischen Torlinie, 5m Raum und 16m Linie)
-    goldene_zone_oben = patches.Rectangle((25, 100), 18, -16, edgecolor='none', facecolor='gold', alpha=0.3)
-    ax.add_patch(goldene_zone_oben)
-
-    # Zone 14 mit 5m Raum Breite (18m) unterhalb der goldenen Zone bis zur gestrichelten Linie (y=75)
-    # Gleiche Breite wie 5m Raum: x von 25 bis 43 (18m breit), y von 75 bis 84 (16m Linie)
-    rote_zone_zentral = patches.Rectangle((25, 75), 18, 9, edgecolor='none', facecolor='red', alpha=0.3)
-    ax.add_patch(rote_zone_zentral)
-
-    # Elfmeterpunkte hinzufügen
-    ax.scatter(34, 89, color='#00ff88', marker='o')  # Elfmeterpunkt oben
-    ax.scatter(34, 11, color='#00ff88', marker='o')  # Elfmeterpunkt unten
-
-    # Halbkreise um die Elfmeterpunkte
-    halbkreis_oben = patches.Arc((34, 89), 18, 18, angle=0, theta1=215, theta2=325, edgecolor='#00ff88', linewidth=2)
-    ax.add_patch(halbkreis_oben)
-
-    halbkreis_unten = patches.Arc((34, 11), 18, 18, angle=0, theta1=35, theta2=145, edgecolor='#00ff88', linewidth=2)
-    ax.add_patch(halbkreis_unten)
-
     # Sammle alle Tore oder Assists aller Teams
     all_goals_data = []
     all_assists_data = []
     
-    # Bestimme Farben basierend auf Tor-Typ (wie bei einzelnen Teams)
-    if goal_type == "eigene_tore":
-        goal_color = '#00ff00'  # Grün für eigene Tore
-        goal_edge = '#000000'   # Schwarz für eigene Tore
-        assist_color = '#ffaa00'  # Gelb-orange für eigene Assists
-        assist_edge = '#000000'  # Schwarz für eigene Assists
-    else:
-        goal_color = '#ff4444'  # Rot für Gegentore
-        goal_edge = '#ffffff'   # Weiß für Gegentore
-        assist_color = '#ff8800'  # Orange für gegnerische Assists
-        assist_edge = '#ffffff'  # Weiß für gegnerische Assists
-    
-    for i, (team, team_data) in enumerate(teams_data.items()):
-        if data_type == "goals":
-            data_list = team_data[goal_type]["goals"]
-            # Markiere Tore
-            for j, data_point in enumerate(data_list):
-                ax.scatter(data_point[0], data_point[1], color=goal_color, edgecolors=goal_edge, marker='o', s=50, 
-                          label=f'{team} Tor' if j == 0 else "", zorder=10)
-                all_goals_data.append(data_point)
-        elif data_type == "assists":
-            data_list = team_data[goal_type]["assists"]
-            # Markiere Assists
-            for j, data_point in enumerate(data_list):
-                ax.scatter(data_point[0], data_point[1], color=assist_color, edgecolors=assist_edge, marker='s', s=50, 
-                          label=f'{team} Assist' if j == 0 else "", zorder=10)
-                all_assists_data.append(data_point)
-        else:  # both
-            goals_list = team_data[goal_type]["goals"]
-            assists_list = team_data[goal_type]["assists"]
-            # Markiere Tore
-            for j, goal in enumerate(goals_list):
-                ax.scatter(goal[0], goal[1], color=goal_color, edgecolors=goal_edge, marker='o', s=50, 
-                          label=f'{team} Tor' if j == 0 else "", zorder=10)
-                all_goals_data.append(goal)
-            # Markiere Assists
-            for j, assist in enumerate(assists_list):
-                ax.scatter(assist[0], assist[1], color=assist_color, edgecolors=assist_edge, marker='s', s=50, 
-                          label=f'{team} Assist' if j == 0 else "", zorder=10)
-                all_assists_data.append(assist)
-            
-            # Verbindungslinien zwischen Assist und Tor (Passwege)
-            for k in range(min(len(goals_list), len(assists_list))):
-                ax.plot([assists_list[k][0], goals_list[k][0]], [assists_list[k][1], goals_list[k][1]], 
-                        '#ffffff', linestyle="--", alpha=0.5, linewidth=1)
+    # Bestimme Farben basierend auf Tor-Typ (wie bei einzelnen Teams, Assists immer in eigener Farbe)
+    goal_color, goal_edge, assist_color = field_colors(goal_type, data_type, all_teams=True)
+    assist_edge = goal_edge
+    
+    # Alle Teams haben dieselbe Farbe: pro Serie eine PathCollection über alle Teams, alle Passwege
+    # eine LineCollection; die Legende (ein Eintrag pro Team) wird separat aufgebaut
+    legend_handles = []
+    legend_labels = []
+    all_pairs = []
+    for team, team_data in teams_data.items():
+        if data_type in ("goals", "both") and len(team_data[goal_type]["goals"]):
+            all_goals_data.append(as_points(team_data[goal_type]["goals"]))
+            legend_handles.append(event_legend_handle(goal_color, goal_edge, 'o'))
+            legend_labels.append(f'{team} Tor')
+        if data_type in ("assists", "both") and len(team_data[goal_type]["assists"]):
+            all_assists_data.append(as_points(team_data[goal_type]["assists"]))
+            legend_handles.append(event_legend_handle(assist_color, assist_edge, 's'))
+            legend_labels.append(f'{team} Assist')
+        if data_type == "both":
+            all_pairs.append(np.asarray(team_data[goal_type]["pairs"], dtype=float).reshape(-1, 4))
+    all_goals_data = draw_events(ax, np.concatenate(all_goals_data or [np.empty((0, 2))]),
+                                 goal_color, goal_edge, 'o')
+    all_assists_data = draw_events(ax, np.concatenate(all_assists_data or [np.empty((0, 2))]),
+                                   assist_color, assist_edge, 's')
+    # Verbindungslinien zwischen Assist und Tor (Passwege)
+    draw_pass_lines(ax, np.concatenate(all_pairs or [np.empty((0, 4))]))
 
-    # Berechne Prozentsätze für gestrichelte Zonen - konvertiere zu Tuples für Caching
-    if data_type == "goals":
-        zone_percentages = count_goals_in_dashed_zones(tuple(all_goals_data))
-    elif data_type == "assists":
-        zone_percentages = count_assists_in_dashed_zones(tuple(all_assists_data))
-    else:  # both - verwende Tore für Prozentsätze
-        zone_percentages = count_goals_in_dashed_zones(tuple(all_goals_data))
-    
-    # Zeige Prozentsätze in den gestrichelten Zonen (leicht transparent)
-    # Goldene Zone: zentral oben (x: 25-43, y: 84-100) - ganz oben positioniert
-    if zone_percentages['goldene_zone'] > 0:
-        ax.text(34, 100, f"{zone_percentages['goldene_zone']:.1f}%", 
-                ha='center', va='center', fontsize=12, fontweight='bold',
-                color='#ffd700', alpha=0.8, 
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.6, edgecolor='#ffd700', linewidth=1))
-    
-    # Zone 14: zentral oben (x: 25-43, y: 75-84) - ganz unten positioniert
-    if zone_percentages['rote_zone'] > 0:
-        ax.text(34, 75, f"{zone_percentages['rote_zone']:.1f}%", 
-                ha='center', va='center', fontsize=12, fontweight='bold',
-                color='#ff4444', alpha=0.8, 
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.6, edgecolor='#ff4444', linewidth=1))
-    
-    # FDl: links oben (x: 14-25, y: 75-84)
-    if zone_percentages['zone2'] > 0:
-        ax.text(19.5, 79.5, f"{zone_percentages['zone2']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # FDr: rechts oben (x: 43-54, y: 75-84)
-    if zone_percentages['zone3'] > 0:
-        ax.text(48.5, 79.5, f"{zone_percentages['zone3']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # HFAl: links unten (x: 0-14, y: 75-90)
-    if zone_percentages['zone4'] > 0:
-        ax.text(7, 82.5, f"{zone_percentages['zone4']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # HFAr: rechts unten (x: 54-68, y: 75-90)
-    if zone_percentages['zone5'] > 0:
-        ax.text(61, 82.5, f"{zone_percentages['zone5']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # ND2l 1/2: links oben erweitert (x: 14-25, y: 84-100)
-    if zone_percentages['zone6'] > 0:
-        ax.text(19.5, 92, f"{zone_percentages['zone6']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # ND2r 1/2: rechts oben erweitert (x: 43-54, y: 84-100)
-    if zone_percentages['zone7'] > 0:
-        ax.text(48.5, 92, f"{zone_percentages['zone7']:.1f}%", 
-                ha='center', va='center', fontsize=11, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='none'))
-    
-    # Restliches Spielfeld: Alle Tore außerhalb der gestrichelten Zonen
-    if zone_percentages['restliches_spielfeld'] > 0:
-        ax.text(34, 55, f"{zone_percentages['restliches_spielfeld']:.1f}%", 
-                ha='center', va='center', fontsize=12, fontweight='bold',
-                color='#ffffff', alpha=0.7,
-                bbox=dict(boxstyle='round', facecolor='#000000', alpha=0.5, edgecolor='#ffffff', linewidth=1))
+    # Berechne Prozentsätze für gestrichelte Zonen (bei "both" aus den Toren)
+    label_type = "assists" if data_type == "assists" else "goals"
+    if zone_stats is not None:
+        zone_percentages = percentages_from_counts(*select_zone_stats(zone_stats, goal_type, label_type))
+    else:
+        zone_percentages = percentages_by_zone(all_assists_data if label_type == "assists" else all_goals_data)
+    zone_intervals = None
+    if zone_bootstrap is not None:
+        zone_intervals = select_zone_intervals(zone_bootstrap, goal_type, label_type)
+    
+    # Zeige Prozentsätze in den gestrichelten Zonen
+    draw_zone_labels(ax, zone_percentages, zone_intervals)
+    
+    # Hotspots (Häufungen) über den Punkten
+    if hotspots is not None:
+        draw_hotspots(ax, hotspots, data_type)
 
-    # Legende
-    ax.legend(loc="lower left", fontsize=8, framealpha=0.8)
+    # Legende: Einträge pro Team, dahinter die Hotspots
+    handles, labels = ax.get_legend_handles_labels()
+    ax.legend(legend_handles + handles, legend_labels + labels, loc="lower left", fontsize=8, framealpha=0.8)
 
-    goal_type_display = "Eigene Tore" if goal_type == "eigene_tore" else "Gegentore"
-    plt.title(f"Alle Teams - {goal_type_display}", fontsize=16, fontweight='bold', pad=20)
-    plt.xlabel("Spielfeldbreite (m)", fontsize=12)
-    plt.ylabel("Spielfeldtiefe (m)", fontsize=12)
+    ax.set_title(field_title(goal_type, teams_data, data_type), fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel("Spielfeldbreite (m)", fontsize=12)
+    ax.set_ylabel("Spielfeldtiefe (m)", fontsize=12)
     
     # Achsenbeschriftungen entfernen für sauberes Aussehen
     ax.set_xticks([])
@@ -918,217 +534,136 @@ def draw_all_teams_field(goal_type, teams_data, data_type="goals"):
     
     return fig
 
-@st.cache_data(ttl=300, max_entries=100)
-def count_goals_in_zone(goals_tuple, zone_name):
-    """Zählt Tore in einer spezifischen Zone"""
-    # Konvertiere Tuple zurück zu Liste für Caching (Tuples sind hashable)
-    goals = list(goals_tuple) if isinstance(goals_tuple, tuple) else goals_tuple
-    count = 0
-    for goal in goals:
-        x, y = goal
-        if zone_name == "Goldene Zone":
-            if 25 <= x <= 43 and 84 <= y <= 100:
-                count += 1
-        elif zone_name == "Zone 14":
-            if 25 <= x <= 43 and 75 <= y < 84:
-                count += 1
-        elif zone_name == "FDl":
-            if 14 <= x < 25 and 75 <= y <= 84:
-                count += 1
-        elif zone_name == "FDr":
-            if 43 < x <= 54 and 75 <= y <= 84:
-                count += 1
-        elif zone_name == "HFAl":
-            if 0 <= x < 14 and 75 <= y <= 90:
-                count += 1
-        elif zone_name == "HFAr":
-            if 54 < x <= 68 and 75 <= y <= 90:
-                count += 1
-        elif zone_name == "ND2l 1/2":
-            if 14 <= x < 25 and 84 < y <= 100:
-                count += 1
-        elif zone_name == "ND2r 1/2":
-            if 43 < x <= 54 and 84 < y <= 100:
-                count += 1
-        elif zone_name == "Restliches Spielfeld":
-            # Alle Tore außerhalb der gestrichelten Zonen
-            in_zone = False
-            if y >= 75:
-                if (25 <= x <= 43 and 84 <= y <= 100) or \
-                   (25 <= x <= 43 and 75 <= y < 84) or \
-                   (14 <= x < 25 and 75 <= y <= 84) or \
-                   (43 < x <= 54 and 75 <= y <= 84) or \
-                   (0 <= x < 14 and 75 <= y <= 90) or \
-                   (54 < x <= 68 and 75 <= y <= 90) or \
-                   (14 <= x < 25 and 84 < y <= 100) or \
-                   (43 < x <= 54 and 84 < y <= 100):
-                    in_zone = True
-            if not in_zone:
-                count += 1
-    return count
+def field_vega_spec(goal_type, teams_data, data_type="goals", zone_stats=None, hotspots=None, zone_bootstrap=None,
+                    team=None):
+    """Vega-Lite-Spezifikation eines Spielfelds mit denselben Daten, Farben und Beschriftungen wie
+    draw_field (team) bzw. draw_all_teams_field (team=None); gezeichnet wird im Browser"""
+    teams = list(teams_data) if team is None else [team]
+    goal_color, edge, assist_color = field_colors(goal_type, data_type, all_teams=team is None)
+    series = []
+    for data_type_key, name, color, shape in (("goals", "Tor", goal_color, "circle"),
+                                               ("assists", "Assist", assist_color, "square")):
+        if data_type not in (data_type_key, "both"):
+            continue
+        points = [as_points(teams_data[team_name][goal_type][data_type_key]) for team_name in teams]
+        series.append({"name": name, "points": np.concatenate(points or [np.empty((0, 2))]),
+                       "teams": [team_name for team_name, team_points in zip(teams, points) for _ in range(len(team_points))],
+                       "color": color, "edgecolor": edge, "shape": shape})
+    # Passwege wie auf dem Matplotlib-Spielfeld: bei einem Team mit Toren, bei allen Teams nur bei "both"
+    pairs = np.empty((0, 4))
+    if data_type == "both" or (team is not None and data_type == "goals"):
+        pairs = np.concatenate([np.asarray(teams_data[team_name][goal_type]["pairs"], dtype=float).reshape(-1, 4)
+                                for team_name in teams] or [pairs])
+    label_type = "assists" if data_type == "assists" else "goals"
+    if zone_stats is not None:
+        zone_percentages = percentages_from_counts(*select_zone_stats(zone_stats, goal_type, label_type, team))
+    else:
+        zone_percentages = percentages_by_zone(np.concatenate(
+            [as_points(teams_data[team_name][goal_type][label_type]) for team_name in teams] or [np.empty((0, 2))]))
+    zone_intervals = None
+    if zone_bootstrap is not None:
+        zone_intervals = select_zone_intervals(zone_bootstrap, goal_type, label_type, team)
+    hotspot_types = ["goals", "assists"] if data_type == "both" else [data_type]
+    return field_spec(field_title(goal_type, teams_data, data_type, team), series, pairs,
+                      zone_label_rows(zone_percentages, zone_intervals), hotspots,
+                      hotspot_types if hotspots is not None else [])
 
-@st.cache_data(ttl=300, max_entries=100)
-def count_assists_in_zone(assists_tuple, zone_name):
-    """Zählt Assists in einer spezifischen Zone"""
-    # Konvertiere Tuple zurück zu Liste für Caching (Tuples sind hashable)
-    assists = list(assists_tuple) if isinstance(assists_tuple, tuple) else assists_tuple
-    count = 0
-    for assist in assists:
-        x, y = assist
-        if zone_name == "Goldene Zone":
-            if 25 <= x <= 43 and 84 <= y <= 100:
-                count += 1
-        elif zone_name == "Zone 14":
-            if 25 <= x <= 43 and 75 <= y < 84:
-                count += 1
-        elif zone_name == "FDl":
-            if 14 <= x < 25 and 75 <= y <= 84:
-                count += 1
-        elif zone_name == "FDr":
-            if 43 < x <= 54 and 75 <= y <= 84:
-                count += 1
-        elif zone_name == "HFAl":
-            if 0 <= x < 14 and 75 <= y <= 90:
-                count += 1
-        elif zone_name == "HFAr":
-            if 54 < x <= 68 and 75 <= y <= 90:
-                count += 1
-        elif zone_name == "ND2l 1/2":
-            if 14 <= x < 25 and 84 < y <= 100:
-                count += 1
-        elif zone_name == "ND2r 1/2":
-            if 43 < x <= 54 and 84 < y <= 100:
-                count += 1
-        elif zone_name == "Restliches Spielfeld":
-            # Alle Assists außerhalb der gestrichelten Zonen
-            in_zone = False
-            if y >= 75:
-                if (25 <= x <= 43 and 84 <= y <= 100) or \
-                   (25 <= x <= 43 and 75 <= y < 84) or \
-                   (14 <= x < 25 and 75 <= y <= 84) or \
-                   (43 < x <= 54 and 75 <= y <= 84) or \
-                   (0 <= x < 14 and 75 <= y <= 90) or \
-                   (54 < x <= 68 and 75 <= y <= 90) or \
-                   (14 <= x < 25 and 84 < y <= 100) or \
-                   (43 < x <= 54 and 84 < y <= 100):
-                    in_zone = True
-            if not in_zone:
-                count += 1
-    return count
+def show_field(renderer, cache_key, goal_type, teams_data, data_type="goals", zone_stats=None, hotspots=None,
+               zone_bootstrap=None, team=None):
+    """Zeigt ein Spielfeld (team=None: alle Teams) mit dem gewählten Renderer aus FIELD_RENDERERS an:
+    "matplotlib" als Bild aus dem Bild-Cache (cache_key), "vega" als Vega-Lite-Diagramm im Browser"""
+    if renderer == "vega":
+        st.vega_lite_chart(spec=field_vega_spec(goal_type, teams_data, data_type, zone_stats, hotspots,
+                                                zone_bootstrap, team), width="content", theme=None)
+        return
+    if team is None:
+        build = lambda: draw_all_teams_field(goal_type, teams_data, data_type, zone_stats, hotspots, zone_bootstrap)
+    else:
+        build = lambda: draw_field(team, goal_type, teams_data, data_type, zone_stats, hotspots, zone_bootstrap)
+    show_cached_figure(cache_key, build)
 
 def create_zone_preview(zone_name):
     """Erstellt eine kleine Spielfeld-Visualisierung mit der markierten Zone"""
     plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(4, 6))
+    fig, ax = new_figure((4, 6))
     ax.set_facecolor('#1a1a1a')
     ax.set_xlim(0, 68)
     ax.set_ylim(0, 100)
     
-    # Spielfeldlinien
-    ax.plot([0, 68], [50, 50], '#00ff88', linestyle="-", zorder=5, linewidth=1.5)
-    mittelkreis = patches.Circle((34, 50), 9, edgecolor='#00ff88', facecolor='none', linewidth=1.5)
-    ax.add_patch(mittelkreis)
-    
-    # Gestrichelte Linien
-    ax.plot([43, 43], [100, 75], '#00ff88', linestyle="--", linewidth=1.5)
-    ax.plot([25, 25], [100, 75], '#00ff88', linestyle="--", linewidth=1.5)
-    ax.plot([43, 54, 54], [100, 84, 75], '#00ff88', linestyle="--", linewidth=1.5)
-    ax.plot([25, 14, 14], [100, 84, 75], '#00ff88', linestyle="--", linewidth=1.5)
-    ax.plot([14, 0], [90, 90], '#00ff88', linestyle="--", linewidth=1.5)
-    ax.plot([54, 68], [90, 90], '#00ff88', linestyle="--", linewidth=1.5)
-    
-    # Fünfmeterraum
-    fuenfmeter_oben = patches.Rectangle((25, 100), 18, -5, edgecolor='#00ff88', facecolor='none', linewidth=1.5)
-    ax.add_patch(fuenfmeter_oben)
-    
-    # Sechzehnmeterraum
-    sechzehn_oben = patches.Rectangle((14, 100), 40, -16, edgecolor='#00ff88', facecolor='none', linewidth=1.5)
-    ax.add_patch(sechzehn_oben)
-    
-    # Markiere die ausgewählte Zone
-    if zone_name == "Goldene Zone":
-        zone_rect = patches.Rectangle((25, 84), 18, 16, edgecolor='#ffd700', facecolor='#ffd700', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "Zone 14":
-        zone_rect = patches.Rectangle((25, 75), 18, 9, edgecolor='#ff4444', facecolor='#ff4444', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "FDl":
-        zone_rect = patches.Rectangle((14, 75), 11, 9, edgecolor='#ffaa00', facecolor='#ffaa00', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "FDr":
-        zone_rect = patches.Rectangle((43, 75), 11, 9, edgecolor='#ffaa00', facecolor='#ffaa00', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "HFAl":
-        zone_rect = patches.Rectangle((0, 75), 14, 15, edgecolor='#ffaa00', facecolor='#ffaa00', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "HFAr":
-        zone_rect = patches.Rectangle((54, 75), 14, 15, edgecolor='#ffaa00', facecolor='#ffaa00', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "ND2l 1/2":
-        zone_rect = patches.Rectangle((14, 84), 11, 16, edgecolor='#ffaa00', facecolor='#ffaa00', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "ND2r 1/2":
-        zone_rect = patches.Rectangle((43, 84), 11, 16, edgecolor='#ffaa00', facecolor='#ffaa00', alpha=0.5, linewidth=2)
-        ax.add_patch(zone_rect)
-    elif zone_name == "Restliches Spielfeld":
-        # Markiere den Rest des Spielfelds (alles außerhalb der gestrichelten Zonen)
-        # Zeichne einen Rahmen um den nicht markierten Bereich
-        ax.add_patch(patches.Rectangle((0, 0), 68, 75, edgecolor='#888888', facecolor='#888888', alpha=0.3, linewidth=2))
-        # Markiere auch Bereiche oberhalb y=90 außerhalb der Zonen
-        ax.add_patch(patches.Rectangle((0, 90), 14, 10, edgecolor='#888888', facecolor='#888888', alpha=0.3, linewidth=2))
-        ax.add_patch(patches.Rectangle((54, 90), 14, 10, edgecolor='#888888', facecolor='#888888', alpha=0.3, linewidth=2))
+    # Spielfeldlinien aus der gecachten Vorlage
+    draw_pitch(ax, "preview")
+    
+    # Markiere die ausgewählte Zone (Restliches Spielfeld: Bereiche außerhalb der gestrichelten Zonen)
+    zone = ZONE_BY_NAME[zone_name]
+    if zone.get("polygon") is not None:
+        ax.add_patch(patches.Polygon(zone["polygon"], closed=True, edgecolor=zone["color"], facecolor=zone["color"],
+                                     alpha=0.5, linewidth=2))
+    else:
+        if zone["bounds"] is not None:
+            x_min, _, x_max, _, y_min, _, y_max, _ = zone["bounds"]
+            rects, alpha = [(x_min, y_min, x_max - x_min, y_max - y_min)], 0.5
+        else:
+            rects, alpha = zone["preview"], 0.3
+        for x, y, width, height in rects:
+            ax.add_patch(patches.Rectangle((x, y), width, height, edgecolor=zone["color"], facecolor=zone["color"],
+                                           alpha=alpha, linewidth=2))
     
     ax.set_title(zone_name, fontsize=12, fontweight='bold', color='#00ff88', pad=10)
     ax.set_xticks([])
     ax.set_yticks([])
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
-def create_zone_comparison_chart(teams_data, zone_name, goal_type, data_type="goals"):
+def create_zone_comparison_chart(zone_stats, zone_name, goal_type, data_type="goals", zone_bootstrap=None):
     """Erstellt ein Balkendiagramm für den Vergleich der Teams in einer Zone
     
     Args:
-        teams_data: Die Team-Daten
+        zone_stats: Zonen-Statistik aller Teams (aka_zones.zone_stats())
         zone_name: Name der Zone
         goal_type: "Eigene Tore" oder "Gegentore"
         data_type: "goals" für Tore oder "assists" für Assists
+        zone_bootstrap: Optionale Bootstrap-Stichproben (Konfidenzintervall als Fehlerbalken)
     """
     plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = new_figure((10, 6))
     ax.set_facecolor('#1a1a1a')
     
-    teams = list(teams_data.keys())
-    counts = []
-    totals = []
-    percentages = []
-    
+    teams = zone_stats["teams"]
     goal_type_key = "eigene_tore" if goal_type == "Eigene Tore" else "gegentore"
     
-    for team in teams:
-        if data_type == "goals":
-            data = teams_data[team][goal_type_key]["goals"]
-            zone_count = count_goals_in_zone(tuple(data), zone_name)
-        else:  # assists
-            data = teams_data[team][goal_type_key]["assists"]
-            zone_count = count_assists_in_zone(tuple(data), zone_name)
-        
-        total = len(data)
-        percentage = (zone_count / total * 100) if total > 0 else 0
-        
-        counts.append(zone_count)
-        totals.append(total)
-        percentages.append(percentage)
+    # Schnitt aus der Statistik: (Teams,)
+    side_index = zone_stats["sides"].index(goal_type_key)
+    type_index = zone_stats["data_types"].index(data_type)
+    zone_index = zone_stats["zones"].index(zone_name)
+    counts = zone_stats["counts"][:, side_index, type_index, zone_index].tolist()
+    totals = zone_stats["totals"][:, side_index, type_index].tolist()
+    percentages = zone_stats["percentages"][:, side_index, type_index, zone_index].tolist()
     
     # Erstelle Balkendiagramm - Farbe abhängig vom Tor-Typ
     bar_color = '#ff4444' if goal_type == "Gegentore" else '#00ff88'  # Rot für Gegentore, Grün für eigene Tore
     bars = ax.bar(teams, counts, color=bar_color, alpha=0.8, edgecolor='#ffffff', linewidth=1.5)
     
-    # Füge Prozentwerte über den Balken hinzu
+    # Konfidenzintervall des Anteils, umgerechnet auf die Anzahl des Teams
+    intervals = None
+    if zone_bootstrap is not None:
+        intervals = [[bound[zone_index] for bound in select_zone_intervals(zone_bootstrap, goal_type_key, data_type, team)]
+                     for team in teams]
+        lower_counts = [lower * total / 100 for (lower, upper), total in zip(intervals, totals)]
+        upper_counts = [upper * total / 100 for (lower, upper), total in zip(intervals, totals)]
+        ax.errorbar(range(len(teams)), counts, fmt='none', ecolor='#ffffff', elinewidth=1.5, capsize=6,
+                    yerr=[[count - low for count, low in zip(counts, lower_counts)],
+                          [high - count for count, high in zip(counts, upper_counts)]])
+    
+    # Füge Prozentwerte über den Balken hinzu (mit Konfidenzintervall über dem Fehlerbalken)
     for i, (bar, count, total, pct) in enumerate(zip(bars, counts, totals, percentages)):
         height = bar.get_height()
+        label = f'{count}\n({pct:.1f}%)'
+        if intervals is not None:
+            height = max(height, upper_counts[i])
+            label += f'\n{intervals[i][0]:.0f}–{intervals[i][1]:.0f}%'
         ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{count}\n({pct:.1f}%)',
+                label,
                 ha='center', va='bottom', fontsize=10, fontweight='bold', color='#ffffff')
     
     ax.set_xlabel('Teams', fontsize=12, color='#ffffff')
@@ -1138,40 +673,36 @@ def create_zone_comparison_chart(teams_data, zone_name, goal_type, data_type="go
     ax.set_title(f'{zone_name} - {title_suffix} Vergleich', fontsize=14, fontweight='bold', color='#00ff88', pad=20)
     ax.tick_params(colors='#ffffff')
     ax.grid(True, alpha=0.3, color='#00ff88')
+    if intervals is not None:
+        ax.margins(y=0.2)
+        ax.text(0.99, 0.98, f"Fehlerbalken: {CONFIDENCE * 100:.0f}%-Konfidenzintervall (Bootstrap)",
+                transform=ax.transAxes, ha='right', va='top', fontsize=9, color='#aaaaaa')
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
-def create_all_zones_overview_chart(teams_data, goal_type):
-    """Erstellt ein Übersichtsdiagramm für alle Zonen aller Teams"""
+def create_all_zones_overview_chart(zone_stats, goal_type):
+    """Erstellt ein Übersichtsdiagramm für alle Zonen aller Teams aus der Zonen-Statistik"""
     plt.style.use('dark_background')
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig, ax = new_figure((14, 8))
     ax.set_facecolor('#1a1a1a')
     
-    teams = list(teams_data.keys())
-    zones = ["Goldene Zone", "Zone 14", "FDl", "FDr", "HFAl", "HFAr", "ND2l 1/2", "ND2r 1/2", "Restliches Spielfeld"]
+    teams = zone_stats["teams"]
     
     goal_type_key = "eigene_tore" if goal_type == "Eigene Tore" else "gegentore"
     
-    # Berechne Daten für jede Zone
-    zone_data = {}
-    for zone in zones:
-        zone_data[zone] = []
-        for team in teams:
-            goals = teams_data[team][goal_type_key]["goals"]
-            zone_goals = count_goals_in_zone(tuple(goals), zone)
-            total = len(goals)
-            percentage = (zone_goals / total * 100) if total > 0 else 0
-            zone_data[zone].append(percentage)
+    # Prozentanteile aller Zonen für alle Teams: (Teams x Zonen)
+    percentages = zone_stats["percentages"][:, zone_stats["sides"].index(goal_type_key),
+                                            zone_stats["data_types"].index("goals")]
     
     # Erstelle gruppiertes Balkendiagramm
     x = np.arange(len(teams))
-    width = 0.1
-    colors = ['#ffd700', '#ff4444', '#ffaa00', '#ff8800', '#ff6600', '#ff4400', '#ff2200', '#ff0000', '#888888']
+    width = 0.9 / len(ZONES)
     
-    for i, (zone, color) in enumerate(zip(zones, colors)):
-        offset = (i - len(zones)/2) * width + width/2
-        bars = ax.bar(x + offset, zone_data[zone], width, label=zone, color=color, alpha=0.8, edgecolor='#ffffff', linewidth=0.5)
+    for i, zone in enumerate(ZONES):
+        offset = (i - len(ZONES)/2) * width + width/2
+        bars = ax.bar(x + offset, percentages[:, i], width, label=zone["name"], color=zone["chart_color"], alpha=0.8,
+                      edgecolor='#ffffff', linewidth=0.5)
     
     ax.set_xlabel('Teams', fontsize=12, color='#ffffff')
     ax.set_ylabel('Prozent (%)', fontsize=12, color='#ffffff')
@@ -1182,7 +713,70 @@ def create_all_zones_overview_chart(teams_data, goal_type):
     ax.tick_params(colors='#ffffff')
     ax.grid(True, alpha=0.3, color='#00ff88', axis='y')
     
-    plt.tight_layout()
+    fig.tight_layout()
+    return fig
+
+def create_pass_distribution_chart(pass_stats, goal_type):
+    """Erstellt Diagramme der Passweg-Verteilungen (Länge, Richtung, Raumgewinn) aller Teams in Prozent"""
+    plt.style.use('dark_background')
+    fig, axes = new_figure((18, 6), 1, 3)
+    
+    teams = pass_stats["teams"]
+    goal_type_key = "eigene_tore" if goal_type == "Eigene Tore" else "gegentore"
+    side_index = pass_stats["sides"].index(goal_type_key)
+    totals = pass_stats["totals"][:, side_index]
+    colors = plt.cm.tab10(np.arange(len(teams)) % 10)
+    
+    for ax, (name, title) in zip(axes, [("length", "Passlänge"), ("angle", "Richtung"), ("progression", "Raumgewinn")]):
+        ax.set_facecolor('#1a1a1a')
+        counts = pass_stats[name][:, side_index]
+        percentages = np.divide(counts * 100.0, totals[:, None], out=np.zeros(counts.shape), where=totals[:, None] > 0)
+        labels = pass_stats[f"{name}_labels"]
+        x = np.arange(len(labels))
+        width = 0.9 / max(len(teams), 1)
+        for i, team in enumerate(teams):
+            offset = (i - len(teams)/2) * width + width/2
+            ax.bar(x + offset, percentages[i], width, label=team, color=colors[i], alpha=0.8,
+                   edgecolor='#ffffff', linewidth=0.5)
+        ax.set_xticks(x)
+        ax.set_xticklabels(labels, rotation=45, ha='right', color='#ffffff', fontsize=9)
+        ax.set_ylabel('Prozent (%)', fontsize=11, color='#ffffff')
+        ax.set_title(title, fontsize=13, fontweight='bold', color='#00ff88', pad=10)
+        ax.tick_params(colors='#ffffff')
+        ax.grid(True, alpha=0.3, color='#00ff88', axis='y')
+    axes[0].legend(loc='upper right', fontsize=8, framealpha=0.8)
+    fig.suptitle(f'Passwege (Assist → Tor) - {goal_type}', fontsize=14, fontweight='bold', color='#00ff88')
+    
+    fig.tight_layout()
+    return fig
+
+def create_pass_zone_matrix_chart(pass_stats, goal_type, team=None):
+    """Erstellt eine Matrix Assist-Zone → Tor-Zone (Anzahl Passwege) für ein Team oder alle Teams"""
+    plt.style.use('dark_background')
+    fig, ax = new_figure((10, 8))
+    ax.set_facecolor('#1a1a1a')
+    
+    goal_type_key = "eigene_tore" if goal_type == "Eigene Tore" else "gegentore"
+    matrix = select_pass_stats(pass_stats, goal_type_key, team)["zone_matrix"]
+    
+    # Leere Felder bleiben dunkel
+    ax.imshow(np.ma.masked_equal(matrix, 0), cmap='Greens', aspect='auto', vmin=0)
+    for i in range(matrix.shape[0]):
+        for j in range(matrix.shape[1]):
+            if matrix[i, j]:
+                ax.text(j, i, str(matrix[i, j]), ha='center', va='center', fontsize=9, fontweight='bold',
+                        color='#ffffff' if matrix[i, j] > matrix.max() / 2 else '#000000')
+    
+    ax.set_xticks(np.arange(len(PASS_ZONE_NAMES)))
+    ax.set_xticklabels(PASS_ZONE_NAMES, rotation=45, ha='right', color='#ffffff', fontsize=9)
+    ax.set_yticks(np.arange(len(PASS_ZONE_NAMES)))
+    ax.set_yticklabels(PASS_ZONE_NAMES, color='#ffffff', fontsize=9)
+    ax.set_xlabel('Tor-Zone', fontsize=12, color='#ffffff')
+    ax.set_ylabel('Assist-Zone', fontsize=12, color='#ffffff')
+    ax.set_title(f'{team or "Alle Teams"} - {goal_type}: Assist-Zone → Tor-Zone', fontsize=14, fontweight='bold',
+                 color='#00ff88', pad=20)
+    
+    fig.tight_layout()
     return fig
 
 def main():
@@ -1199,18 +793,101 @@ def main():
     
     
     # Lade aktuelle Daten mit automatischer Datei-Erkennung
-    file_modification_key = get_file_modification_times()
-    current_teams_data = get_teams_data(file_modification_key)
+    live_store = get_live_event_store()
+    watch_for_data_changes(live_store.version)
+    
+    # Saison-Auswahl (nur wenn Daten früherer Saisons vorhanden sind)
+    seasons = live_store.store.seasons
+    if len(seasons) > 1:
+        season_options = seasons + ["Alle Saisons"]
+        if st.session_state.get("season_selection") not in season_options:
+            st.session_state.season_selection = seasons[0]
+        selected_season = st.sidebar.selectbox(
+            "Saison:",
+            season_options,
+            index=season_options.index(st.session_state.season_selection),
+            key="season_selector"
+        )
+        st.session_state.season_selection = selected_season
+        data_season = None if selected_season == "Alle Saisons" else selected_season
+    else:
+        data_season = seasons[0] if seasons else None
+    
+    # Filter nach Spielsituation und Spiel (nur wenn die Team-Dateien Event-Angaben enthalten)
+    selected_situation = None
+    selected_match = None
+    situations = live_store.store.present("situation", data_season)
+    if situations:
+        situation_choice = st.sidebar.selectbox("Situation:", ["Alle Situationen"] + situations, key="situation_selector")
+        selected_situation = None if situation_choice == "Alle Situationen" else situation_choice
+    matches = live_store.store.present("match", data_season)
+    if matches:
+        match_choice = st.sidebar.selectbox("Spiel:", ["Alle Spiele"] + matches, key="match_selector")
+        selected_match = None if match_choice == "Alle Spiele" else match_choice
+    current_teams_data = get_teams_data(live_store, data_season, selected_situation, selected_match)
+    
+    # Optionaler SQLite-Index für Zonen- und Ecken-Abfragen (kennt nur Koordinaten, daher nicht bei aktiven Filtern).
+    # Der Abgleich läuft im Hintergrund; bis der Index den aktuellen Datenstand hat, wird im Speicher gerechnet
+    sql_index = None
+    if EVENT_BACKEND == "sqlite" and selected_situation is None and selected_match is None:
+        sql_index = get_sqlite_index()
+        if sql_index is None:
+            st.warning("⚠️ SQLite ohne R*Tree-Unterstützung – Zonen werden im Speicher berechnet.")
+        else:
+            sql_index.request_sync(live_store.store)
+            if sql_index.last_error:
+                st.warning(f"⚠️ SQLite-Index konnte nicht aktualisiert werden: {sql_index.last_error}")
+            if sql_index.generation != live_store.store.generation:
+                sql_index = None
+    
+    # Zonen-Statistik aller Teams (einmal pro Datenstand; Grundlage für Zonen-Diagramme und Sidebar)
+    if sql_index is not None:
+        current_zone_stats = get_sqlite_zone_stats(sql_index, sql_index.generation,
+                                                   tuple(current_teams_data.keys()), data_season)
+    else:
+        current_zone_stats = get_zone_stats(live_store, live_store.version, data_season,
+                                            selected_situation, selected_match)
+    # Konfidenzintervalle der Zonen-Anteile (Bootstrap, einmal pro Datenstand)
+    current_zone_bootstrap = get_zone_bootstrap(live_store, live_store.version, data_season,
+                                                selected_situation, selected_match)
+    # Datenstand und Filter als Teil der Bild-Cache-Schlüssel (gleiche Daten und Auswahl -> gleiches Bild)
+    data_key = (live_store.version, data_season, selected_situation, selected_match)
     
     # Zeige Daten-Status
     if not current_teams_data:
         st.error("❌ Keine Team-Daten gefunden! Bitte überprüfen Sie den Pfad zu den Team-Dateien.")
         return
     
+    # Parse-Fehler in den Team-Dateien anzeigen (Daten wurden soweit möglich übernommen)
+    parse_errors = []
+    for team, team_data in current_teams_data.items():
+        for goal_type_key, label in (("eigene_tore", "Eigene Tore"), ("gegentore", "Gegentore")):
+            for error in team_data[goal_type_key].get("parse_errors", []):
+                parse_errors.append(f"- **{team} {label}:** {error}")
+    if parse_errors:
+        with st.expander(f"⚠️ {len(parse_errors)} Problem(e) beim Einlesen der Team-Dateien"):
+            st.markdown("\n".join(parse_errors))
+    
+    # Fehlgeschlagenes Neu-Einlesen nach einer Dateiänderung: angezeigt wird der letzte gültige Datenstand
+    if live_store.watcher.last_error:
+        st.error(f"⚠️ Aktualisierung nach einer Dateiänderung fehlgeschlagen, angezeigt wird der letzte gültige "
+                 f"Datenstand: {live_store.watcher.last_error}")
+    
+    # Fehler in der Zonen-Konfiguration (zonen.json); gültige Zonen werden trotzdem verwendet
+    if ZONE_CONFIG_ERRORS:
+        with st.expander(f"⚠️ {len(ZONE_CONFIG_ERRORS)} Problem(e) in der Zonen-Konfiguration"):
+            st.markdown("\n".join(f"- {error}" for error in ZONE_CONFIG_ERRORS))
+    
+    # Datenprüfung (einmal beim Einlesen berechnet): fehlende Partner, Punkte außerhalb, Duplikate, Ausrichtung
+    diagnostics = live_store.store.diagnostics(data_season)
+    if diagnostics:
+        with st.expander(f"🩺 Datenprüfung: {sum(d['count'] for d in diagnostics)} Auffälligkeit(en) in den Team-Dateien"):
+            st.dataframe(diagnostics, width="stretch")
+    
     # Sidebar für Auswahl
     
     # Ansichts-Auswahl ganz oben
-    view_options = ["Spielfeld-Ansicht", "Ecken-Ansicht", "Zonen-Vergleich Tore", "Zonen-Vergleich Assists"]
+    view_options = ["Spielfeld-Ansicht", "Ecken-Ansicht", "Zonen-Vergleich Tore", "Zonen-Vergleich Assists", "Passwege"]
     if "view_selection" not in st.session_state:
         st.session_state.view_selection = "Spielfeld-Ansicht"
     
@@ -1225,9 +902,10 @@ def main():
     st.sidebar.markdown("---")
     
     # Zone-Auswahl (wird später am Ende der Sidebar angezeigt, aber hier initialisiert)
-    zone_options = ["Goldene Zone", "Zone 14"]
+    # Alle Zonen aus aka_zones (Standard-Zonen und eigene Zonen aus zonen.json)
+    zone_options = list(ZONE_NAMES)
     if "zone_selection" not in st.session_state:
-        st.session_state.zone_selection = "Goldene Zone"
+        st.session_state.zone_selection = zone_options[0]
     
     # Initialisiere Session State für persistente Auswahl
     if 'team1_selection' not in st.session_state:
@@ -1266,28 +944,18 @@ def main():
     
     if selected_view == "Ecken-Ansicht":
         # Ecken-Ansicht: nur Ecken-Tore (Assist bei (0,100) oder (68,100))
-        ecken_teams_data = {}
-        for team in current_teams_data.keys():
-            eg, ea = filter_corner_goals_and_assists(
-                current_teams_data[team]["eigene_tore"]["goals"],
-                current_teams_data[team]["eigene_tore"]["assists"]
-            )
-            gg, ga = filter_corner_goals_and_assists(
-                current_teams_data[team]["gegentore"]["goals"],
-                current_teams_data[team]["gegentore"]["assists"]
-            )
-            ecken_teams_data[team] = {
-                "eigene_tore": {
-                    "goals": eg, "assists": ea,
-                    "title": f"{team} - Eigene Ecken-Tore",
-                    "additional_info": ""
-                },
-                "gegentore": {
-                    "goals": gg, "assists": ga,
-                    "title": f"{team} - Ecken-Gegentore",
-                    "additional_info": ""
-                }
-            }
+        if sql_index is not None:
+            ecken_teams_data = get_sqlite_corner_snapshot(sql_index, sql_index.generation,
+                                                          tuple(current_teams_data.keys()), data_season)
+            ecken_zone_stats = get_sqlite_zone_stats(sql_index, sql_index.generation,
+                                                     tuple(current_teams_data.keys()), data_season, corners=True)
+        else:
+            ecken_teams_data = get_corner_snapshot(live_store, live_store.version, data_season,
+                                                   selected_situation, selected_match)
+            ecken_zone_stats = get_zone_stats(live_store, live_store.version, data_season,
+                                              selected_situation, selected_match, corners=True)
+        ecken_zone_bootstrap = get_zone_bootstrap(live_store, live_store.version, data_season,
+                                                  selected_situation, selected_match, corners=True)
         goal_type1 = "Eigene Tore"
         goal_type2 = "Gegentore"
         team2 = team1
@@ -1388,130 +1056,28 @@ def main():
         st.session_state.team2_selection = team2
         st.session_state.goal_type2_selection = goal_type2
     
-    # Goldene Zone Berechnung und Anzeige basierend auf Team-Auswahl
-    def count_goals_in_golden_zone(goals):
-        """Zählt Tore in der goldenen Zone (x: 25-43, y: 84-100)"""
-        golden_zone_goals = 0
-        for goal in goals:
-            x, y = goal
-            if 25 <= x <= 43 and 84 <= y <= 100:
-                golden_zone_goals += 1
-        return golden_zone_goals
-    
-    def count_assists_in_red_zone(assists):
-        """Zählt Assists in der roten Zone (x: 25-43, y: 75-84)"""
-        red_zone_assists = 0
-        for assist in assists:
-            x, y = assist
-            if 25 <= x <= 43 and 75 <= y <= 84:
-                red_zone_assists += 1
-        return red_zone_assists
-    
-    # Berechne Goldene Zone und Zone 14 Daten für das ausgewählte Team
-    if team1 == "Alle Teams":
-        # Für "Alle Teams" sammle alle Tore und Assists aller Teams
-        all_eigene_goals = []
-        all_gegentore_goals = []
-        all_eigene_assists = []
-        all_gegentore_assists = []
-        for team in current_teams_data.keys():
-            all_eigene_goals.extend(current_teams_data[team]["eigene_tore"]["goals"])
-            all_gegentore_goals.extend(current_teams_data[team]["gegentore"]["goals"])
-            all_eigene_assists.extend(current_teams_data[team]["eigene_tore"]["assists"])
-            all_gegentore_assists.extend(current_teams_data[team]["gegentore"]["assists"])
-        
-        team_eigene_golden = count_goals_in_golden_zone(all_eigene_goals)
-        team_gegentore_golden = count_goals_in_golden_zone(all_gegentore_goals)
-        team_eigene_total = len(all_eigene_goals)
-        team_gegentore_total = len(all_gegentore_goals)
-        
-        # Zone 14 Assists
-        team_eigene_red = count_assists_in_red_zone(all_eigene_assists)
-        team_gegentore_red = count_assists_in_red_zone(all_gegentore_assists)
-        team_eigene_assists_total = len(all_eigene_assists)
-        team_gegentore_assists_total = len(all_gegentore_assists)
-        team_name = "Alle Teams"
-    else:
-        # Für einzelnes Team
-        team_eigene_data = current_teams_data[team1]["eigene_tore"]
-        team_gegentore_data = current_teams_data[team1]["gegentore"]
-        
-        team_eigene_golden = count_goals_in_golden_zone(team_eigene_data["goals"])
-        team_gegentore_golden = count_goals_in_golden_zone(team_gegentore_data["goals"])
-        team_eigene_total = len(team_eigene_data["goals"])
-        team_gegentore_total = len(team_gegentore_data["goals"])
-        
-        # Zone 14 Assists
-        team_eigene_red = count_assists_in_red_zone(team_eigene_data["assists"])
-        team_gegentore_red = count_assists_in_red_zone(team_gegentore_data["assists"])
-        team_eigene_assists_total = len(team_eigene_data["assists"])
-        team_gegentore_assists_total = len(team_gegentore_data["assists"])
-        team_name = team1
-    
-    # Berechne Prozentsätze für Goldene Zone
-    team_eigene_percent = (team_eigene_golden / team_eigene_total * 100) if team_eigene_total > 0 else 0
-    team_gegentore_percent = (team_gegentore_golden / team_gegentore_total * 100) if team_gegentore_total > 0 else 0
-    
-    # Berechne Prozentsätze für Zone 14
-    team_eigene_red_percent = (team_eigene_red / team_eigene_assists_total * 100) if team_eigene_assists_total > 0 else 0
-    team_gegentore_red_percent = (team_gegentore_red / team_gegentore_assists_total * 100) if team_gegentore_assists_total > 0 else 0
-    
     # Konvertiere Anzeige-Text zurück zu internen Werten
     goal_type1_key, data_type1 = convert_goal_type_to_internal(goal_type1)
     goal_type2_key, data_type2 = convert_goal_type_to_internal(goal_type2)
     
     # Zone-Auswahl (für Berechnung)
-    selected_zone = zone_options[zone_options.index(st.session_state.zone_selection)] if st.session_state.zone_selection in zone_options else "Goldene Zone"
-    
-    def get_team_data(team_name, goal_type_key, data_type):
-        """Hilfsfunktion um Team-Daten zu holen, auch für 'Alle Teams'"""
-        if team_name == "Alle Teams":
-            # Sammle alle Daten aller Teams für den gewählten Tor-Typ
-            all_data = []
-            for team in current_teams_data.keys():
-                if data_type == "goals":
-                    all_data.extend(current_teams_data[team][goal_type_key]["goals"])
-                elif data_type == "assists":
-                    all_data.extend(current_teams_data[team][goal_type_key]["assists"])
-                else:  # both - kombiniere Tore und Assists nicht, da sie separat angezeigt werden
-                    # Für "both" geben wir nur Tore zurück, da die Funktion beide separat behandelt
-                    all_data.extend(current_teams_data[team][goal_type_key]["goals"])
-            return all_data
-        else:
-            if data_type == "goals":
-                return current_teams_data[team_name][goal_type_key]["goals"]
-            elif data_type == "assists":
-                return current_teams_data[team_name][goal_type_key]["assists"]
-            else:  # both
-                # Für "both" geben wir nur Tore zurück, da die Funktion beide separat behandelt
-                return current_teams_data[team_name][goal_type_key]["goals"]
-    
-    # Vergleichsdaten laden
-    # Für "both" müssen wir beide Daten separat zählen
-    if data_type1 == "both":
-        team1_goals = get_team_data(team1, goal_type1_key, "goals")
-        team1_assists = get_team_data(team1, goal_type1_key, "assists")
-        data1_count = len(team1_goals) + len(team1_assists)
-    else:
-        data1_list = get_team_data(team1, goal_type1_key, data_type1)
-        data1_count = len(data1_list)
+    selected_zone = st.session_state.zone_selection if st.session_state.zone_selection in zone_options else zone_options[0]
     
-    if data_type2 == "both":
-        team2_goals = get_team_data(team2, goal_type2_key, "goals")
-        team2_assists = get_team_data(team2, goal_type2_key, "assists")
-        data2_count = len(team2_goals) + len(team2_assists)
-    else:
-        data2_list = get_team_data(team2, goal_type2_key, data_type2)
-        data2_count = len(data2_list)
+    def zone_figures(team_name, goal_type_key, data_type):
+        """Zählungen pro Zone und Gesamtzahl aus der Zonen-Statistik, auch für 'Alle Teams' und 'both'"""
+        return select_zone_stats(current_zone_stats, goal_type_key, data_type,
+                                 None if team_name == "Alle Teams" else team_name)
+    
+    # Vergleichsdaten (für "both" werden Tore und Assists zusammengezählt)
+    team1_zone_counts, team1_total = zone_figures(team1, goal_type1_key, data_type1)
+    team2_zone_counts, team2_total = zone_figures(team2, goal_type2_key, data_type2)
+    data1_count, data2_count = team1_total, team2_total
     
     # Ecken-Ansicht: Zähler auf gefilterte Ecken-Tore/Gegentore setzen
     if selected_view == "Ecken-Ansicht":
-        if team1 == "Alle Teams":
-            data1_count = sum(len(ecken_teams_data[t]["eigene_tore"]["goals"]) for t in ecken_teams_data)
-            data2_count = sum(len(ecken_teams_data[t]["gegentore"]["goals"]) for t in ecken_teams_data)
-        else:
-            data1_count = len(ecken_teams_data[team1]["eigene_tore"]["goals"])
-            data2_count = len(ecken_teams_data[team1]["gegentore"]["goals"])
+        ecken_team = None if team1 == "Alle Teams" else team1
+        data1_count = select_zone_stats(ecken_zone_stats, "eigene_tore", "goals", ecken_team)[1]
+        data2_count = select_zone_stats(ecken_zone_stats, "gegentore", "goals", ecken_team)[1]
     
     # Vergleich anzeigen mit zusätzlichen Informationen direkt darunter
     # Team 1
@@ -1581,7 +1147,7 @@ def main():
             st.sidebar.markdown(f"**Gegentore:** Alle Teams - {' '.join(all_gegentore_infos)}")
     
     # Zone-Auswahl und Beschriftung nur bei Spielfeld-Ansicht anzeigen
-    selected_zone = zone_options[zone_options.index(st.session_state.zone_selection)] if st.session_state.zone_selection in zone_options else "Goldene Zone"
+    selected_zone = st.session_state.zone_selection if st.session_state.zone_selection in zone_options else zone_options[0]
     zone_placeholder = st.sidebar.empty()
     
     if selected_view == "Spielfeld-Ansicht":
@@ -1602,106 +1168,26 @@ def main():
         st.session_state.zone_selection = selected_zone
         
         # Dynamischer Zone Header
-        if selected_zone == "Goldene Zone":
-            st.sidebar.markdown("### 🏆 Goldene Zone")
-        else:
-            st.sidebar.markdown("### 🔴 Zone 14")
+        zone_icon = {"Goldene Zone": "🏆", "Zone 14": "🔴"}.get(selected_zone, "📍")
+        st.sidebar.markdown(f"### {zone_icon} {selected_zone}")
         
         # Platzhalter für Zone Daten (wird direkt danach aktualisiert)
         zone_placeholder = st.sidebar.empty()
         
         # Aktualisiere Zone Daten basierend auf Auswahl (erneut berechnen mit aktualisiertem selected_zone)
-    if selected_zone == "Goldene Zone":
-        # Goldene Zone - zeige Daten der beiden ausgewählten Teams
-        # Hole Daten für Team 1
-        if data_type1 == "both":
-            team1_goals_list = get_team_data(team1, goal_type1_key, "goals")
-            team1_assists_list = get_team_data(team1, goal_type1_key, "assists")
-            team1_golden_goals = count_goals_in_golden_zone(team1_goals_list)
-            team1_golden_assists = count_assists_in_zone(tuple(team1_assists_list), "Goldene Zone")
-            team1_golden_count = team1_golden_goals + team1_golden_assists
-            team1_total = len(team1_goals_list) + len(team1_assists_list)
-            data_label1 = "Assists/Tore"
-        else:
-            team1_data_list = get_team_data(team1, goal_type1_key, data_type1)
-            if data_type1 == "goals":
-                team1_golden_count = count_goals_in_golden_zone(team1_data_list)
-                data_label1 = "Tore"
-            else:
-                team1_golden_count = count_assists_in_zone(tuple(team1_data_list), "Goldene Zone")
-                data_label1 = "Assists"
-            team1_total = len(team1_data_list)
-        team1_golden_percent = (team1_golden_count / team1_total * 100) if team1_total > 0 else 0
-        
-        # Hole Daten für Team 2
-        if data_type2 == "both":
-            team2_goals_list = get_team_data(team2, goal_type2_key, "goals")
-            team2_assists_list = get_team_data(team2, goal_type2_key, "assists")
-            team2_golden_goals = count_goals_in_golden_zone(team2_goals_list)
-            team2_golden_assists = count_assists_in_zone(tuple(team2_assists_list), "Goldene Zone")
-            team2_golden_count = team2_golden_goals + team2_golden_assists
-            team2_total = len(team2_goals_list) + len(team2_assists_list)
-            data_label2 = "Assists/Tore"
-        else:
-            team2_data_list = get_team_data(team2, goal_type2_key, data_type2)
-            if data_type2 == "goals":
-                team2_golden_count = count_goals_in_golden_zone(team2_data_list)
-                data_label2 = "Tore"
-            else:
-                team2_golden_count = count_assists_in_zone(tuple(team2_data_list), "Goldene Zone")
-                data_label2 = "Assists"
-            team2_total = len(team2_data_list)
-        team2_golden_percent = (team2_golden_count / team2_total * 100) if team2_total > 0 else 0
-        
-        zone_text = f"**{team1} {goal_type1}:**\n"
-        zone_text += f"{team1_golden_count} {data_label1} von {team1_total} {data_label1} ({team1_golden_percent:.1f}%)\n\n"
-        zone_text += f"**{team2} {goal_type2}:**\n"
-        zone_text += f"{team2_golden_count} {data_label2} von {team2_total} {data_label2} ({team2_golden_percent:.1f}%)"
-    else:  # Zone 14 - zeige Daten der beiden ausgewählten Teams
-        # Hole Daten für Team 1
-        if data_type1 == "both":
-            team1_goals_list = get_team_data(team1, goal_type1_key, "goals")
-            team1_assists_list = get_team_data(team1, goal_type1_key, "assists")
-            team1_red_goals = count_goals_in_zone(tuple(team1_goals_list), "Zone 14")
-            team1_red_assists = count_assists_in_red_zone(team1_assists_list)
-            team1_red_count = team1_red_goals + team1_red_assists
-            team1_total = len(team1_goals_list) + len(team1_assists_list)
-            data_label1 = "Assists/Tore"
-        else:
-            team1_data_list = get_team_data(team1, goal_type1_key, data_type1)
-            if data_type1 == "goals":
-                team1_red_count = count_goals_in_zone(tuple(team1_data_list), "Zone 14")
-                data_label1 = "Tore"
-            else:
-                team1_red_count = count_assists_in_red_zone(team1_data_list)
-                data_label1 = "Assists"
-            team1_total = len(team1_data_list)
-        team1_red_percent = (team1_red_count / team1_total * 100) if team1_total > 0 else 0
-        
-        # Hole Daten für Team 2
-        if data_type2 == "both":
-            team2_goals_list = get_team_data(team2, goal_type2_key, "goals")
-            team2_assists_list = get_team_data(team2, goal_type2_key, "assists")
-            team2_red_goals = count_goals_in_zone(tuple(team2_goals_list), "Zone 14")
-            team2_red_assists = count_assists_in_red_zone(team2_assists_list)
-            team2_red_count = team2_red_goals + team2_red_assists
-            team2_total = len(team2_goals_list) + len(team2_assists_list)
-            data_label2 = "Assists/Tore"
-        else:
-            team2_data_list = get_team_data(team2, goal_type2_key, data_type2)
-            if data_type2 == "goals":
-                team2_red_count = count_goals_in_zone(tuple(team2_data_list), "Zone 14")
-                data_label2 = "Tore"
-            else:
-                team2_red_count = count_assists_in_red_zone(team2_data_list)
-                data_label2 = "Assists"
-            team2_total = len(team2_data_list)
-        team2_red_percent = (team2_red_count / team2_total * 100) if team2_total > 0 else 0
-        
-        zone_text = f"**{team1} {goal_type1}:**\n"
-        zone_text += f"{team1_red_count} {data_label1} von {team1_total} {data_label1} ({team1_red_percent:.1f}%)\n\n"
-        zone_text += f"**{team2} {goal_type2}:**\n"
-        zone_text += f"{team2_red_count} {data_label2} von {team2_total} {data_label2} ({team2_red_percent:.1f}%)"
+    # Zone-Daten der beiden ausgewählten Teams
+    zone_index = current_zone_stats["zones"].index(selected_zone)
+    data_label1 = "Assists/Tore" if data_type1 == "both" else ("Tore" if data_type1 == "goals" else "Assists")
+    data_label2 = "Assists/Tore" if data_type2 == "both" else ("Tore" if data_type2 == "goals" else "Assists")
+    team1_zone_count = int(team1_zone_counts[zone_index])
+    team2_zone_count = int(team2_zone_counts[zone_index])
+    team1_zone_percent = (team1_zone_count / team1_total * 100) if team1_total > 0 else 0
+    team2_zone_percent = (team2_zone_count / team2_total * 100) if team2_total > 0 else 0
+    
+    zone_text = f"**{team1} {goal_type1}:**\n"
+    zone_text += f"{team1_zone_count} {data_label1} von {team1_total} {data_label1} ({team1_zone_percent:.1f}%)\n\n"
+    zone_text += f"**{team2} {goal_type2}:**\n"
+    zone_text += f"{team2_zone_count} {data_label2} von {team2_total} {data_label2} ({team2_zone_percent:.1f}%)"
     
     # Zone-Daten nur bei Spielfeld-Ansicht anzeigen
     if selected_view == "Spielfeld-Ansicht":
@@ -1709,48 +1195,55 @@ def main():
     
     # Hauptinhalt basierend auf ausgewählter Ansicht
     if selected_view == "Spielfeld-Ansicht":
+        # Hotspots (Häufungen von Toren/Assists) optional als Overlay
+        st.sidebar.markdown("---")
+        show_hotspots = st.sidebar.checkbox("Hotspots anzeigen", key="hotspot_toggle")
+        renderer = FIELD_RENDERERS[st.sidebar.radio("Darstellung der Spielfelder:", list(FIELD_RENDERERS),
+                                                    key="renderer_spielfeld", horizontal=True)]
+        hotspots1 = hotspots2 = None
+        if show_hotspots:
+            hotspots1 = get_hotspots(live_store, live_store.version, data_season, selected_situation, selected_match,
+                                     None if team1 == "Alle Teams" else team1, goal_type1_key)
+            hotspots2 = get_hotspots(live_store, live_store.version, data_season, selected_situation, selected_match,
+                                     None if team2 == "Alle Teams" else team2, goal_type2_key)
+        
         # Spielfelder basierend auf Team-Vergleich
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown(f"### {team1} - {goal_type1}")
-            if team1 == "Alle Teams":
-                # Zeige alle Tore/Assists aller Teams auf einem Spielfeld
-                fig1 = draw_all_teams_field(goal_type1_key, current_teams_data, data_type1)
-            else:
-                fig1 = draw_field(team1, goal_type1_key, current_teams_data, data_type1)
-            st.pyplot(fig1, use_container_width=True)
+            # "Alle Teams": alle Tore/Assists aller Teams auf einem Spielfeld
+            show_field(renderer, ("spielfeld", data_key, team1, goal_type1_key, data_type1, show_hotspots), goal_type1_key,
+                       current_teams_data, data_type1, current_zone_stats, hotspots1, current_zone_bootstrap,
+                       None if team1 == "Alle Teams" else team1)
         
         with col2:
             st.markdown(f"### {team2} - {goal_type2}")
-            if team2 == "Alle Teams":
-                # Zeige alle Tore/Assists aller Teams auf einem Spielfeld
-                fig2 = draw_all_teams_field(goal_type2_key, current_teams_data, data_type2)
-            else:
-                fig2 = draw_field(team2, goal_type2_key, current_teams_data, data_type2)
-            st.pyplot(fig2, use_container_width=True)
+            # "Alle Teams": alle Tore/Assists aller Teams auf einem Spielfeld
+            show_field(renderer, ("spielfeld", data_key, team2, goal_type2_key, data_type2, show_hotspots), goal_type2_key,
+                       current_teams_data, data_type2, current_zone_stats, hotspots2, current_zone_bootstrap,
+                       None if team2 == "Alle Teams" else team2)
     
     elif selected_view == "Ecken-Ansicht":
         # Nur Tore/Gegentore mit Assist bei (0,100) oder (68,100) – Ecken
+        st.sidebar.markdown("---")
+        renderer = FIELD_RENDERERS[st.sidebar.radio("Darstellung der Spielfelder:", list(FIELD_RENDERERS),
+                                                    key="renderer_ecken", horizontal=True)]
         col1, col2 = st.columns(2)
         with col1:
             st.markdown(f"### {team1} - Eigene Ecken-Tore")
-            if team1 == "Alle Teams":
-                fig1 = draw_all_teams_field("eigene_tore", ecken_teams_data, "both")
-            else:
-                fig1 = draw_field(team1, "eigene_tore", ecken_teams_data, "both")
-            st.pyplot(fig1, use_container_width=True)
+            show_field(renderer, ("ecken", data_key, team1, "eigene_tore"), "eigene_tore", ecken_teams_data, "both",
+                       ecken_zone_stats, zone_bootstrap=ecken_zone_bootstrap,
+                       team=None if team1 == "Alle Teams" else team1)
         with col2:
             st.markdown(f"### {team1} - Ecken-Gegentore")
-            if team1 == "Alle Teams":
-                fig2 = draw_all_teams_field("gegentore", ecken_teams_data, "both")
-            else:
-                fig2 = draw_field(team1, "gegentore", ecken_teams_data, "both")
-            st.pyplot(fig2, use_container_width=True)
+            show_field(renderer, ("ecken", data_key, team1, "gegentore"), "gegentore", ecken_teams_data, "both",
+                       ecken_zone_stats, zone_bootstrap=ecken_zone_bootstrap,
+                       team=None if team1 == "Alle Teams" else team1)
     
     elif selected_view == "Zonen-Vergleich Tore":
         # Zone-Auswahl für Diagramm
-        zone_names = ["Goldene Zone", "Zone 14", "FDl", "FDr", "HFAl", "HFAr", "ND2l 1/2", "ND2r 1/2", "Restliches Spielfeld"]
+        zone_names = ZONE_NAMES
         selected_zone_for_chart = st.selectbox(
             "Zone für Vergleich auswählen:",
             zone_names,
@@ -1769,17 +1262,19 @@ def main():
         
         with col_preview:
             st.markdown("### Zone-Vorschau")
-            zone_preview_fig = create_zone_preview(selected_zone_for_chart)
-            st.pyplot(zone_preview_fig, use_container_width=True)
+            show_cached_figure(("zonen_vorschau", selected_zone_for_chart),
+                               lambda: create_zone_preview(selected_zone_for_chart))
         
         with col_chart:
             # Erstelle und zeige Diagramm für Tore
-            chart_fig = create_zone_comparison_chart(current_teams_data, selected_zone_for_chart, goal_type_for_chart, data_type="goals")
-            st.pyplot(chart_fig, use_container_width=True)
+            show_cached_figure(("zonen_vergleich", data_key, selected_zone_for_chart, goal_type_for_chart, "goals"),
+                               lambda: create_zone_comparison_chart(current_zone_stats, selected_zone_for_chart,
+                                                                    goal_type_for_chart, data_type="goals",
+                                                                    zone_bootstrap=current_zone_bootstrap))
     
     elif selected_view == "Zonen-Vergleich Assists":
         # Zone-Auswahl für Diagramm
-        zone_names = ["Goldene Zone", "Zone 14", "FDl", "FDr", "HFAl", "HFAr", "ND2l 1/2", "ND2r 1/2", "Restliches Spielfeld"]
+        zone_names = ZONE_NAMES
         selected_zone_for_chart = st.selectbox(
             "Zone für Vergleich auswählen:",
             zone_names,
@@ -1801,16 +1296,75 @@ def main():
         
         with col_preview:
             st.markdown("### Zone-Vorschau")
-            zone_preview_fig = create_zone_preview(selected_zone_for_chart)
-            st.pyplot(zone_preview_fig, use_container_width=True)
+            show_cached_figure(("zonen_vorschau", selected_zone_for_chart),
+                               lambda: create_zone_preview(selected_zone_for_chart))
         
         with col_chart:
             # Erstelle und zeige Diagramm für Assists
-            chart_fig = create_zone_comparison_chart(current_teams_data, selected_zone_for_chart, goal_type_for_chart, data_type="assists")
-            st.pyplot(chart_fig, use_container_width=True)
+            show_cached_figure(("zonen_vergleich", data_key, selected_zone_for_chart, goal_type_for_chart, "assists"),
+                               lambda: create_zone_comparison_chart(current_zone_stats, selected_zone_for_chart,
+                                                                    goal_type_for_chart, data_type="assists",
+                                                                    zone_bootstrap=current_zone_bootstrap))
+    
+    elif selected_view == "Passwege":
+        # Tor-Typ Auswahl für die Passweg-Analyse
+        goal_type_for_chart = st.selectbox(
+            "Tor-Typ für Passwege:",
+            ["Eigene Tore", "Gegentore"],
+            key="goal_type_pass_selector"
+        )
+        goal_type_key_for_chart = "eigene_tore" if goal_type_for_chart == "Eigene Tore" else "gegentore"
+        current_pass_stats = get_pass_stats(live_store, live_store.version, data_season,
+                                            selected_situation, selected_match)
+        
+        # Kennzahlen pro Team
+        pass_rows = []
+        for team in current_pass_stats["teams"]:
+            team_passes = select_pass_stats(current_pass_stats, goal_type_key_for_chart, team)
+            total = int(team_passes["totals"])
+            steil = team_passes["angle"][current_pass_stats["angle_labels"].index("steil")]
+            pass_rows.append({
+                "Team": team,
+                "Passwege": total,
+                "Ø Länge (m)": round(team_passes["mean_length"], 1),
+                "Ø Raumgewinn (m)": round(team_passes["mean_progression"], 1),
+                "Steil (%)": round(steil / total * 100, 1) if total > 0 else 0,
+            })
+        st.dataframe(pass_rows, width="stretch")
+        
+        show_cached_figure(("passwege", data_key, goal_type_for_chart),
+                           lambda: create_pass_distribution_chart(current_pass_stats, goal_type_for_chart))
+        
+        # Zonen-Matrix für das in der Sidebar gewählte Team
+        show_cached_figure(("passwege_matrix", data_key, goal_type_for_chart, team1),
+                           lambda: create_pass_zone_matrix_chart(current_pass_stats, goal_type_for_chart,
+                                                                 None if team1 == "Alle Teams" else team1))
     
     # Footer
     st.markdown("---")
+    
+    # Ladezeiten der Team-Dateien (letztes Einlesen pro Datei)
+    build_info = live_store.store.meta.get("build", {})
+    with st.expander("⏱️ Ladezeiten der Team-Dateien"):
+        st.caption(
+            f"{build_info.get('files', 0)} Dateien, davon {build_info.get('parsed', 0)} zuletzt neu eingelesen "
+            f"in {build_info.get('total_ms', 0):.1f} ms ({build_info.get('workers', 1)} Prozess(e))"
+        )
+        st.dataframe(live_store.store.load_report(), width="stretch")
+
+    # Diagnose: Figuren werden ohne pyplot erzeugt und nach dem Kodieren freigegeben; Bilder kommen aus dem Cache
+    diagnostics = figure_diagnostics()
+    image_cache_stats = get_image_cache().stats()
+    with st.expander("🧮 Matplotlib-Figuren"):
+        st.caption(
+            f"{diagnostics['pyplot']} im pyplot-Register, {diagnostics['live']} noch im Speicher, "
+            f"{diagnostics['created']} seit dem Start erzeugt (dieser Server-Prozess)"
+        )
+        st.caption(
+            f"Bild-Cache: {image_cache_stats['entries']} Bilder, {image_cache_stats['bytes'] / 1024 / 1024:.1f} MB, "
+            f"{image_cache_stats['hits']} Treffer, {image_cache_stats['misses']} neu gezeichnet, "
+            f"{image_cache_stats['evictions']} verdrängt"
+        )
 
 if __name__ == "__main__":
     main()
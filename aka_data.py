@@ -0,0 +1,1118 @@
+"""
+Datenschicht des AKA Dashboards.
+
+Liest die Team-Skripte (EigeneTore*.py / Gegentore*.py) in einem Durchgang
+über den AST und legt die Tore und Assists in einem kompilierten,
+spaltenorientierten Event-Store ab. Der Store besteht aus einer Binärdatei mit
+typisierten Spalten (x, y, Assist x/y, Spiel, Datum, Minute, Torschütze,
+Vorlagengeber, Situation, Team, Seite, Saison) und einer JSON-Beschreibung.
+Beim Start wird die Binärdatei per Memory-Mapping geöffnet; neu gebaut wird
+nur, wenn sich eine Quelldatei geändert hat. Viele geänderte Dateien werden
+parallel in einem Prozess-Pool eingelesen.
+
+Neben den Team-Skripten kann jeder Team-Ordner Import-Dateien enthalten
+(EigeneTore<Team>.import.jsonl, von aka_import.py geschrieben); deren Events
+werden an die Tore/Assists der Team-Datei angehängt.
+
+Dieses Modul importiert bewusst kein Streamlit, damit es auch außerhalb des
+Dashboards (Skripte, Worker-Prozesse) verwendet werden kann.
+"""
+import ast
+import json
+import os
+import re
+import time
+from datetime import date, datetime
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+
+# Seiten eines Teams: eigene Tore und Gegentore
+SIDES = ["eigene_tore", "gegentore"]
+SIDE_FILE_PREFIX = {"eigene_tore": "EigeneTore", "gegentore": "Gegentore"}
+SIDE_TITLE = {"eigene_tore": "Eigene Tore", "gegentore": "Gegentore"}
+
+# Speicherort des kompilierten Stores (relativ zum Datenordner)
+STORE_DIR = ".aka_cache"
+STORE_META_FILE = "events.json"
+MANIFEST_FILE = "manifest.json"
+
+MANIFEST_FORMAT_VERSION = 3
+STORE_FORMAT_VERSION = 9
+
+# Platzhalter für ein fehlendes Tor bzw. einen fehlenden Assist (hält Tor und Assist in derselben Zeile)
+MISSING_POINT = (float("nan"), float("nan"))
+
+# Daten-Listen einer Team-Datei: nicht lesbare Einträge werden gemeldet (nicht stillschweigend übergangen)
+DATA_VARIABLES = ("goals", "assists", "events")
+
+# Team-Dateien: EigeneTore<Team>.py / Gegentore<Team>.py im Ordner des Teams
+SOURCE_FILE_PATTERN = re.compile(r'^(EigeneTore|Gegentore)(.+)\.py$')
+# Importierte Events: EigeneTore<Team>.import.jsonl / Gegentore<Team>.import.jsonl (eine JSON-Zeile pro Tor)
+IMPORT_FILE_SUFFIX = ".import.jsonl"
+IMPORT_FILE_PATTERN = re.compile(r'^(EigeneTore|Gegentore)(.+)\.import\.jsonl$')
+
+# Saison-Ordner (z.B. "2024-25", "Saison 2023_24") enthalten die Team-Ordner früherer Saisons.
+# Team-Ordner direkt im Datenordner gehören zur aktuellen Saison.
+SEASON_DIR_PATTERN = re.compile(r'^(?:Saison[ _-]?)?\d{2}(?:\d{2})?[-_]\d{2}(?:\d{2})?$')
+CURRENT_SEASON = "Aktuelle Saison"
+
+# Ab so vielen neu einzulesenden Dateien lohnt sich der Start eines Prozess-Pools
+PARALLEL_MIN_FILES = 16
+
+# Spielfeld im Dashboard: x quer (0-68 m), y in Angriffsrichtung (0-100, gegnerisches Tor bei 100)
+PITCH_WIDTH = 68.0
+PITCH_LENGTH = 100.0
+
+# Prüf-Flags pro Event (Bitmaske in der Spalte "flags"), beim Einlesen einmal berechnet
+FLAG_UNPAIRED = 1
+FLAG_OUT_OF_BOUNDS = 2
+FLAG_DUPLICATE = 4
+FLAG_ORIENTATION = 8
+VALIDATION_FLAGS = {
+    FLAG_UNPAIRED: "Tor ohne Assist bzw. Assist ohne Tor",
+    FLAG_OUT_OF_BOUNDS: "Punkt außerhalb des Spielfelds",
+    FLAG_DUPLICATE: "Doppelter Eintrag (gleiches Tor und gleicher Assist)",
+    FLAG_ORIENTATION: "Verdächtige Ausrichtung (Tor in der eigenen Hälfte oder Assist gespiegelt)",
+}
+# Ab dieser Passlänge gilt ein Assist als verdächtig, wenn er gespiegelt viel näher am Tor läge
+SUSPECT_PASS_LENGTH = 50.0
+
+# Spielsituationen (Code = Index); 0 = keine Angabe in der Team-Datei
+SITUATIONS = ["Unbekannt", "Spielverlauf", "Ecke", "Freistoß direkt", "Freistoß indirekt", "Elfmeter", "Einwurf"]
+SITUATION_ALIASES = {
+    "spiel": "Spielverlauf",
+    "dir.fs": "Freistoß direkt",
+    "ind.fs": "Freistoß indirekt",
+    "fs": "Freistoß indirekt",
+    "11m": "Elfmeter",
+}
+
+# Standardsituationen pro Event (Bitmaske in der Spalte "set_piece"), beim Einlesen einmal berechnet:
+# aus der Situations-Angabe, ohne Angabe aus den Koordinaten (mit Toleranz statt exakter Position)
+SET_PIECE_CORNER = 1
+SET_PIECE_PENALTY = 2
+SET_PIECE_DIRECT_FREE_KICK = 4
+SET_PIECE_OTHER = 8
+SET_PIECES = {
+    "Ecke": SET_PIECE_CORNER,
+    "Elfmeter": SET_PIECE_PENALTY,
+    "Freistoß direkt": SET_PIECE_DIRECT_FREE_KICK,
+}
+# Filterwert für Tore ohne Standardsituation
+OPEN_PLAY = "Spielverlauf"
+SITUATION_SET_PIECES = {**SET_PIECES, "Freistoß indirekt": SET_PIECE_OTHER, "Einwurf": SET_PIECE_OTHER}
+CORNER_POSITIONS = [(0.0, PITCH_LENGTH), (PITCH_WIDTH, PITCH_LENGTH)]
+PENALTY_SPOT = (PITCH_WIDTH / 2, PITCH_LENGTH - 11.0)
+# Toleranzen in Metern: Assist an der Eckfahne, Tor am Elfmeterpunkt,
+# Assist am Schussort (direkter Schuss ohne Passweg: Elfmeter oder direkter Freistoß)
+CORNER_RADIUS = 1.5
+PENALTY_RADIUS = 1.0
+DIRECT_SHOT_RADIUS = 1.0
+
+# Platzhalter für fehlende Angaben in den Integer-Spalten (Spiel, Datum, Minute, Spieler)
+MISSING = -1
+
+# Spalten des Stores mit festen Datentypen.
+# Spiel und Spieler sind Codes in die Tabellen meta["matches"] / meta["players"],
+# das Datum ist in Tagen seit 1970-01-01 gespeichert.
+STORE_COLUMNS = [
+    ("x", np.float32),
+    ("y", np.float32),
+    ("assist_x", np.float32),
+    ("assist_y", np.float32),
+    ("match", np.int32),
+    ("date", np.int32),
+    ("minute", np.int16),
+    ("scorer", np.int32),
+    ("assister", np.int32),
+    ("situation", np.int8),
+    ("flags", np.int8),
+    ("set_piece", np.int8),
+    ("team", np.int16),
+    ("side", np.int8),
+    ("season", np.int16),
+]
+# Spalten, die pro Segment konstant sind (Rest kommt aus der Team-Datei)
+SEGMENT_COLUMNS = ("team", "side", "season")
+EVENT_COLUMNS = [(name, dtype) for name, dtype in STORE_COLUMNS if name not in SEGMENT_COLUMNS]
+# Filterbare Spalten mit Code-Tabelle in meta (None: Code ist der Wert selbst)
+CODE_TABLES = {"match": "matches", "scorer": "players", "assister": "players",
+               "team": "teams", "season": "seasons", "side": None, "situation": None}
+
+
+def parse_coordinates(coord_str: str) -> List[Tuple[int, int]]:
+    """
+    Parst Koordinaten aus einem String.
+    Behandelt verschiedene Formate wie (x,y), (x, y), etc.
+    """
+    coordinates = []
+    # Entferne Leerzeichen und teile bei Kommas
+    coord_str = coord_str.replace(' ', '')
+
+    # Finde alle Tupel-Pattern
+    pattern = r'\((-?\d+(?:\.\d+)?),(-?\d+(?:\.\d+)?)\)'
+    matches = re.findall(pattern, coord_str)
+
+    for match in matches:
+        try:
+            # Nachkommastellen bleiben erhalten; ganze Zahlen wie bisher als int
+            x, y = (int(v) if v.is_integer() else v for v in (float(match[0]), float(match[1])))
+            coordinates.append((x, y))
+        except ValueError:
+            continue
+
+    return coordinates
+
+
+def _title_from_call(node: ast.Call) -> Optional[str]:
+    """Gibt den Titel-Text eines plt.title(...)/ax.set_title(...) Aufrufs zurück."""
+    func = node.func
+    if not isinstance(func, ast.Attribute) or func.attr not in ("title", "set_title"):
+        return None
+    if not node.args or not isinstance(node.args[0], ast.Constant) or not isinstance(node.args[0].value, str):
+        return None
+    return node.args[0].value
+
+
+def _additional_info_from_title(title: str) -> str:
+    """Zusatzinformationen stehen im Titel nach dem ersten Zeilenumbruch."""
+    if "\n" not in title:
+        return ""
+    return title.split("\n", 1)[1].replace("\n", " ").strip()
+
+
+def _recover_from_lines(content: str, result: Dict[str, Any]) -> None:
+    """
+    Notfall-Extraktion für Dateien mit Syntaxfehlern.
+    Jede Zeile mit einer Listen-Zuweisung bzw. einem Titel wird einzeln geparst;
+    nicht parsebare Listen werden tupelweise über parse_coordinates gelesen.
+    """
+    for line_no, line in enumerate(content.splitlines(), start=1):
+        statement = line.strip()
+        match = re.match(r'(\w+)\s*=\s*\[', statement)
+        if match:
+            name = match.group(1)
+            if name in result["variables"]:
+                continue
+            try:
+                value = ast.literal_eval(ast.parse(statement).body[0].value)
+            except (SyntaxError, ValueError):
+                body = statement[match.end() - 1:]
+                value = parse_coordinates(body[:body.rfind(']') + 1])
+                result["errors"].append(f"Zeile {line_no}: '{name}' nur teilweise lesbar ({len(value)} Einträge)")
+            if isinstance(value, list):
+                result["variables"][name] = value
+        elif result["title"] is None and "title(" in statement:
+            try:
+                call = ast.parse(statement).body[0].value
+            except SyntaxError:
+                continue
+            if isinstance(call, ast.Call):
+                result["title"] = _title_from_call(call)
+
+
+def _recover_list(content: str, node: ast.expr, name: str) -> List[Any]:
+    """
+    Teilweise lesbare Daten-Liste (z.B. ein Name oder Ausdruck zwischen den Koordinaten):
+    Koordinaten werden tupelweise über parse_coordinates gelesen, 'events' eintragsweise
+    (nicht lesbare Einträge als leeres Dict, damit die Zuordnung zu den Toren erhalten bleibt).
+    """
+    if name == "events" and isinstance(node, ast.List):
+        values = []
+        for element in node.elts:
+            try:
+                values.append(ast.literal_eval(element))
+            except ValueError:
+                values.append({})
+        return values
+    return parse_coordinates(ast.get_source_segment(content, node) or "")
+
+
+def extract_team_file(content: str) -> Dict[str, Any]:
+    """
+    Liest eine Team-Datei in einem Durchgang über den AST.
+
+    Gibt ein Dict zurück mit:
+        goals, assists: Koordinatenlisten ('goals = [...]', 'assists = [...]')
+        title: Text aus plt.title(...) bzw. None
+        additional_info: Titel-Text nach dem ersten Zeilenumbruch
+        variables: alle Listen-Zuweisungen der Datei (Name -> Liste)
+        errors: Parse-Fehler als lesbare Meldungen (leer, wenn alles ok)
+    """
+    result = {"title": None, "variables": {}, "errors": []}
+    try:
+        tree = ast.parse(content)
+    except SyntaxError as e:
+        result["errors"].append(f"Zeile {e.lineno}: {e.msg}")
+        _recover_from_lines(content, result)
+    else:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign) and isinstance(node.value, (ast.List, ast.ListComp)):
+                for target in node.targets:
+                    if not isinstance(target, ast.Name) or target.id in result["variables"]:
+                        continue
+                    try:
+                        value = ast.literal_eval(node.value)
+                    except ValueError:
+                        if target.id not in DATA_VARIABLES:
+                            # Berechnete Hilfslisten (z.B. List Comprehensions) sind keine Daten
+                            continue
+                        value = _recover_list(content, node.value, target.id)
+                        result["errors"].append(f"Zeile {node.lineno}: '{target.id}' nur teilweise lesbar "
+                                                f"({len(value)} Einträge)")
+                    result["variables"][target.id] = value
+            elif isinstance(node, ast.Call) and result["title"] is None:
+                result["title"] = _title_from_call(node)
+
+    result["goals"] = result["variables"].pop("goals", [])
+    result["assists"] = result["variables"].pop("assists", [])
+    result["additional_info"] = _additional_info_from_title(result["title"] or "")
+    return result
+
+
+def read_team_file(file_path: str) -> Dict[str, Any]:
+    """Liest eine Team-Datei (einmal) und gibt das Ergebnis von extract_team_file zurück."""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            content = file.read()
+    except OSError as e:
+        return {"goals": [], "assists": [], "title": None, "additional_info": "",
+                "variables": {}, "errors": [f"Datei nicht lesbar: {e.strerror}"]}
+    return extract_team_file(content)
+
+
+def _parse_date(value: Any) -> int:
+    """Datum 'JJJJ-MM-TT' oder 'TT.MM.JJJJ' in Tage seit 1970-01-01."""
+    for fmt in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return (datetime.strptime(str(value).strip(), fmt).date() - date(1970, 1, 1)).days
+        except ValueError:
+            continue
+    raise ValueError(value)
+
+
+def _parse_situation(value: Any) -> int:
+    """Situations-Code zu einer Angabe wie 'Ecke', 'Elfmeter' oder 'dir.FS'."""
+    text = str(value).strip()
+    lookup = {label.lower(): label for label in SITUATIONS}
+    label = lookup.get(text.lower()) or SITUATION_ALIASES.get(text.lower())
+    if label is None:
+        raise ValueError(value)
+    return SITUATIONS.index(label)
+
+
+def parse_event_info(values: Any, goal_count: int, errors: List[str]) -> List[Dict[str, Any]]:
+    """
+    Liest die optionale Liste 'events' einer Team-Datei (ein Dict pro Tor, gleiche
+    Reihenfolge wie 'goals') mit den Schlüsseln match, date, minute, scorer,
+    assister und situation. Fehlende Angaben bleiben leer; ungültige werden gemeldet.
+    """
+    infos = []
+    if not isinstance(values, list):
+        return infos
+    if len(values) > goal_count:
+        errors.append(f"'events': {len(values) - goal_count} Einträge ohne zugehöriges Tor ignoriert")
+    for i, value in enumerate(values[:goal_count], start=1):
+        info = {"match": None, "date": MISSING, "minute": MISSING, "scorer": None, "assister": None, "situation": 0}
+        if not isinstance(value, dict):
+            errors.append(f"'events' Eintrag {i}: kein Dict")
+            infos.append(info)
+            continue
+        for key in ("match", "scorer", "assister"):
+            if value.get(key) not in (None, ""):
+                info[key] = str(value[key])
+        for key, convert in (("date", _parse_date), ("minute", int), ("situation", _parse_situation)):
+            if value.get(key) in (None, ""):
+                continue
+            try:
+                info[key] = convert(value[key])
+            except (TypeError, ValueError):
+                errors.append(f"'events' Eintrag {i}: ungültige Angabe für '{key}' ({value[key]!r})")
+        infos.append(info)
+    return infos
+
+
+def file_signature(file_path: str) -> Optional[List[int]]:
+    """Signatur (mtime_ns, Größe) einer Datei, None falls sie nicht existiert."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _squad_sort_key(name: str) -> Tuple[int, int, str]:
+    """Nachwuchsteams (U15, U16, ...) nach Alter zuerst, danach alle anderen alphabetisch."""
+    match = re.fullmatch(r'U(\d+)', name)
+    if match:
+        return (0, int(match.group(1)), name)
+    return (1, 0, name.lower())
+
+
+def order_seasons(seasons) -> List[str]:
+    """Aktuelle Saison zuerst, danach frühere Saisons absteigend (neueste zuerst)."""
+    seasons = set(seasons)
+    ordered = [CURRENT_SEASON] if CURRENT_SEASON in seasons else []
+    return ordered + sorted(seasons - {CURRENT_SEASON}, reverse=True)
+
+
+def _scan_squad_dir(base_path: str, folder: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Sucht die EigeneTore-/Gegentore-Datei und die Import-Dateien eines Team-Ordners
+    (Pfade relativ zu base_path). Gibt (dateien, importe) jeweils als {seite: pfad} zurück.
+    """
+    found = ({}, {})
+    try:
+        names = sorted(os.listdir(os.path.join(base_path, folder)))
+    except OSError:
+        return found
+    squad_name = os.path.basename(folder)
+    for name in names:
+        for pattern, files in ((SOURCE_FILE_PATTERN, found[0]), (IMPORT_FILE_PATTERN, found[1])):
+            match = pattern.match(name)
+            if not match:
+                continue
+            side = "eigene_tore" if match.group(1) == "EigeneTore" else "gegentore"
+            # Bei mehreren Kandidaten gewinnt die Datei, deren Suffix dem Ordnernamen entspricht
+            if side not in files or match.group(2) == squad_name:
+                files[side] = os.path.join(folder, name)
+    return found
+
+
+def _list_subdirs(base_path: str, folder: str) -> List[str]:
+    """Unterordner (relativ zu base_path), ohne versteckte Ordner und Caches."""
+    try:
+        names = os.listdir(os.path.join(base_path, folder))
+    except OSError:
+        return []
+    return [os.path.join(folder, name) if folder else name for name in names
+            if not name.startswith(('.', '_')) and os.path.isdir(os.path.join(base_path, folder, name))]
+
+
+def _read_manifest(manifest_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != MANIFEST_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def discover_squads(base_path: str = ".") -> List[Dict[str, Any]]:
+    """
+    Findet alle Teams im Datenordner und gibt das Manifest als Liste zurück:
+    [{"name", "season", "dir", "dir_signature", "files": {side: pfad}}, ...]
+
+    Team-Ordner direkt im Datenordner gehören zur aktuellen Saison, Team-Ordner
+    in Saison-Ordnern (z.B. "2024-25/U15") zur jeweiligen Saison.
+
+    Das Manifest wird in .aka_cache/manifest.json gespeichert. Bei späteren
+    Aufrufen werden nur der Datenordner, die Saison-Ordner und die bekannten
+    Team-Ordner per stat() geprüft; gelistet werden nur Ordner, die sich geändert haben.
+    """
+    store_dir, _ = _store_paths(base_path)
+    manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+    try:
+        # Vor der Signatur des Datenordners anlegen, sonst gilt er beim nächsten Start als geändert
+        os.makedirs(store_dir, exist_ok=True)
+    except OSError:
+        pass
+
+    manifest = _read_manifest(manifest_path) or {"root_signature": None, "season_dirs": {}, "squads": []}
+    known = {squad["dir"]: squad for squad in manifest["squads"]}
+    changed = False
+
+    # Ordner-Ebenen, die gelistet werden: Datenordner ("") und Saison-Ordner
+    containers = {"": file_signature(base_path)}
+    if containers[""] != manifest["root_signature"]:
+        top_level = _list_subdirs(base_path, "")
+        changed = True
+    else:
+        top_level = [d for d in list(known) + list(manifest["season_dirs"]) if os.sep not in d]
+    season_dirs = {d: file_signature(os.path.join(base_path, d))
+                   for d in set(top_level) if SEASON_DIR_PATTERN.match(d)}
+
+    folders = [(d, CURRENT_SEASON) for d in set(top_level) if d not in season_dirs]
+    for season_dir, signature in season_dirs.items():
+        if manifest["season_dirs"].get(season_dir) != signature:
+            children = _list_subdirs(base_path, season_dir)
+            changed = True
+        else:
+            children = [d for d in known if os.path.dirname(d) == season_dir]
+        folders += [(d, season_dir) for d in children]
+
+    squads = []
+    for folder, season in folders:
+        dir_signature = file_signature(os.path.join(base_path, folder))
+        squad = known.get(folder)
+        if squad is None or squad["dir_signature"] != dir_signature:
+            files, imports = _scan_squad_dir(base_path, folder)
+            squad = {"name": os.path.basename(folder), "season": season, "dir": folder,
+                     "dir_signature": dir_signature, "files": files, "imports": imports}
+            changed = True
+        squads.append(squad)
+    if len(squads) != len(manifest["squads"]):
+        changed = True
+    season_rank = {season: i for i, season in enumerate(order_seasons(squad["season"] for squad in squads))}
+    squads.sort(key=lambda squad: (season_rank[squad["season"]], _squad_sort_key(squad["name"])))
+
+    if changed:
+        try:
+            tmp_path = manifest_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({"format": MANIFEST_FORMAT_VERSION, "root_signature": containers[""],
+                           "season_dirs": season_dirs, "squads": squads}, file, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, manifest_path)
+        except OSError:
+            pass
+    # Ordner ohne Team-Dateien bleiben im Manifest (kein erneutes Listen), sind aber keine Teams
+    return [squad for squad in squads if squad["files"] or squad["imports"]]
+
+
+def manifest_dirs(base_path: str = ".") -> List[str]:
+    """
+    Saison-Ordner und Team-Ordner aus dem Manifest (relativ zu base_path), auch Ordner
+    ohne Team-Dateien; leer, solange discover_squads() noch kein Manifest geschrieben hat.
+    """
+    store_dir, _ = _store_paths(base_path)
+    manifest = _read_manifest(os.path.join(store_dir, MANIFEST_FILE))
+    if manifest is None:
+        return []
+    return list(manifest["season_dirs"]) + [squad["dir"] for squad in manifest["squads"]]
+
+
+def collect_sources(base_path: str = ".", squads: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Sammelt alle Quelldateien (ein Eintrag pro Saison, Team und Seite) mit ihren Signaturen.
+    import_path/import_signature beschreiben die Import-Datei der Seite (None, wenn es keine gibt).
+    """
+    if squads is None:
+        squads = discover_squads(base_path)
+    sources = []
+    for squad in squads:
+        for side in SIDES:
+            # Fehlt eine Seite, wird der erwartete Dateiname verwendet (Team bleibt vollständig)
+            path = squad["files"].get(side, os.path.join(squad["dir"], f"{SIDE_FILE_PREFIX[side]}{squad['name']}.py"))
+            sources.append({
+                "season": squad["season"],
+                "team": squad["name"],
+                "side": side,
+                "path": path,
+                "signature": file_signature(os.path.join(base_path, path)),
+                "import_path": squad["imports"].get(side),
+                "import_signature": (file_signature(os.path.join(base_path, squad["imports"][side]))
+                                     if side in squad["imports"] else None),
+            })
+    return sources
+
+
+class EventStore:
+    """
+    Read-only Sicht auf den kompilierten Event-Store.
+
+    Jede Zeile ist ein Tor mit zugehörigem Assist (gleicher Index wie in den
+    Team-Dateien). Hat eine Seite mehr Assists als Tore oder umgekehrt, werden
+    die fehlenden Werte mit NaN aufgefüllt; die echte Anzahl steht im Segment.
+    Segmente sind über (saison, team, seite) adressiert.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self.columns = columns
+        self.meta = meta
+        self.seasons = meta["seasons"]
+        self.teams = meta["teams"]
+        self.segments = {(seg["season"], seg["team"], seg["side"]): seg for seg in meta["segments"]}
+        self._indexes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._set_piece_rows: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return int(self.meta["rows"])
+
+    @property
+    def generation(self) -> int:
+        return int(self.meta["generation"])
+
+    def season_teams(self, season: Optional[str] = None) -> List[str]:
+        """Teams einer Saison (None: alle Saisons) in Anzeige-Reihenfolge."""
+        present = {key[1] for key in self.segments if season is None or key[0] == season}
+        return [team for team in self.teams if team in present]
+
+    def _segments_for(self, team: str, side: str, season: Optional[str]) -> List[Dict[str, Any]]:
+        if season is not None:
+            seg = self.segments.get((season, team, side))
+            return [seg] if seg is not None else []
+        return [self.segments[(s, team, side)] for s in self.seasons if (s, team, side) in self.segments]
+
+    def _index(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sortierindex einer Code-Spalte (Zeilennummern, sortierte Codes), einmal pro Store gebaut."""
+        if column not in self._indexes:
+            order = np.argsort(self.columns[column], kind="stable")
+            self._indexes[column] = (order, np.asarray(self.columns[column])[order])
+        return self._indexes[column]
+
+    def set_piece_rows(self, set_piece: str) -> np.ndarray:
+        """
+        Zeilennummern einer Standardsituation ("Ecke", "Elfmeter", "Freistoß direkt")
+        bzw. aller Tore ohne Standardsituation (OPEN_PLAY); die Maske wird einmal pro Store ausgewertet.
+        """
+        if set_piece not in self._set_piece_rows:
+            mask = np.asarray(self.columns["set_piece"])
+            if set_piece == OPEN_PLAY:
+                self._set_piece_rows[set_piece] = np.flatnonzero(mask == 0)
+            else:
+                self._set_piece_rows[set_piece] = np.flatnonzero(mask & SET_PIECES.get(set_piece, 0))
+        return self._set_piece_rows[set_piece]
+
+    def code(self, column: str, value: Any) -> int:
+        """Code eines Werts (z.B. Spiel-ID, Spielername, Situation); MISSING, falls unbekannt."""
+        table = self._table(column)
+        return table.index(value) if value in table else MISSING
+
+    def rows_where(self, **criteria: Any) -> np.ndarray:
+        """
+        Zeilennummern aller Events, die alle Kriterien erfüllen (z.B. team="U15",
+        situation="Ecke", match="2025-03-08 U15-Ried"), aufsteigend sortiert.
+        Jede Bedingung ist eine Bereichssuche im Sortierindex der Spalte;
+        set_piece="Ecke" usw. wendet die Standardsituations-Maske an (set_piece_rows).
+        """
+        rows = None
+        for column, value in criteria.items():
+            if value is None:
+                continue
+            if column == "set_piece":
+                hits = self.set_piece_rows(value)
+            else:
+                code = self.code(column, value)
+                order, sorted_codes = self._index(column)
+                lo, hi = np.searchsorted(sorted_codes, [code, code + 1]) if code != MISSING else (0, 0)
+                hits = np.sort(order[lo:hi])
+            rows = hits if rows is None else np.intersect1d(rows, hits, assume_unique=True)
+        return np.arange(len(self)) if rows is None else rows
+
+    def _table(self, column: str) -> List[Any]:
+        if column == "situation":
+            return SITUATIONS
+        if column == "side":
+            return SIDES
+        return self.meta.get(CODE_TABLES[column], [])
+
+    def values(self, column: str, rows: Optional[np.ndarray] = None, codes: bool = False) -> List[Any]:
+        """
+        Werte einer Code-Spalte (Spiel-IDs, Spieler, Situationen) für die angegebenen Zeilen
+        bzw. - mit codes=True - für die angegebenen Codes. Fehlende Angaben werden zu None.
+        """
+        if codes:
+            values = np.asarray(rows)
+        else:
+            values = np.asarray(self.columns[column] if rows is None else self.columns[column][rows])
+        table = self._table(column)
+        return [table[c] if c != MISSING else None for c in values.tolist()]
+
+    def _points(self, segments: List[Dict[str, Any]], x: str, y: str, count: str) -> np.ndarray:
+        parts = [np.column_stack((self.columns[x][seg["start"]:seg["start"] + seg[count]],
+                                  self.columns[y][seg["start"]:seg["start"] + seg[count]]))
+                 for seg in segments]
+        if not parts:
+            return np.empty((0, 2), dtype=np.float32)
+        points = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        # Platzhalter-Zeilen (MISSING_POINT) gehören nicht zu den Punkten
+        return points[~np.isnan(points[:, 0])]
+
+    def goals(self, team: str, side: str, season: Optional[str] = None) -> np.ndarray:
+        """Tor-Koordinaten eines Teams als (n, 2) Array (season=None: alle Saisons)."""
+        return self._points(self._segments_for(team, side, season), "x", "y", "goals")
+
+    def assists(self, team: str, side: str, season: Optional[str] = None) -> np.ndarray:
+        """Assist-Koordinaten eines Teams als (n, 2) Array (season=None: alle Saisons)."""
+        return self._points(self._segments_for(team, side, season), "assist_x", "assist_y", "assists")
+
+    def filtered_points(self, team: str, side: str, season: Optional[str] = None,
+                        **criteria: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Tore und zugehörige Assists eines Teams, gefiltert über rows_where (z.B. situation="Ecke")."""
+        segments = self._segments_for(team, side, season)
+        rows = self.rows_where(team=team, side=side, season=season, **criteria)
+        goal_rows = np.zeros(len(rows), dtype=bool)
+        assist_rows = np.zeros(len(rows), dtype=bool)
+        for seg in segments:
+            offset = rows - seg["start"]
+            goal_rows |= (offset >= 0) & (offset < seg["goals"])
+            assist_rows |= (offset >= 0) & (offset < seg["assists"])
+        goal_rows &= ~np.isnan(np.asarray(self.columns["x"])[rows])
+        assist_rows &= ~np.isnan(np.asarray(self.columns["assist_x"])[rows])
+        goals = np.column_stack((self.columns["x"][rows[goal_rows]], self.columns["y"][rows[goal_rows]]))
+        assists = np.column_stack((self.columns["assist_x"][rows[assist_rows]],
+                                   self.columns["assist_y"][rows[assist_rows]]))
+        return goals.astype(np.float32).reshape(-1, 2), assists.astype(np.float32).reshape(-1, 2)
+
+    def pairs(self, team: str, side: str, season: Optional[str] = None, **criteria: Any) -> np.ndarray:
+        """
+        Tor/Assist-Paare als (n, 4) Array [tor_x, tor_y, assist_x, assist_y].
+        Nur Zeilen mit Tor und Assist (FLAG_UNPAIRED ausgeschlossen); über mehrere
+        Saisons bleibt die Zuordnung pro Datei erhalten.
+        """
+        rows = self.rows_where(team=team, side=side, season=season, **criteria)
+        rows = rows[(np.asarray(self.columns["flags"])[rows] & FLAG_UNPAIRED) == 0]
+        return np.column_stack([np.asarray(self.columns[name])[rows]
+                                for name in ("x", "y", "assist_x", "assist_y")]).astype(np.float32).reshape(-1, 4)
+
+    def side_data(self, team: str, side: str, season: Optional[str] = None, **criteria: Any) -> Dict[str, Any]:
+        """
+        Daten einer Seite (eigene Tore / Gegentore) eines Teams.
+        criteria (match, situation, scorer, ...) filtern die Events, z.B. situation="Elfmeter".
+        """
+        segments = self._segments_for(team, side, season)
+        if any(value is not None for value in criteria.values()):
+            goals, assists = self.filtered_points(team, side, season, **criteria)
+        else:
+            goals, assists = self.goals(team, side, season), self.assists(team, side, season)
+        return {
+            "goals": goals,
+            "assists": assists,
+            "pairs": self.pairs(team, side, season, **criteria),
+            "title": f"{team} - {SIDE_TITLE[side]}",
+            "additional_info": " / ".join(seg["additional_info"] for seg in segments if seg["additional_info"]),
+            "parse_errors": [error for seg in segments for error in seg["errors"]],
+        }
+
+    def teams_data(self, season: Optional[str] = None, **criteria: Any) -> Dict[str, Dict[str, Any]]:
+        """Baut die vom Dashboard verwendete Team-Datenstruktur aus dem Store."""
+        return {team: {side: self.side_data(team, side, season, **criteria) for side in SIDES}
+                for team in self.season_teams(season)}
+
+    def present(self, column: str, season: Optional[str] = None) -> List[Any]:
+        """Vorkommende Werte einer Code-Spalte ohne leere Angaben, z.B. alle erfassten Spiele einer Saison."""
+        codes = np.unique(np.asarray(self.columns[column])[self.rows_where(season=season)])
+        empty = 0 if column == "situation" else MISSING
+        return self.values(column, codes[codes != empty], codes=True)
+
+    def diagnostics(self, season: Optional[str] = None, max_examples: int = 5) -> List[Dict[str, Any]]:
+        """
+        Prüfbericht aus den beim Einlesen gesetzten Flags: eine Zeile pro Datei und Problem
+        mit Anzahl und Beispielen (Nr. = Position in der goals/assists-Liste, ab 1).
+        """
+        flags = np.asarray(self.columns["flags"])
+        report = []
+        for seg in self.meta["segments"]:
+            if season is not None and seg["season"] != season:
+                continue
+            segment_flags = flags[seg["start"]:seg["start"] + seg["rows"]]
+            for flag, problem in VALIDATION_FLAGS.items():
+                hits = np.flatnonzero(segment_flags & flag)
+                if not len(hits):
+                    continue
+                examples = []
+                for i in hits[:max_examples].tolist():
+                    row = seg["start"] + i
+                    goal = self._format_point(row, "x", "y")
+                    assist = self._format_point(row, "assist_x", "assist_y")
+                    examples.append(f"Nr. {i + 1}: Tor {goal}, Assist {assist}")
+                report.append({"season": seg["season"], "team": seg["team"], "side": seg["side"],
+                               "path": seg["path"], "problem": problem, "count": len(hits),
+                               "examples": "; ".join(examples)})
+        return report
+
+    def _format_point(self, row: int, x: str, y: str) -> str:
+        value_x, value_y = float(self.columns[x][row]), float(self.columns[y][row])
+        if np.isnan(value_x):
+            return "-"
+        return f"({value_x:g}, {value_y:g})"
+
+    def load_report(self) -> List[Dict[str, Any]]:
+        """Parse-Dauer pro Quelldatei (aus dem letzten Einlesen der Datei)."""
+        return [{"season": seg["season"], "team": seg["team"], "side": seg["side"], "path": seg["path"],
+                 "parse_ms": seg.get("parse_ms", 0.0), "events": seg["rows"]}
+                for seg in self.meta["segments"]]
+
+
+def read_only(value: Any) -> Any:
+    """
+    Unveränderliche Sicht auf Team-Daten: Dicts werden zu MappingProxyType, Listen zu
+    Tupeln, NumPy-Arrays zu Views mit abgeschaltetem writeable-Flag (ohne Kopie).
+    So können alle Sessions dieselben Objekte verwenden, ohne sie zu verändern.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: read_only(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(read_only(item) for item in value)
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    return value
+
+
+def _store_paths(base_path: str) -> Tuple[str, str]:
+    store_dir = os.path.join(base_path, STORE_DIR)
+    return store_dir, os.path.join(store_dir, STORE_META_FILE)
+
+
+def _read_meta(meta_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if meta.get("format") != STORE_FORMAT_VERSION:
+        return None
+    return meta
+
+
+def _map_columns(store_dir: str, meta: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """Öffnet alle Spalten der Binärdatei per Memory-Mapping (read-only)."""
+    data_path = os.path.join(store_dir, meta["data_file"])
+    rows = int(meta["rows"])
+    columns = {}
+    for name, dtype in STORE_COLUMNS:
+        if rows == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(data_path, dtype=dtype, mode='r',
+                                      offset=meta["offsets"][name], shape=(rows,))
+    return columns
+
+
+def _coordinate_array(values: List[Any], name: str, errors: List[str]) -> np.ndarray:
+    """Wandelt eine Koordinatenliste in ein (n, 2) Array; ungültige Einträge werden gemeldet."""
+    points = [v for v in values if isinstance(v, (tuple, list)) and len(v) == 2
+              and all(isinstance(c, (int, float)) for c in v)]
+    if len(points) != len(values):
+        errors.append(f"'{name}': {len(values) - len(points)} ungültige Einträge übersprungen")
+    return np.asarray(points, dtype=np.float32).reshape(-1, 2)
+
+
+def _intern(table: List[str], lookup: Dict[str, int], value: Optional[str]) -> int:
+    """Code eines Texts in einer Code-Tabelle (neue Werte werden angehängt)."""
+    if value is None:
+        return MISSING
+    if value not in lookup:
+        lookup[value] = len(table)
+        table.append(value)
+    return lookup[value]
+
+
+def validate_points(goals: np.ndarray, assists: np.ndarray) -> np.ndarray:
+    """
+    Prüft die Tore und Assists einer Team-Datei in einem Durchgang (vektorisiert) und
+    gibt pro Zeile (Index wie in den Listen) eine Bitmaske der VALIDATION_FLAGS zurück.
+    """
+    n = max(len(goals), len(assists))
+    points = np.full((n, 4), np.nan, dtype=np.float64)
+    points[:len(goals), :2] = goals
+    points[:len(assists), 2:] = assists
+    flags = np.zeros(n, dtype=np.int8)
+
+    has_goal = ~np.isnan(points[:, 0])
+    has_assist = ~np.isnan(points[:, 2])
+    flags[has_goal != has_assist] |= FLAG_UNPAIRED
+
+    x, y = points[:, [0, 2]], points[:, [1, 3]]
+    outside = (x < 0) | (x > PITCH_WIDTH) | (y < 0) | (y > PITCH_LENGTH)
+    flags[outside.any(axis=1)] |= FLAG_OUT_OF_BOUNDS
+
+    if n:
+        # Gleiche Zeilen (NaN als Platzhalter gleichsetzen); die erste Zeile gilt als Original
+        _, first, inverse = np.unique(np.nan_to_num(points, nan=-1.0), axis=0, return_index=True, return_inverse=True)
+        flags[first[inverse.reshape(-1)] != np.arange(n)] |= FLAG_DUPLICATE
+
+    pass_length = np.hypot(points[:, 0] - points[:, 2], points[:, 1] - points[:, 3])
+    mirrored_length = np.hypot(points[:, 0] - points[:, 2], points[:, 1] - (PITCH_LENGTH - points[:, 3]))
+    with np.errstate(invalid="ignore"):
+        suspect = (points[:, 1] < PITCH_LENGTH / 2) | (
+            (pass_length > SUSPECT_PASS_LENGTH) & (mirrored_length < pass_length / 2))
+    flags[suspect] |= FLAG_ORIENTATION
+    return flags
+
+
+def classify_set_pieces(goals: np.ndarray, assists: np.ndarray, situations: np.ndarray) -> np.ndarray:
+    """
+    Standardsituation pro Zeile (Index wie in den Listen) als Bitmaske (SET_PIECES), vektorisiert.
+    Eine Situations-Angabe geht vor; sonst zählen Ecke (Assist an einer Eckfahne),
+    Elfmeter (Schuss vom Elfmeterpunkt ohne Passweg) und direkter Freistoß (übriger Schuss ohne Passweg).
+    """
+    n = max(len(goals), len(assists))
+    points = np.full((n, 4), np.nan, dtype=np.float64)
+    points[:len(goals), :2] = goals
+    points[:len(assists), 2:] = assists
+    mask = np.zeros(n, dtype=np.int8)
+
+    with np.errstate(invalid="ignore"):
+        for corner in CORNER_POSITIONS:
+            mask[np.hypot(points[:, 2] - corner[0], points[:, 3] - corner[1]) <= CORNER_RADIUS] |= SET_PIECE_CORNER
+        direct = np.hypot(points[:, 0] - points[:, 2], points[:, 1] - points[:, 3]) <= DIRECT_SHOT_RADIUS
+        at_spot = np.hypot(points[:, 0] - PENALTY_SPOT[0], points[:, 1] - PENALTY_SPOT[1]) <= PENALTY_RADIUS
+    mask[direct & at_spot] |= SET_PIECE_PENALTY
+    mask[direct & ~at_spot] |= SET_PIECE_DIRECT_FREE_KICK
+
+    situations = np.asarray(situations)[:n]
+    tagged = situations != 0
+    mask[tagged] = 0
+    for situation, flag in SITUATION_SET_PIECES.items():
+        mask[situations == SITUATIONS.index(situation)] = flag
+    return mask
+
+
+def _segment_rows(goals: np.ndarray, assists: np.ndarray, events: List[Dict[str, Any]],
+                  codes: Dict[str, int], tables: Dict[str, Tuple[List[str], Dict[str, int]]]) -> Dict[str, np.ndarray]:
+    """
+    Wandelt Koordinaten und Event-Angaben einer Team-Datei in Spaltenwerte um
+    (codes: team/side/season, tables: Code-Tabellen für Spiele und Spieler).
+    """
+    n = max(len(goals), len(assists))
+    rows = {name: np.full(n, np.nan if np.issubdtype(dtype, np.floating) else MISSING, dtype=dtype)
+            for name, dtype in EVENT_COLUMNS}
+    rows["situation"][:] = 0
+    rows["flags"] = validate_points(goals, assists)
+    rows["x"][:len(goals)] = goals[:, 0]
+    rows["y"][:len(goals)] = goals[:, 1]
+    rows["assist_x"][:len(assists)] = assists[:, 0]
+    rows["assist_y"][:len(assists)] = assists[:, 1]
+    for i, info in enumerate(events):
+        rows["match"][i] = _intern(*tables["matches"], info["match"])
+        rows["scorer"][i] = _intern(*tables["players"], info["scorer"])
+        rows["assister"][i] = _intern(*tables["players"], info["assister"])
+        for name in ("date", "minute", "situation"):
+            rows[name][i] = info[name]
+    rows["set_piece"] = classify_set_pieces(goals, assists, rows["situation"])
+    for name in SEGMENT_COLUMNS:
+        rows[name] = np.full(n, codes[name], dtype=dict(STORE_COLUMNS)[name])
+    return rows
+
+
+def read_import_file(file_path: str, errors: List[str]) -> Tuple[List[Any], List[Any], List[Dict[str, Any]]]:
+    """
+    Liest eine Import-Datei (eine JSON-Zeile pro Tor mit "goal", "assist" und den
+    Event-Angaben) und gibt (tore, assists, event_angaben) zurück.
+    """
+    goals, assists, events = [], [], []
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            for line_no, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    goal, assist = tuple(record["goal"]), tuple(record["assist"])
+                except (ValueError, KeyError, TypeError):
+                    errors.append(f"Import Zeile {line_no}: nicht lesbar")
+                    continue
+                goals.append(goal)
+                assists.append(assist)
+                events.append(record)
+    except OSError as e:
+        errors.append(f"Import-Datei nicht lesbar: {e.strerror}")
+    return goals, assists, events
+
+
+def _parse_source(file_path: Optional[str], import_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Liest eine Quelldatei (und ihre Import-Datei) und wandelt Tore/Assists in Arrays um.
+    Importierte Events werden wie zusätzliche Einträge der Listen angehängt.
+    Läuft im Prozess-Pool, daher auf Modulebene; gibt die Parse-Dauer in ms mit zurück.
+    """
+    started = time.perf_counter()
+    if file_path is None:
+        parsed = {"goals": [], "assists": [], "title": None, "additional_info": "", "errors": []}
+    else:
+        parsed = read_team_file(file_path)
+    event_values = parsed.pop("variables", {}).get("events")
+    if import_path is not None:
+        goals, assists, imported = read_import_file(import_path, parsed["errors"])
+        # Tore/Assists der Team-Datei mit Platzhaltern auf gleiche Länge bringen, damit die
+        # Importe als Paare in denselben Zeilen landen (sonst verschoben bei z.B. 13 Toren, 12 Assists)
+        n = max(len(parsed["goals"]), len(parsed["assists"]))
+        file_goals = list(parsed["goals"]) + [MISSING_POINT] * (n - len(parsed["goals"]))
+        file_assists = list(parsed["assists"]) + [MISSING_POINT] * (n - len(parsed["assists"]))
+        # Event-Angaben der Team-Datei ebenso auffüllen, dann die Importe anhängen
+        own = event_values if isinstance(event_values, list) else []
+        event_values = own[:n] + [{}] * (n - len(own)) + imported
+        parsed["goals"] = file_goals + goals
+        parsed["assists"] = file_assists + assists
+    parsed["goals"] = _coordinate_array(parsed["goals"], "goals", parsed["errors"])
+    parsed["assists"] = _coordinate_array(parsed["assists"], "assists", parsed["errors"])
+    parsed["events"] = parse_event_info(event_values, len(parsed["goals"]), parsed["errors"])
+    parsed["parse_ms"] = (time.perf_counter() - started) * 1000
+    return parsed
+
+
+def parse_sources(paths: List[Optional[str]], workers: Optional[int] = None,
+                  import_paths: Optional[List[Optional[str]]] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Liest mehrere Quelldateien ein, ab PARALLEL_MIN_FILES verteilt auf einen Prozess-Pool.
+    import_paths enthält pro Quelldatei die zugehörige Import-Datei (oder None).
+    Gibt die Ergebnisse (in Eingabereihenfolge) und die Anzahl verwendeter Prozesse zurück.
+    """
+    if import_paths is None:
+        import_paths = [None] * len(paths)
+    if workers is None:
+        workers = min(os.cpu_count() or 1, max(1, len(paths) // 4))
+    if workers > 1 and len(paths) >= PARALLEL_MIN_FILES:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_parse_source, paths, import_paths, chunksize=4)), workers
+        except (OSError, RuntimeError):
+            # z.B. keine Prozesse erlaubt -> seriell weiter
+            pass
+    return [_parse_source(path, import_path) for path, import_path in zip(paths, import_paths)], 1
+
+
+def _write_store(store_dir: str, meta_path: str, columns: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+    """Schreibt Spalten und Beschreibung; die JSON-Datei wird atomar ersetzt."""
+    os.makedirs(store_dir, exist_ok=True)
+    data_file = f"events.{meta['generation']}.bin"
+    offsets = {}
+    with open(os.path.join(store_dir, data_file), 'wb') as file:
+        for name, dtype in STORE_COLUMNS:
+            offsets[name] = file.tell()
+            file.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+    meta["data_file"] = data_file
+    meta["offsets"] = offsets
+
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(meta, file, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, meta_path)
+
+    # Alte Generationen aufräumen (unter Windows evtl. noch gemappt -> ignorieren)
+    for name in os.listdir(store_dir):
+        if name.startswith("events.") and name.endswith(".bin") and name != data_file:
+            try:
+                os.remove(os.path.join(store_dir, name))
+            except OSError:
+                pass
+
+
+def build_event_store(base_path: str = ".", previous: Optional[EventStore] = None,
+                      workers: Optional[int] = None) -> EventStore:
+    """
+    Baut den Event-Store aus den Team-Dateien aller Saisons.
+    Segmente, deren Quelldatei unverändert ist, werden aus dem vorherigen Store übernommen;
+    nur geänderte Dateien werden neu eingelesen (bei vielen Dateien parallel, siehe parse_sources).
+    """
+    started = time.perf_counter()
+    store_dir, meta_path = _store_paths(base_path)
+    sources = collect_sources(base_path)
+    seasons = order_seasons(source["season"] for source in sources)
+    teams = []
+    for source in sources:
+        if source["team"] not in teams:
+            teams.append(source["team"])
+
+    def reusable(source):
+        if previous is None:
+            return None
+        old = previous.segments.get((source["season"], source["team"], source["side"]))
+        if old is None or old["signature"] != source["signature"]:
+            return None
+        return old if old.get("import_signature") == source["import_signature"] else None
+
+    to_parse = [source for source in sources if reusable(source) is None]
+    parsed_results, used_workers = parse_sources(
+        [os.path.join(base_path, s["path"]) if s["signature"] is not None else None for s in to_parse], workers,
+        [os.path.join(base_path, s["import_path"]) if s["import_signature"] is not None else None for s in to_parse])
+    parsed_by_key = {(s["season"], s["team"], s["side"]): r for s, r in zip(to_parse, parsed_results)}
+
+    # Code-Tabellen werden nur erweitert, damit übernommene Segmente gültig bleiben
+    tables = {}
+    for table in ("matches", "players"):
+        values = list(previous.meta.get(table, [])) if previous is not None else []
+        tables[table] = (values, {value: i for i, value in enumerate(values)})
+
+    parts = []
+    segments = []
+    start = 0
+    for source in sources:
+        key = (source["season"], source["team"], source["side"])
+        codes = {"team": teams.index(source["team"]), "side": SIDES.index(source["side"]),
+                 "season": seasons.index(source["season"])}
+        old = reusable(source)
+
+        if old is not None:
+            stop = old["start"] + old["rows"]
+            rows = {name: np.asarray(previous.columns[name][old["start"]:stop]) for name, _ in EVENT_COLUMNS}
+            for name in SEGMENT_COLUMNS:
+                rows[name] = np.full(old["rows"], codes[name], dtype=dict(STORE_COLUMNS)[name])
+            segment = {k: old[k] for k in ("goals", "assists", "title", "additional_info", "errors", "parse_ms")}
+        else:
+            parsed = parsed_by_key[key]
+            rows = _segment_rows(parsed["goals"], parsed["assists"], parsed["events"], codes, tables)
+            segment = {
+                "goals": len(parsed["goals"]),
+                "assists": len(parsed["assists"]),
+                "title": parsed["title"],
+                "additional_info": parsed["additional_info"],
+                "errors": parsed["errors"],
+                "parse_ms": round(parsed["parse_ms"], 3),
+            }
+
+        n = len(rows["x"])
+        parts.append(rows)
+        segments.append({
+            "season": source["season"],
+            "team": source["team"],
+            "side": source["side"],
+            "path": source["path"],
+            "signature": source["signature"],
+            "import_path": source["import_path"],
+            "import_signature": source["import_signature"],
+            "start": start,
+            "rows": n,
+            **segment,
+        })
+        start += n
+
+    columns = {}
+    for name, dtype in STORE_COLUMNS:
+        columns[name] = np.concatenate([p[name] for p in parts]).astype(dtype) if parts else np.empty(0, dtype=dtype)
+
+    generation = previous.generation + 1 if previous is not None else 1
+    meta = {
+        "format": STORE_FORMAT_VERSION,
+        "generation": generation,
+        "rows": start,
+        "seasons": seasons,
+        "teams": teams,
+        "matches": tables["matches"][0],
+        "players": tables["players"][0],
+        "segments": segments,
+        "build": {
+            "files": len(sources),
+            "parsed": len(to_parse),
+            "workers": used_workers,
+            "total_ms": round((time.perf_counter() - started) * 1000, 3),
+        },
+    }
+    try:
+        _write_store(store_dir, meta_path, columns, meta)
+    except OSError:
+        # Datenordner nicht beschreibbar: Store nur im Speicher halten
+        return EventStore(columns, meta)
+    return EventStore(_map_columns(store_dir, meta), meta)
+
+
+def open_event_store(base_path: str = ".") -> EventStore:
+    """
+    Öffnet den Event-Store per Memory-Mapping.
+    Baut ihn (inkrementell) neu, wenn sich eine Quelldatei geändert hat oder er fehlt.
+    """
+    store_dir, meta_path = _store_paths(base_path)
+    meta = _read_meta(meta_path)
+    store = None
+    if meta is not None:
+        try:
+            store = EventStore(_map_columns(store_dir, meta), meta)
+        except (OSError, ValueError, KeyError):
+            store = None
+
+    if store is not None:
+        current = {(s["season"], s["team"], s["side"]): (s["signature"], s["import_signature"])
+                   for s in collect_sources(base_path)}
+        stored = {key: (seg["signature"], seg["import_signature"]) for key, seg in store.segments.items()}
+        if current == stored:
+            return store
+
+    return build_event_store(base_path, previous=store)
@@ -0,0 +1,121 @@
+"""
+Figuren ohne das globale Figuren-Register von pyplot.
+
+plt.subplots() trägt jede Figur in pyplot ein; ohne plt.close() bleibt sie dort
+für immer. Im Dashboard (ein Server-Prozess, viele Sitzungen und Reruns) wuchs
+der Speicher dadurch mit jedem Rerun. new_figure() erzeugt Figuren direkt über
+matplotlib.figure.Figure: sie gehören nur dem Aufrufer und werden freigegeben,
+sobald niemand mehr auf sie verweist. figure_diagnostics() zählt pro Prozess die
+Figuren im pyplot-Register, die noch lebenden und alle erzeugten Figuren.
+
+ImageCache hält fertig kodierte PNG-Bilder, damit ein erneut gewähltes
+Diagramm (gleicher Datenstand, gleiche Auswahl) ohne Matplotlib angezeigt
+wird: ein Dictionary-Zugriff statt Zeichnen und PNG-Kodierung. Das
+Speicherbudget ist in Bytes begrenzt, verdrängt wird das am längsten nicht
+mehr angezeigte Bild (LRU).
+
+Zähler, Register und Cache liegen hier statt im Dashboard-Skript, weil
+Streamlit das Skript bei jedem Rerun neu ausführt.
+"""
+import io
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+# Auflösung und Optionen wie bei st.pyplot (gleiches Bild wie bisher)
+FIGURE_DPI = 200
+# Speicherbudget des Bild-Caches (ein Spielfeld-PNG hat ca. 0,3-0,8 MB)
+IMAGE_CACHE_BYTES = 128 * 1024 * 1024
+
+_live_figures = weakref.WeakSet()
+_created = 0
+_lock = threading.Lock()
+
+
+def new_figure(figsize: Tuple[float, float], nrows: int = 1, ncols: int = 1) -> Tuple[Figure, Any]:
+    """Figur mit Achsen wie plt.subplots(), aber nicht in pyplot registriert."""
+    global _created
+    fig = Figure(figsize=figsize)
+    axes = fig.subplots(nrows, ncols)
+    with _lock:
+        _live_figures.add(fig)
+        _created += 1
+    return fig, axes
+
+
+def figure_diagnostics() -> Dict[str, int]:
+    """Figuren im pyplot-Register, noch lebende und seit dem Start erzeugte Figuren (dieser Prozess)."""
+    with _lock:
+        return {"pyplot": len(plt.get_fignums()), "live": len(_live_figures), "created": _created}
+
+
+def figure_png(fig: Figure, dpi: int = FIGURE_DPI) -> bytes:
+    """Kodiert eine Figur als PNG (wie st.pyplot: bbox_inches="tight") und leert sie danach."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    fig.clear()
+    return buffer.getvalue()
+
+
+class ImageCache:
+    """
+    LRU-Cache für kodierte Diagramm-Bilder mit Budget in Bytes.
+
+    Der Schlüssel beschreibt das Bild vollständig (Datenstand, Ansicht, Team,
+    Seite, Datenart, ...); Darstellung (Dark Mode, Größe pro Diagramm-Art) und
+    FIGURE_DPI sind fest. get_or_render() erzeugt das Bild nur bei einem
+    Fehlschlag; Bilder größer als das Budget werden nicht gespeichert.
+    """
+
+    def __init__(self, max_bytes: int = IMAGE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._images: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Bild zum Schlüssel (und als zuletzt benutzt markiert) oder None."""
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self._misses += 1
+                return None
+            self._images.move_to_end(key)
+            self._hits += 1
+            return image
+
+    def put(self, key: Hashable, image: bytes) -> None:
+        """Speichert ein Bild und verdrängt die am längsten unbenutzten, bis das Budget passt."""
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._images[key] = image
+            self._bytes += len(image)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def get_or_render(self, key: Hashable, build: Callable[[], Figure]) -> bytes:
+        """Bild aus dem Cache; sonst build() zeichnen, als PNG kodieren und speichern."""
+        image = self.get(key)
+        if image is None:
+            image = figure_png(build())
+            self.put(key, image)
+        return image
+
+    def stats(self) -> Dict[str, int]:
+        """Anzahl Bilder, belegte Bytes, Treffer, Fehlschläge und Verdrängungen."""
+        with self._lock:
+            return {"entries": len(self._images), "bytes": self._bytes, "hits": self._hits,
+                    "misses": self._misses, "evictions": self._evictions}
@@ -0,0 +1,165 @@
+"""
+Hotspot-Erkennung: Häufungen von Toren bzw. Assists auf dem Spielfeld.
+
+find_hotspots() clustert Punkte dichtebasiert (wie DBSCAN): ein Punkt mit
+mindestens min_points Punkten (inkl. sich selbst) im Umkreis von
+HOTSPOT_RADIUS Metern ist ein Kernpunkt, benachbarte Kernpunkte bilden einen
+Hotspot, Randpunkte gehören zum Hotspot eines benachbarten Kernpunkts.
+
+Statt alle Punktpaare zu vergleichen (O(n²)) werden die Punkte auf ein Gitter von
+HOTSPOT_RESOLUTION Metern gerundet (gleiche Gitterpunkte einmal, mit Anzahl als
+Gewicht) und über ihre Gitter-Schlüssel sortiert (Grid-Hash). Nachbarn im Umkreis
+sind dann feste Gitter-Verschiebungen; pro Verschiebung findet ein
+np.searchsorted alle Nachbarpaare auf einmal. Der Aufwand hängt damit von der
+Anzahl belegter Gitterpunkte ab, nicht von der Anzahl Punkte. Schwerpunkt und
+Ausdehnung der Hotspots kommen aus den Originalkoordinaten.
+"""
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from aka_data import SIDES
+from aka_zones import DATA_TYPES, as_points
+
+# Umkreis (m) und Mindestanzahl Punkte im Umkreis für einen Kernpunkt: absolut und als
+# Anteil aller Punkte (sonst verschmelzen bei vielen Punkten alle Häufungen zu einer)
+HOTSPOT_RADIUS = 3.0
+HOTSPOT_MIN_POINTS = 4
+HOTSPOT_MIN_SHARE = 0.05
+# Rastergröße (m) für das Clustern: Punkte werden darauf gerundet, gleiche Positionen
+# zählen einmal mit Gewicht. Begrenzt den Aufwand unabhängig von der Anzahl Punkte
+HOTSPOT_RESOLUTION = 0.5
+
+
+def _lattice_offsets(reach: float) -> np.ndarray:
+    """Gitter-Verschiebungen (a, b) mit Abstand <= reach, jede Richtung nur einmal (a > 0 oder a = 0, b > 0)."""
+    steps = np.arange(-int(reach), int(reach) + 1)
+    a, b = np.meshgrid(steps, steps, indexing="ij")
+    keep = (a * a + b * b <= reach * reach + 1e-9) & ((a > 0) | ((a == 0) & (b > 0)))
+    return np.column_stack([a[keep], b[keep]])
+
+
+def _neighbor_pairs(cells: np.ndarray, reach: float) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Alle Nachbarpaare (i, j) der Gitterpunkte (ganzzahlig, eindeutig) mit Abstand <= reach:
+    pro Verschiebung ein Nachschlagen der verschobenen Schlüssel im sortierten Grid-Hash.
+    Innerhalb einer Verschiebung kommt jedes i und jedes j höchstens einmal vor.
+    """
+    pad = int(reach) + 1
+    origin = cells.min(axis=0) - pad
+    width = int(cells[:, 1].max() - origin[1]) + pad + 1
+    keys = (cells[:, 0] - origin[0]) * width + (cells[:, 1] - origin[1])
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    pairs = []
+    for a, b in _lattice_offsets(reach):
+        position = np.minimum(np.searchsorted(sorted_keys, keys + a * width + b), len(keys) - 1)
+        found = sorted_keys[position] == keys + a * width + b
+        pairs.append((np.flatnonzero(found), order[position[found]]))
+    return pairs
+
+
+def default_min_points(n_points: int) -> int:
+    """Mindestanzahl Punkte für einen Kernpunkt: HOTSPOT_MIN_POINTS bzw. HOTSPOT_MIN_SHARE aller Punkte."""
+    return max(HOTSPOT_MIN_POINTS, math.ceil(HOTSPOT_MIN_SHARE * n_points))
+
+
+def cluster_labels(points: Any, radius: float = HOTSPOT_RADIUS, min_points: Optional[int] = None) -> np.ndarray:
+    """Hotspot-Nummer pro Punkt (0, 1, ...), -1 für Punkte ohne Hotspot."""
+    points = as_points(points)
+    if min_points is None:
+        min_points = default_min_points(len(points))
+    labels = np.full(len(points), -1, dtype=np.int64)
+    if len(points) < min_points:
+        return labels
+    # Auf HOTSPOT_RESOLUTION gerundet; gleiche Positionen (z.B. Eckfahne) nur einmal, mit Anzahl als Gewicht
+    lattice = np.round(points / HOTSPOT_RESOLUTION).astype(np.int64)
+    lattice -= lattice.min(axis=0)
+    width = int(lattice[:, 1].max()) + 1
+    keys = lattice[:, 0] * width + lattice[:, 1]
+    if keys.max() < 4 * len(keys) + 65536:
+        # Kleiner Schlüsselraum (ein Spielfeld): zählen statt sortieren
+        counts = np.bincount(keys)
+        cell_keys = np.flatnonzero(counts)
+        inverse = (np.cumsum(counts > 0) - 1)[keys]
+        weight = counts[cell_keys]
+    else:
+        cell_keys, inverse, weight = np.unique(keys, return_inverse=True, return_counts=True)
+        inverse = inverse.reshape(-1)
+    cells = np.column_stack([cell_keys // width, cell_keys % width])
+    n = len(cells)
+    pairs = _neighbor_pairs(cells, radius / HOTSPOT_RESOLUTION)
+
+    # Kernpunkte: mindestens min_points Punkte im Umkreis (inkl. gleicher Position)
+    neighbors = weight.copy()
+    for i, j in pairs:
+        neighbors[i] += weight[j]
+        neighbors[j] += weight[i]
+    core = neighbors >= min_points
+    if not core.any():
+        return labels
+
+    # Benachbarte Kernpunkte verbinden: kleinste Nummer weitergeben, bis sich nichts mehr ändert
+    core_pairs = [(i[core[i] & core[j]], j[core[i] & core[j]]) for i, j in pairs]
+    roots = np.arange(n)
+    changed = True
+    while changed:
+        previous = roots.copy()
+        for i, j in core_pairs:
+            roots[i] = np.minimum(roots[i], roots[j])
+            roots[j] = np.minimum(roots[j], roots[i])
+        roots = roots[roots]
+        changed = not np.array_equal(roots, previous)
+
+    # Randpunkte übernehmen die Nummer eines benachbarten Kernpunkts
+    border_of = np.full(n, n, dtype=np.int64)
+    for i, j in pairs:
+        for a, b in ((i, j), (j, i)):
+            attach = ~core[a] & core[b]
+            border_of[a[attach]] = np.minimum(border_of[a[attach]], roots[b[attach]])
+    roots = np.where(core, roots, np.where(border_of < n, border_of, -1))
+    member = roots >= 0
+    # Hotspots fortlaufend nummerieren (nach Wurzel) und auf alle Punkte übertragen
+    roots[member] = np.unique(roots[member], return_inverse=True)[1].reshape(-1)
+    return roots[inverse]
+
+
+def find_hotspots(points: Any, radius: float = HOTSPOT_RADIUS,
+                  min_points: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Hotspots einer Punktmenge, nach Anzahl Punkte absteigend sortiert:
+    "center" (Schwerpunkt x, y), "bounds" (x_min, y_min, x_max, y_max),
+    "count" (Anzahl Punkte) und "share" (Anteil an allen Punkten in %).
+    """
+    points = as_points(points)
+    labels = cluster_labels(points, radius, min_points)
+    member = labels >= 0
+    if not member.any():
+        return []
+    n_clusters = int(labels.max()) + 1
+    counts = np.bincount(labels[member], minlength=n_clusters)
+    sums = np.stack([np.bincount(labels[member], weights=points[member, axis], minlength=n_clusters)
+                     for axis in (0, 1)], axis=1)
+    lower = np.full((n_clusters, 2), np.inf)
+    upper = np.full((n_clusters, 2), -np.inf)
+    np.minimum.at(lower, labels[member], points[member])
+    np.maximum.at(upper, labels[member], points[member])
+    hotspots = [{
+        "center": (float(sums[k, 0] / counts[k]), float(sums[k, 1] / counts[k])),
+        "bounds": (float(lower[k, 0]), float(lower[k, 1]), float(upper[k, 0]), float(upper[k, 1])),
+        "count": int(counts[k]),
+        "share": float(counts[k] / len(points) * 100),
+    } for k in range(n_clusters)]
+    return sorted(hotspots, key=lambda hotspot: -hotspot["count"])
+
+
+def team_hotspots(teams_data: Dict[str, Dict[str, Any]], side: str,
+                  teams: Sequence[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Hotspots der Tore und Assists einer Seite (SIDES) für ein oder mehrere Teams zusammen."""
+    if side not in SIDES:
+        raise ValueError(f"Unbekannte Seite: {side}")
+    teams = list(teams_data) if teams is None else list(teams)
+    return {data_type: find_hotspots(np.concatenate(
+                [as_points(teams_data[team][side][data_type]) for team in teams] or [np.empty((0, 2))]))
+            for data_type in DATA_TYPES}
@@ -0,0 +1,294 @@
+"""
+Import von Event-Exporten (CSV/JSON) aus Tagging-Tools.
+
+Die Exportdatei wird zeilenweise gelesen (konstanter Speicherbedarf, auch bei
+JSON-Arrays), jede Zeile geprüft und auf das Dashboard-Koordinatensystem
+(68 x 100) umgerechnet. Gültige Events werden blockweise an die Import-Datei
+des jeweiligen Teams angehängt (z.B. U15/EigeneToreU15.import.jsonl); der
+Event-Store übernimmt sie beim nächsten (inkrementellen) Neubau, das laufende
+Dashboard über den Datei-Watcher sofort.
+
+Aufruf:
+    python aka_import.py export.csv --format meter --team U15 --seite eigene_tore
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from aka_data import (CURRENT_SEASON, IMPORT_FILE_SUFFIX, PITCH_LENGTH, PITCH_WIDTH, SEASON_DIR_PATTERN, SIDES,
+                      SIDE_FILE_PREFIX, SIDE_TITLE, discover_squads, open_event_store, parse_event_info)
+
+# Anzahl Events, nach denen gepufferte Zeilen in die Import-Dateien geschrieben werden
+BATCH_SIZE = 5000
+# Lesegröße für JSON-Arrays
+CHUNK_SIZE = 1 << 16
+# Höchstens so viele Einzelmeldungen im Import-Bericht
+MAX_REPORTED_ERRORS = 50
+
+# Koordinatensysteme der Exporte: Feldlänge/-breite in Export-Einheiten und ob x in Angriffsrichtung läuft
+PITCH_FORMATS = {
+    "dashboard": {"length": PITCH_LENGTH, "width": PITCH_WIDTH, "x_along_length": False},  # wie die Team-Dateien
+    "meter": {"length": 105.0, "width": 68.0, "x_along_length": True},  # x 0-105 m zum Tor, y 0-68 m quer
+    "prozent": {"length": 100.0, "width": 100.0, "x_along_length": True},  # x/y in Prozent (z.B. Wyscout, Opta)
+}
+
+# Spaltennamen im Export (überschreibbar mit --spalte feld=name)
+DEFAULT_COLUMNS = {
+    "x": "x", "y": "y", "assist_x": "assist_x", "assist_y": "assist_y",
+    "team": "team", "side": "side", "season": "season",
+    "match": "match", "date": "date", "minute": "minute",
+    "scorer": "scorer", "assister": "assister", "situation": "situation",
+}
+EVENT_FIELDS = ("match", "date", "minute", "scorer", "assister", "situation")
+
+# Schreibweisen der Seite im Export
+SIDE_ALIASES = {side: side for side in SIDES}
+SIDE_ALIASES.update({SIDE_TITLE[side].lower(): side for side in SIDES})
+SIDE_ALIASES.update({SIDE_FILE_PREFIX[side].lower(): side for side in SIDES})
+
+
+def _iter_csv(file) -> Iterator[Dict[str, Any]]:
+    """CSV-Zeilen als Dicts; Trennzeichen (, ; Tab) wird aus der Kopfzeile erkannt."""
+    header = file.readline()
+    delimiter = max((",", ";", "\t"), key=header.count)
+    fieldnames = next(csv.reader([header], delimiter=delimiter))
+    yield from csv.DictReader(file, fieldnames=[name.strip() for name in fieldnames], delimiter=delimiter)
+
+
+def _iter_json(file) -> Iterator[Dict[str, Any]]:
+    """
+    Objekte eines JSON-Arrays ([{...}, {...}]) oder einer JSON-Lines-Datei.
+    Arrays werden stückweise dekodiert, ohne die ganze Datei zu laden.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(CHUNK_SIZE).lstrip()
+    if not buffer.startswith("["):
+        # JSON Lines: ein Objekt pro Zeile (angefangene letzte Zeile des ersten Blocks vervollständigen)
+        for line in itertools.chain((buffer + file.readline()).splitlines(), file):
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    buffer = buffer[1:]
+    while True:
+        buffer = buffer.lstrip(" \t\r\n,")
+        if buffer.startswith("]"):
+            return
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except ValueError:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                raise ValueError("JSON-Array unvollständig oder fehlerhaft")
+            buffer += chunk
+            continue
+        yield record
+        buffer = buffer[end:]
+
+
+def iter_records(source_path: str) -> Iterator[Dict[str, Any]]:
+    """Liest eine Exportdatei (.csv, .json, .jsonl/.ndjson) Zeile für Zeile."""
+    if source_path.lower().endswith(".csv"):
+        with open(source_path, 'r', encoding='utf-8-sig', newline='') as file:
+            yield from _iter_csv(file)
+    else:
+        with open(source_path, 'r', encoding='utf-8-sig') as file:
+            yield from _iter_json(file)
+
+
+def to_dashboard_coordinates(x: np.ndarray, y: np.ndarray, pitch: str, flip: bool = False):
+    """Rechnet Export-Koordinaten auf das Dashboard-Feld um (x quer 0-68, y zum Tor 0-100)."""
+    fmt = PITCH_FORMATS[pitch]
+    along, across = (x, y) if fmt["x_along_length"] else (y, x)
+    dashboard_x = across / fmt["width"] * PITCH_WIDTH
+    dashboard_y = along / fmt["length"] * PITCH_LENGTH
+    if flip:
+        dashboard_x = PITCH_WIDTH - dashboard_x
+    return np.round(dashboard_x, 1), np.round(dashboard_y, 1)
+
+
+def _to_float(value: Any) -> float:
+    """Zahl aus einer Export-Zelle (auch mit Dezimalkomma); NaN, wenn leer oder ungültig."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().replace(",", "."))
+    except ValueError:
+        return float("nan")
+
+
+class _ImportWriter:
+    """Puffert importierte Events pro Zieldatei und hängt sie blockweise an."""
+
+    def __init__(self, base_path: str, replace: bool):
+        self.base_path = base_path
+        self.replace = replace
+        self.squad_dirs = {(squad["season"], squad["name"]): squad["dir"] for squad in discover_squads(base_path)}
+        self.buffers: Dict[str, List[str]] = {}
+        self.counts: Dict[str, int] = {}
+        self.pending = 0
+        self._started = set()
+
+    def target(self, season: str, team: str, side: str) -> str:
+        folder = self.squad_dirs.get((season, team))
+        if folder is None:
+            # Neues Team: Ordner wie bei den Team-Dateien anlegen (frühere Saisons im Saison-Ordner)
+            folder = team if season == CURRENT_SEASON else os.path.join(season, team)
+        return os.path.join(folder, f"{SIDE_FILE_PREFIX[side]}{team}{IMPORT_FILE_SUFFIX}")
+
+    def add(self, path: str, record: Dict[str, Any]) -> None:
+        self.buffers.setdefault(path, []).append(json.dumps(record, ensure_ascii=False) + "\n")
+        self.counts[path] = self.counts.get(path, 0) + 1
+        self.pending += 1
+
+    def flush(self) -> None:
+        for path, lines in self.buffers.items():
+            if not lines:
+                continue
+            full_path = os.path.join(self.base_path, path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            mode = 'w' if self.replace and path not in self._started else 'a'
+            with open(full_path, mode, encoding='utf-8') as file:
+                file.writelines(lines)
+            self._started.add(path)
+            lines.clear()
+        self.pending = 0
+
+
+def _import_batch(batch: List[Tuple[int, Dict[str, Any]]], writer: _ImportWriter, options: Dict[str, Any],
+                  report: Dict[str, Any]) -> None:
+    """Prüft und rechnet einen Block von Export-Zeilen um und übergibt gültige Events an den Writer."""
+    columns = options["columns"]
+    coords = np.array([[_to_float(row.get(columns[name], "")) for name in ("x", "y", "assist_x", "assist_y")]
+                       for _, row in batch], dtype=np.float64).reshape(-1, 4)
+    goal_x, goal_y = to_dashboard_coordinates(coords[:, 0], coords[:, 1], options["pitch"], options["flip"])
+    assist_x, assist_y = to_dashboard_coordinates(coords[:, 2], coords[:, 3], options["pitch"], options["flip"])
+    points = np.column_stack((goal_x, goal_y, assist_x, assist_y))
+    # NaN (fehlende Koordinaten) fällt bei beiden Vergleichen durch
+    valid = ((points[:, [0, 2]] >= 0) & (points[:, [0, 2]] <= PITCH_WIDTH)).all(axis=1) & \
+            ((points[:, [1, 3]] >= 0) & (points[:, [1, 3]] <= PITCH_LENGTH)).all(axis=1)
+
+    for (line_no, row), ok, point in zip(batch, valid.tolist(), points.tolist()):
+        problem = None
+        team = str(row.get(columns["team"]) or options["team"] or "").strip()
+        side = SIDE_ALIASES.get(str(row.get(columns["side"]) or options["side"] or "").strip().lower())
+        season = str(row.get(columns["season"]) or options["season"] or CURRENT_SEASON).strip()
+        if not ok:
+            problem = "Koordinaten fehlen oder liegen außerhalb des Spielfelds"
+        elif not team:
+            problem = "kein Team angegeben"
+        elif side is None:
+            problem = "Seite fehlt (eigene_tore/gegentore)"
+        elif season != CURRENT_SEASON and not SEASON_DIR_PATTERN.match(season):
+            problem = f"ungültige Saison '{season}'"
+        if problem is not None:
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append(f"Zeile {line_no}: {problem}")
+            continue
+
+        record = {"goal": point[:2], "assist": point[2:]}
+        for name in EVENT_FIELDS:
+            value = row.get(columns[name])
+            if value in (None, ""):
+                continue
+            # Gleiche Prüfung wie beim Einlesen; ungültige Angaben werden weggelassen, das Tor bleibt
+            problems = []
+            parse_event_info([{name: value}], 1, problems)
+            if problems:
+                if len(report["warnings"]) < MAX_REPORTED_ERRORS:
+                    report["warnings"].append(f"Zeile {line_no}: ungültige Angabe für '{name}' ({value!r}) ignoriert")
+                continue
+            record[name] = value
+        writer.add(writer.target(season, team, side), record)
+        report["imported"] += 1
+
+
+def import_events(source_path: str, base_path: str = ".", pitch: str = "dashboard",
+                  team: Optional[str] = None, side: Optional[str] = None, season: Optional[str] = None,
+                  flip: bool = False, columns: Optional[Dict[str, str]] = None, replace: bool = False,
+                  batch_size: int = BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Importiert eine Exportdatei in die Import-Dateien der Teams und aktualisiert den Event-Store.
+
+    team/side/season gelten für Zeilen ohne eigene Angabe. replace=True ersetzt bestehende
+    Import-Dateien der betroffenen Teams statt anzuhängen.
+    Gibt einen Bericht zurück: rows, imported, rejected, errors (abgelehnte Zeilen),
+    warnings (ignorierte Angaben), files (Events pro Import-Datei), seconds.
+    """
+    started = time.perf_counter()
+    if pitch not in PITCH_FORMATS:
+        raise ValueError(f"Unbekanntes Koordinatenformat '{pitch}' (möglich: {', '.join(PITCH_FORMATS)})")
+    options = {"pitch": pitch, "flip": flip, "team": team, "side": side, "season": season,
+               "columns": {**DEFAULT_COLUMNS, **(columns or {})}}
+    report = {"rows": 0, "imported": 0, "rejected": 0, "errors": [], "warnings": [], "files": {}, "seconds": 0.0}
+    writer = _ImportWriter(base_path, replace)
+
+    batch = []
+    for line_no, row in enumerate(iter_records(source_path), start=2 if source_path.lower().endswith(".csv") else 1):
+        report["rows"] += 1
+        if not isinstance(row, dict):
+            report["rejected"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append(f"Zeile {line_no}: kein Objekt")
+            continue
+        batch.append((line_no, row))
+        if len(batch) >= batch_size:
+            _import_batch(batch, writer, options, report)
+            batch = []
+        if writer.pending >= batch_size:
+            writer.flush()
+    if batch:
+        _import_batch(batch, writer, options, report)
+    writer.flush()
+
+    report["files"] = writer.counts
+    if writer.counts:
+        # Nur die Segmente der betroffenen Teams werden neu eingelesen
+        open_event_store(base_path)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Importiert Event-Exporte (CSV/JSON) in das AKA Dashboard.")
+    parser.add_argument("datei", help="Exportdatei (.csv, .json, .jsonl)")
+    parser.add_argument("--daten", default=".", help="Datenordner des Dashboards (Standard: aktueller Ordner)")
+    parser.add_argument("--format", default="dashboard", choices=sorted(PITCH_FORMATS),
+                        help="Koordinatensystem des Exports")
+    parser.add_argument("--team", help="Team für Zeilen ohne Team-Spalte")
+    parser.add_argument("--seite", help="eigene_tore oder gegentore für Zeilen ohne Seiten-Spalte")
+    parser.add_argument("--saison", help=f"Saison-Ordner für Zeilen ohne Saison-Spalte (Standard: {CURRENT_SEASON})")
+    parser.add_argument("--spiegeln", action="store_true", help="Feldbreite spiegeln (links/rechts tauschen)")
+    parser.add_argument("--spalte", action="append", default=[], metavar="FELD=NAME",
+                        help="Spaltennamen zuordnen, z.B. --spalte x=pos_x")
+    parser.add_argument("--ersetzen", action="store_true", help="Bestehende Import-Dateien ersetzen statt anhängen")
+    args = parser.parse_args(argv)
+
+    columns = {}
+    for mapping in args.spalte:
+        field, _, name = mapping.partition("=")
+        if field not in DEFAULT_COLUMNS or not name:
+            parser.error(f"Ungültige Zuordnung '{mapping}' (Felder: {', '.join(DEFAULT_COLUMNS)})")
+        columns[field] = name
+
+    report = import_events(args.datei, args.daten, pitch=args.format, team=args.team, side=args.seite,
+                           season=args.saison, flip=args.spiegeln, columns=columns, replace=args.ersetzen)
+    print(f"{report['imported']} von {report['rows']} Zeilen importiert "
+          f"({report['rejected']} abgelehnt) in {report['seconds']:.2f} s")
+    for path, count in report["files"].items():
+        print(f"  {path}: {count} Events")
+    for message in report["errors"] + report["warnings"]:
+        print(f"  - {message}")
+    return 0 if report["imported"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
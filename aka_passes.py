@@ -0,0 +1,111 @@
+"""
+Passweg-Analyse: Assist -> Tor für alle Tor/Assist-Paare auf einmal.
+
+pass_vectors() berechnet für ein (n, 4) Array von Paaren [tor_x, tor_y,
+assist_x, assist_y] Länge, Richtung, Raumgewinn sowie Start- und Zielzone als
+NumPy-Arrays. pass_stats() stapelt die Paare aller Teams und Seiten, rechnet
+einmal über alle Paare und verteilt die Werte per np.bincount auf Klassen
+(Teams x Seiten x Klassen); der Aufwand wächst nur linear mit der Anzahl Paare.
+
+Koordinaten wie in den Team-Dateien: x 0-68 (links nach rechts), y 0-100,
+angegriffen wird das Tor bei y=100.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from aka_data import SIDES
+from aka_zones import DEFAULT_ZONES, PARTITION_SIZE, RASTER_MIN_POINTS, classify_zones, get_zone_raster
+
+# Klassen-Grenzen (Meter bzw. Grad) mit Beschriftung für die Diagramme
+LENGTH_BINS = [0, 5, 10, 15, 20, 30, 40, np.inf]
+LENGTH_LABELS = ["0-5 m", "5-10 m", "10-15 m", "15-20 m", "20-30 m", "30-40 m", "> 40 m"]
+# Richtung: 0° = gerade zum Tor, +90° = nach rechts, -90° = nach links, ±180° = zurück
+ANGLE_BINS = [-180, -112.5, -67.5, -22.5, 22.5, 67.5, 112.5, 180]
+ANGLE_LABELS = ["zurück links", "quer links", "diagonal links", "steil", "diagonal rechts", "quer rechts",
+                "zurück rechts"]
+# Raumgewinn: Meter in Richtung gegnerisches Tor (negativ = Rückpass)
+PROGRESSION_BINS = [-np.inf, 0, 5, 10, 20, 30, np.inf]
+PROGRESSION_LABELS = ["zurück", "0-5 m", "5-10 m", "10-20 m", "20-30 m", "> 30 m"]
+
+DISTRIBUTIONS = {
+    "length": (LENGTH_BINS, LENGTH_LABELS),
+    "angle": (ANGLE_BINS, ANGLE_LABELS),
+    "progression": (PROGRESSION_BINS, PROGRESSION_LABELS),
+}
+# Start-/Zielzonen: die Standard-Zonen (lückenlose Aufteilung des Spielfelds)
+PASS_ZONE_NAMES = [zone["name"] for zone in DEFAULT_ZONES]
+
+
+def _zone_ids(points: np.ndarray) -> np.ndarray:
+    """Zonen-Nummer pro Punkt (ab RASTER_MIN_POINTS über das Zonen-Raster)."""
+    if len(points) >= RASTER_MIN_POINTS:
+        return get_zone_raster().classify(points)
+    return classify_zones(points)
+
+
+def pass_vectors(pairs: Any) -> Dict[str, np.ndarray]:
+    """
+    Passweg-Kennzahlen pro Paar: "length" (m), "angle" (Grad, 0 = zum Tor),
+    "progression" (m Richtung Tor), "origin_zone"/"target_zone" (Zonen-Nummer
+    von Assist bzw. Tor, Index in DEFAULT_ZONES).
+    """
+    pairs = np.asarray(pairs, dtype=np.float64).reshape(-1, 4)
+    dx = pairs[:, 0] - pairs[:, 2]
+    dy = pairs[:, 1] - pairs[:, 3]
+    return {
+        "length": np.hypot(dx, dy),
+        "angle": np.degrees(np.arctan2(dx, dy)),
+        "progression": dy,
+        "origin_zone": _zone_ids(pairs[:, 2:]).astype(np.int64),
+        "target_zone": _zone_ids(pairs[:, :2]).astype(np.int64),
+    }
+
+
+def _binned(values: np.ndarray, edges: List[float], groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """Histogramm pro Gruppe (n_groups, Klassen) in einem bincount."""
+    n_bins = len(edges) - 1
+    bins = np.clip(np.digitize(values, edges[1:-1]), 0, n_bins - 1)
+    return np.bincount(groups * n_bins + bins, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+
+
+def pass_stats(teams_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Passweg-Verteilungen aller Teams und Seiten in einem Durchlauf.
+    Histogramme haben die Form (Teams, Seiten, Klassen), "zone_matrix"
+    (Teams, Seiten, Startzone, Zielzone); Summen für Mittelwerte stehen unter
+    "length_sum"/"progression_sum", die Anzahl Paare unter "totals".
+    """
+    teams = list(teams_data)
+    arrays = [np.asarray(teams_data[team][side]["pairs"]).reshape(-1, 4) for team in teams for side in SIDES]
+    n_groups = len(arrays)
+    groups = np.repeat(np.arange(n_groups), [len(pairs) for pairs in arrays])
+    vectors = pass_vectors(np.concatenate(arrays) if arrays else np.empty((0, 4)))
+
+    shape = (len(teams), len(SIDES))
+    stats = {"teams": teams, "sides": list(SIDES), "zones": list(PASS_ZONE_NAMES),
+             "totals": np.bincount(groups, minlength=n_groups).reshape(shape)}
+    for name, (edges, labels) in DISTRIBUTIONS.items():
+        stats[name] = _binned(vectors[name], edges, groups, n_groups).reshape(shape + (len(labels),))
+        stats[f"{name}_labels"] = list(labels)
+    for name in ("length", "progression"):
+        stats[f"{name}_sum"] = np.bincount(groups, weights=vectors[name], minlength=n_groups).reshape(shape)
+    cells = (groups * PARTITION_SIZE + vectors["origin_zone"]) * PARTITION_SIZE + vectors["target_zone"]
+    stats["zone_matrix"] = np.bincount(cells, minlength=n_groups * PARTITION_SIZE ** 2).reshape(
+        shape + (PARTITION_SIZE, PARTITION_SIZE))
+    return stats
+
+
+def select_pass_stats(stats: Dict[str, Any], side: str, team: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Ausschnitt aus pass_stats() für eine Seite: Histogramme, Zonen-Matrix und
+    Mittelwerte eines Teams bzw. (team=None) aller Teams zusammen.
+    """
+    team_index = slice(None) if team is None else [stats["teams"].index(team)]
+    side_index = stats["sides"].index(side)
+    selected = {name: np.asarray(stats[name])[team_index, side_index].sum(axis=0)
+                for name in list(DISTRIBUTIONS) + ["zone_matrix", "totals", "length_sum", "progression_sum"]}
+    total = int(selected["totals"])
+    selected["mean_length"] = float(selected["length_sum"]) / total if total else 0.0
+    selected["mean_progression"] = float(selected["progression_sum"]) / total if total else 0.0
+    return selected
@@ -0,0 +1,103 @@
+"""
+Spielfeld-Hintergrund: Linien, Strafräume und Zonen-Flächen.
+
+Das Spielfeld (Mittellinie, Mittelkreis, Strafräume, Fünfmeterräume,
+Halbkreise, die gestrichelten Zonen-Linien sowie Goldene Zone und Zone 14)
+ändert sich nie. pitch_template() baut seine Geometrie deshalb einmal pro Stil
+als Liste von Pfaden mit Farben, Linienbreiten und -arten auf (Vorlage).
+draw_pitch() legt die Vorlage pro Diagramm als eine einzige PathCollection
+(plus die Elfmeterpunkte) in die Achse, statt rund 25 Einzel-Artists neu zu
+erzeugen; gezeichnet werden danach nur noch die Daten.
+
+Koordinaten wie in den Team-Dateien: x 0-68, y 0-100, Tor oben.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import matplotlib.patches as patches
+import numpy as np
+from matplotlib.collections import PathCollection
+from matplotlib.colors import to_rgba
+from matplotlib.path import Path
+from matplotlib.transforms import Affine2D
+
+from aka_data import PITCH_LENGTH, PITCH_WIDTH
+
+PITCH_LINE_COLOR = '#00ff88'
+# "field": Spielfeld-Ansicht (ganzes Feld, Zonen-Flächen), "preview": Zonen-Vorschau (nur oberer Strafraum)
+PITCH_STYLES = {
+    "field": {"linewidth": 2, "full": True},
+    "preview": {"linewidth": 1.5, "full": False},
+}
+# Unter den Daten: Flächen/Linien des Spielfelds, darüber die Elfmeterpunkte
+PITCH_ZORDER = 1
+PENALTY_SPOTS = [(34, 89), (34, 11)]
+
+
+def _patch_path(patch: patches.Patch) -> Path:
+    """Pfad eines Patches in Spielfeld-Koordinaten."""
+    return patch.get_patch_transform().transform_path(patch.get_path())
+
+
+def _build_template(style: str) -> Dict[str, Any]:
+    linewidth = PITCH_STYLES[style]["linewidth"]
+    full = PITCH_STYLES[style]["full"]
+    line = PITCH_LINE_COLOR
+    # (Pfad, Füllfarbe, Linienfarbe, Linienbreite, Linienart) in Zeichenreihenfolge
+    shapes: List[Tuple[Path, Any, Any, float, str]] = []
+
+    def outline(path, linestyle="-"):
+        shapes.append((path, 'none', line, linewidth, linestyle))
+
+    if full:
+        # Goldene Zone (zwischen Torlinie, 5m Raum und 16m Linie) und Zone 14 (y 75-84, Breite des 5m Raums)
+        shapes.append((_patch_path(patches.Rectangle((25, 84), 18, 16)), to_rgba('gold', 0.3), 'none', 0, "-"))
+        shapes.append((_patch_path(patches.Rectangle((25, 75), 18, 9)), to_rgba('red', 0.3), 'none', 0, "-"))
+
+    # Mittellinie und Mittelkreis
+    outline(Path([(0, 50), (68, 50)]))
+    outline(_patch_path(patches.Circle((34, 50), 9)))
+
+    # Gestrichelte Zonen-Linien
+    for vertices in ([(43, 100), (43, 75)], [(25, 100), (25, 75)], [(43, 100), (54, 84), (54, 75)],
+                     [(25, 100), (14, 84), (14, 75)], [(14, 90), (0, 90)], [(54, 90), (68, 90)]):
+        outline(Path(vertices), "--")
+
+    # Fünfmeterraum (5m tief, 18m breit) und Sechzehnmeterraum (16m tief, 40m breit)
+    outline(_patch_path(patches.Rectangle((25, 95), 18, 5)))
+    outline(_patch_path(patches.Rectangle((14, 84), 40, 16)))
+    if full:
+        outline(_patch_path(patches.Rectangle((25, 0), 18, 5)))
+        outline(_patch_path(patches.Rectangle((14, 0), 40, 16)))
+        # Halbkreise um die Elfmeterpunkte
+        outline(Path.arc(215, 325).transformed(Affine2D().scale(9).translate(34, 89)))
+        outline(Path.arc(35, 145).transformed(Affine2D().scale(9).translate(34, 11)))
+
+    paths, facecolors, edgecolors, linewidths, linestyles = zip(*shapes)
+    return {"paths": list(paths), "facecolors": list(facecolors), "edgecolors": list(edgecolors),
+            "linewidths": list(linewidths), "linestyles": list(linestyles), "penalty_spots": full}
+
+
+_templates: Dict[str, Dict[str, Any]] = {}
+_templates_lock = threading.Lock()
+
+
+def pitch_template(style: str = "field") -> Dict[str, Any]:
+    """Geometrie und Stil des Spielfelds (wird pro Stil beim ersten Aufruf einmal erzeugt)."""
+    with _templates_lock:
+        if style not in _templates:
+            _templates[style] = _build_template(style)
+        return _templates[style]
+
+
+def draw_pitch(ax, style: str = "field", logo: Optional[np.ndarray] = None) -> None:
+    """Legt das Spielfeld aus der Vorlage in die Achse (bei "field" mit Logo und Elfmeterpunkten)."""
+    # SV Ried Logo als Hintergrund (falls vorhanden)
+    if logo is not None:
+        ax.imshow(logo, extent=[0, PITCH_WIDTH, 0, PITCH_LENGTH], alpha=0.05)
+    template = pitch_template(style)
+    ax.add_collection(PathCollection(template["paths"], facecolors=template["facecolors"],
+                                     edgecolors=template["edgecolors"], linewidths=template["linewidths"],
+                                     linestyles=template["linestyles"], zorder=PITCH_ZORDER), autolim=False)
+    if template["penalty_spots"]:
+        ax.scatter(*zip(*PENALTY_SPOTS), color=PITCH_LINE_COLOR, marker='o', zorder=PITCH_ZORDER)
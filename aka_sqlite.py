@@ -0,0 +1,305 @@
+"""
+Optionales SQLite-Backend für Zonen-Abfragen.
+
+Spiegelt den Event-Store in eine lokale SQLite-Datenbank (.aka_cache/events.sqlite):
+jedes Tor und jeder Assist ist eine Zeile, die Koordinaten liegen zusätzlich in
+einem R*Tree-Index. Zonen-Zählungen, der Ecken-Filter und "Alle Teams"-Summen
+sind damit indizierte Abfragen statt Schleifen über Python-Listen.
+
+Aktivierung im Dashboard über die Umgebungsvariable AKA_EVENT_BACKEND=sqlite.
+Läuft komplett offline (sqlite3 aus der Standardbibliothek).
+
+Der erste Abgleich eines großen Stores dauert (R*Tree-Einfügungen, ca. 13 s bei
+200.000 Events); das Dashboard startet ihn deshalb mit request_sync() im
+Hintergrund und nutzt den Index erst, wenn er den aktuellen Datenstand hat.
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from aka_data import SET_PIECES, SIDES, EventStore
+from aka_zones import (DATA_TYPES, OVERLAY_ZONES, REST_ID, REST_ZONE, ZONE_BY_NAME, ZONE_IDS, ZONES,
+                       make_zone_stats, zone_count, zone_counts)
+
+logger = logging.getLogger(__name__)
+
+SQLITE_FILE = "events.sqlite"
+POOL_SIZE = 4
+
+KIND_CODES = {"goals": 0, "assists": 1}
+
+# Standard-Zonen als Rechtecke aus der Zonen-Registry (gleiche Grenzen wie classify_zones);
+# eigene Zonen (Polygone) werden in zone_count() nachgeprüft
+SQL_ZONES = {zone["name"]: zone["bounds"] for zone in ZONES if zone["bounds"] is not None}
+
+# Schema-Version (PRAGMA user_version); bei Abweichung wird die Datenbank neu aufgebaut
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    season TEXT, team TEXT, side TEXT, signature TEXT,
+    PRIMARY KEY (season, team, side)
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    season TEXT NOT NULL, team TEXT NOT NULL, side TEXT NOT NULL,
+    kind INTEGER NOT NULL, pair INTEGER NOT NULL,
+    x REAL NOT NULL, y REAL NOT NULL,
+    set_piece INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS events_segment ON events (season, team, side, kind, pair);
+CREATE VIRTUAL TABLE IF NOT EXISTS events_rtree USING rtree (id, min_x, max_x, min_y, max_y);
+"""
+
+
+def _rect_condition(rect: Tuple) -> str:
+    """SQL-Bedingung für ein Zonen-Rechteck auf der R*Tree-Tabelle r."""
+    x_min, x_min_inc, x_max, x_max_inc, y_min, y_min_inc, y_max, y_max_inc = rect
+    return (f"r.min_x {'>=' if x_min_inc else '>'} {x_min} AND r.max_x {'<=' if x_max_inc else '<'} {x_max} AND "
+            f"r.min_y {'>=' if y_min_inc else '>'} {y_min} AND r.max_y {'<=' if y_max_inc else '<'} {y_max}")
+
+
+class SqliteEventIndex:
+    """
+    SQLite-Spiegel des Event-Stores mit R*Tree-Index und Connection-Pool.
+    sync() übernimmt nur Segmente, deren Quelldatei sich geändert hat;
+    request_sync() macht dasselbe in einem Hintergrund-Thread. generation ist
+    der Datenstand, den die Abfragen liefern (None vor dem ersten Abgleich).
+    """
+
+    def __init__(self, db_path: str, pool_size: int = POOL_SIZE):
+        self.db_path = db_path
+        self.generation = None
+        # Fehler des letzten Hintergrund-Abgleichs, None wenn ok
+        self.last_error: Optional[str] = None
+        self._sync_lock = threading.Lock()
+        self._requested: Optional[EventStore] = None
+        self._worker: Optional[threading.Thread] = None
+        self._request_lock = threading.Lock()
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self.connection() as conn:
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    conn.executescript("DROP TABLE IF EXISTS segments; DROP TABLE IF EXISTS events; "
+                                       "DROP TABLE IF EXISTS events_rtree;")
+                conn.executescript(SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            except sqlite3.OperationalError as e:
+                raise RuntimeError(f"SQLite ohne R*Tree-Unterstützung: {e}") from e
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Leiht eine Verbindung aus dem Pool aus (blockiert, wenn alle vergeben sind)."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def sync(self, store: EventStore) -> None:
+        """Gleicht die Datenbank mit dem Event-Store ab (nur geänderte Segmente)."""
+        if self.generation == store.generation:
+            return
+        with self._sync_lock, self.connection() as conn:
+            if self.generation == store.generation:
+                return
+            stored = {(row[0], row[1], row[2]): row[3]
+                      for row in conn.execute("SELECT season, team, side, signature FROM segments")}
+            conn.execute("BEGIN")
+            try:
+                for key in set(stored) - set(store.segments):
+                    self._delete_segment(conn, key)
+                for key, seg in store.segments.items():
+                    signature = json.dumps([seg["signature"], seg.get("import_signature")])
+                    if stored.get(key) == signature:
+                        continue
+                    self._delete_segment(conn, key)
+                    self._insert_segment(conn, store, key)
+                    conn.execute("INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?)", (*key, signature))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self.generation = store.generation
+
+    def request_sync(self, store: EventStore) -> None:
+        """
+        Gleicht die Datenbank im Hintergrund mit dem Event-Store ab und kehrt sofort zurück.
+        Kommen während eines Abgleichs neue Stände, wird danach nur der neueste übernommen.
+        """
+        if self.generation == store.generation:
+            return
+        with self._request_lock:
+            self._requested = store
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._sync_worker, name="aka-sqlite-sync", daemon=True)
+                self._worker.start()
+
+    def _sync_worker(self) -> None:
+        while True:
+            with self._request_lock:
+                store, self._requested = self._requested, None
+                if store is None:
+                    self._worker = None
+                    return
+            try:
+                self.sync(store)
+            except Exception as e:
+                logger.exception("Abgleich des SQLite-Index fehlgeschlagen")
+                self.last_error = f"{type(e).__name__}: {e}"
+            else:
+                self.last_error = None
+
+    @staticmethod
+    def _delete_segment(conn: sqlite3.Connection, key: Tuple[str, str, str]) -> None:
+        conn.execute("DELETE FROM events_rtree WHERE id IN "
+                     "(SELECT id FROM events WHERE season = ? AND team = ? AND side = ?)", key)
+        conn.execute("DELETE FROM events WHERE season = ? AND team = ? AND side = ?", key)
+        conn.execute("DELETE FROM segments WHERE season = ? AND team = ? AND side = ?", key)
+
+    @staticmethod
+    def _insert_segment(conn: sqlite3.Connection, store: EventStore, key: Tuple[str, str, str]) -> None:
+        season, team, side = key
+        seg = store.segments[key]
+        rows_of = slice(seg["start"], seg["start"] + seg["rows"])
+        set_pieces = np.asarray(store.columns["set_piece"][rows_of]).tolist()
+        for kind, (x_column, y_column, count) in enumerate((("x", "y", seg["goals"]),
+                                                             ("assist_x", "assist_y", seg["assists"]))):
+            xs = np.asarray(store.columns[x_column][rows_of])[:count]
+            ys = np.asarray(store.columns[y_column][rows_of])[:count]
+            # pair = Zeile im Segment (wie im Event-Store); fehlende Punkte (NaN-Platzhalter) auslassen
+            pairs = np.flatnonzero(~np.isnan(xs)).tolist()
+            rows = [(season, team, side, kind, i, float(xs[i]), float(ys[i]), set_pieces[i]) for i in pairs]
+            if not rows:
+                continue
+            cursor = conn.execute("SELECT COALESCE(MAX(id), 0) FROM events")
+            first_id = cursor.fetchone()[0] + 1
+            conn.executemany(
+                "INSERT INTO events (id, season, team, side, kind, pair, x, y, set_piece) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(first_id + i, *row) for i, row in enumerate(rows)])
+            conn.executemany(
+                "INSERT INTO events_rtree VALUES (?, ?, ?, ?, ?)",
+                [(first_id + i, row[5], row[5], row[6], row[6]) for i, row in enumerate(rows)])
+
+    @staticmethod
+    def _filters(data_type: str, side: str, team: Optional[str], season: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses = ["e.kind = ?", "e.side = ?"]
+        params: List[Any] = [KIND_CODES[data_type], side]
+        if team is not None:
+            clauses.append("e.team = ?")
+            params.append(team)
+        if season is not None:
+            clauses.append("e.season = ?")
+            params.append(season)
+        return " AND ".join(clauses), params
+
+    def total(self, data_type: str, side: str, team: Optional[str] = None, season: Optional[str] = None) -> int:
+        """Anzahl Tore/Assists (team=None: alle Teams, season=None: alle Saisons)."""
+        where, params = self._filters(data_type, side, team, season)
+        with self.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM events e WHERE {where}", params).fetchone()[0]
+
+    def zone_count(self, zone_name: str, data_type: str, side: str,
+                   team: Optional[str] = None, season: Optional[str] = None) -> int:
+        """Anzahl Tore/Assists in einer Zone über den R*Tree-Index."""
+        if zone_name == REST_ZONE:
+            return self.total(data_type, side, team, season) - sum(
+                self.zone_count(zone, data_type, side, team, season) for zone in SQL_ZONES)
+        where, params = self._filters(data_type, side, team, season)
+        polygon = ZONE_BY_NAME[zone_name].get("polygon")
+        if polygon is not None:
+            # Eigene Zone: Vorauswahl über das umgebende Rechteck, dann Punkt-in-Polygon-Test
+            xs, ys = zip(*polygon)
+            sql = (f"SELECT e.x, e.y FROM events_rtree r JOIN events e ON e.id = r.id "
+                   f"WHERE {_rect_condition((min(xs), True, max(xs), True, min(ys), True, max(ys), True))} AND {where}")
+            with self.connection() as conn:
+                return zone_count(conn.execute(sql, params).fetchall(), zone_name)
+        sql = (f"SELECT COUNT(*) FROM events_rtree r JOIN events e ON e.id = r.id "
+               f"WHERE {_rect_condition(SQL_ZONES[zone_name])} AND {where}")
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def zone_stats(self, teams: List[str], season: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Zonen-Statistik wie aka_zones.zone_stats() (Teams x Seiten x Datenarten x Zonen),
+        eine GROUP-BY-Abfrage pro Zone über den R*Tree-Index.
+        """
+        shape = (len(teams), len(SIDES), len(DATA_TYPES))
+        counts = np.zeros(shape + (len(ZONES),), dtype=np.int64)
+        totals = np.zeros(shape, dtype=np.int64)
+        team_pos = {team: i for i, team in enumerate(teams)}
+        side_pos = {side: i for i, side in enumerate(SIDES)}
+        kind_pos = {KIND_CODES[data_type]: i for i, data_type in enumerate(DATA_TYPES)}
+        where, params = ("e.season = ?", [season]) if season is not None else ("1", [])
+
+        def cell(team: str, side: str, kind: int) -> Optional[Tuple[int, int, int]]:
+            if team not in team_pos:
+                return None
+            return team_pos[team], side_pos[side], kind_pos[kind]
+
+        group = "GROUP BY e.team, e.side, e.kind"
+        with self.connection() as conn:
+            for team, side, kind, n in conn.execute(
+                    f"SELECT e.team, e.side, e.kind, COUNT(*) FROM events e WHERE {where} {group}", params):
+                if cell(team, side, kind):
+                    totals[cell(team, side, kind)] = n
+            for zone_name, rect in SQL_ZONES.items():
+                sql = (f"SELECT e.team, e.side, e.kind, COUNT(*) FROM events_rtree r JOIN events e ON e.id = r.id "
+                       f"WHERE {_rect_condition(rect)} AND {where} {group}")
+                for team, side, kind, n in conn.execute(sql, params):
+                    if cell(team, side, kind):
+                        counts[cell(team, side, kind) + (ZONE_IDS[zone_name],)] = n
+            for zone in OVERLAY_ZONES:
+                # Eigene Zone: Vorauswahl über das umgebende Rechteck, dann Punkt-in-Polygon-Test
+                xs, ys = zip(*zone["polygon"])
+                sql = (f"SELECT e.team, e.side, e.kind, e.x, e.y FROM events_rtree r JOIN events e ON e.id = r.id "
+                       f"WHERE {_rect_condition((min(xs), True, max(xs), True, min(ys), True, max(ys), True))} "
+                       f"AND {where}")
+                rows = [(cell(team, side, kind), x, y) for team, side, kind, x, y in conn.execute(sql, params)]
+                rows = [(np.ravel_multi_index(pos, shape), x, y) for pos, x, y in rows if pos]
+                if rows:
+                    groups, xs_, ys_ = zip(*rows)
+                    zone_column = zone_counts(np.column_stack((xs_, ys_)), groups, totals.size)[:, ZONE_IDS[zone["name"]]]
+                    counts[..., ZONE_IDS[zone["name"]]] = zone_column.reshape(shape)
+        counts[..., REST_ID] = totals - counts[..., :REST_ID].sum(axis=-1)
+        return make_zone_stats(teams, counts, totals)
+
+    def corner_pairs(self, side: str, team: str, season: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Tore und Assists der Ecken-Tore (Standardsituations-Maske aus dem Event-Store) eines Teams."""
+        where, params = self._filters("assists", side, team, season)
+        sql = (f"SELECT g.x, g.y, e.x, e.y FROM events e "
+               f"JOIN events g ON g.season = e.season AND g.team = e.team AND g.side = e.side "
+               f"AND g.kind = {KIND_CODES['goals']} AND g.pair = e.pair "
+               f"WHERE (e.set_piece & {SET_PIECES['Ecke']}) AND {where} ORDER BY e.season, e.pair")
+        with self.connection() as conn:
+            rows = np.asarray(conn.execute(sql, params).fetchall(), dtype=np.float32).reshape(-1, 4)
+        return rows[:, :2], rows[:, 2:]
+
+    def corner_teams_data(self, teams: List[str], season: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Team-Datenstruktur der Ecken-Ansicht, direkt aus dem Index."""
+        titles = {"eigene_tore": "Eigene Ecken-Tore", "gegentore": "Ecken-Gegentore"}
+        teams_data = {}
+        for team in teams:
+            teams_data[team] = {}
+            for side in SIDES:
+                goals, assists = self.corner_pairs(side, team, season)
+                teams_data[team][side] = {"goals": goals, "assists": assists, "pairs": np.hstack((goals, assists)),
+                                          "title": f"{team} - {titles[side]}", "additional_info": ""}
+        return teams_data
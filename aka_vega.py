@@ -0,0 +1,193 @@
+"""
+Spielfeld als Vega-Lite-Spezifikation (Darstellung im Browser über st.vega_lite_chart).
+
+Alternative zum Matplotlib-Bild: der Server schickt nur die Koordinaten der
+Tore, Assists und Passwege sowie die Zonen-Beschriftungen; gezeichnet wird im
+Browser, mit Tooltip (Team, Koordinaten) und Zoom/Verschieben per Maus.
+
+Die Spielfeld-Markierungen kommen aus derselben Vorlage wie beim
+Matplotlib-Spielfeld (aka_pitch.pitch_template) und werden pro Prozess einmal
+in Vega-Lite-Ebenen umgewandelt (pitch_layers); pro Diagramm kommen nur die
+Daten-Ebenen hinzu (field_spec). Tore, Assists und Passwege werden spaltenweise
+übertragen (Listen pro Serie statt eines Objekts pro Punkt) und erst im Browser
+per flatten-Transformation in Punkte zerlegt.
+"""
+import copy
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from matplotlib.colors import to_hex, to_rgba
+
+from aka_data import PITCH_LENGTH, PITCH_WIDTH
+from aka_pitch import PENALTY_SPOTS, PITCH_LINE_COLOR, pitch_template
+from aka_zones import OVERLAY_ZONES, ZONES
+
+# Größe des Spielfelds im Browser (Pixel, Seitenverhältnis wie das Matplotlib-Spielfeld)
+FIELD_WIDTH_PX = 440
+FIELD_HEIGHT_PX = 650
+# Markerfläche (Pixel²) der Tore und Assists
+EVENT_MARK_SIZE = 70
+HOTSPOT_COLORS = {"goals": '#00e5ff', "assists": '#ff66ff'}
+
+_X = {"field": "x", "type": "quantitative", "scale": {"domain": [0, PITCH_WIDTH]}, "axis": None}
+_Y = {"field": "y", "type": "quantitative", "scale": {"domain": [0, PITCH_LENGTH]}, "axis": None}
+
+
+def _build_pitch_layers(style: str) -> List[Dict[str, Any]]:
+    template = pitch_template(style)
+    fills, solid, dashed = [], [], []
+    for shape, (path, facecolor, edgecolor, linestyle) in enumerate(zip(
+            template["paths"], template["facecolors"], template["edgecolors"], template["linestyles"])):
+        if not (isinstance(facecolor, str) and facecolor == 'none'):
+            (x0, y0), (x1, y1) = path.get_extents().get_points()
+            fills.append({"x": float(x0), "y": float(y0), "x2": float(x1), "y2": float(y1), "color": to_hex(facecolor),
+                          "opacity": to_rgba(facecolor)[3]})
+        if isinstance(edgecolor, str) and edgecolor == 'none':
+            continue
+        rows = dashed if linestyle == "--" else solid
+        for part, polyline in enumerate(path.to_polygons(closed_only=False)):
+            rows.extend({"shape": f"{shape}.{part}", "order": i, "x": float(x), "y": float(y)}
+                        for i, (x, y) in enumerate(polyline))
+    # Eigene Zonen aus zonen.json als gestrichelte Umrisse (wie auf dem Matplotlib-Spielfeld)
+    overlay = []
+    for zone in OVERLAY_ZONES:
+        polygon = list(zone["polygon"]) + [zone["polygon"][0]]
+        overlay.extend({"shape": zone["name"], "order": i, "x": float(x), "y": float(y), "color": zone["color"]}
+                       for i, (x, y) in enumerate(polygon))
+
+    def lines(rows, dash=None, color=None):
+        mark = {"type": "line", "clip": True, "strokeWidth": 1.5 if dash else 2}
+        if dash:
+            mark["strokeDash"] = dash
+        encoding = {"detail": {"field": "shape"}, "order": {"field": "order"}}
+        if color is None:
+            mark["color"] = PITCH_LINE_COLOR
+        else:
+            encoding["color"] = {"field": "color", "type": "nominal", "scale": None}
+        return {"data": {"values": rows}, "mark": mark, "encoding": encoding}
+
+    layers = [
+        {"data": {"values": fills}, "mark": {"type": "rect", "clip": True},
+         "encoding": {"x2": {"field": "x2"}, "y2": {"field": "y2"},
+                      "color": {"field": "color", "type": "nominal", "scale": None},
+                      "opacity": {"field": "opacity", "type": "quantitative", "scale": None}}},
+        lines(solid), lines(dashed, [6, 4]),
+    ]
+    if overlay:
+        layers.append(lines(overlay, [6, 4], color=True))
+    if template["penalty_spots"]:
+        layers.append({"data": {"values": [{"x": x, "y": y} for x, y in PENALTY_SPOTS]},
+                       "mark": {"type": "circle", "color": PITCH_LINE_COLOR, "opacity": 1, "size": 30}})
+    return layers
+
+
+_pitch_layers: Dict[str, List[Dict[str, Any]]] = {}
+_pitch_layers_lock = threading.Lock()
+
+
+def pitch_layers(style: str = "field") -> List[Dict[str, Any]]:
+    """Vega-Lite-Ebenen der Spielfeld-Markierungen (pro Stil einmal erzeugt, Kopie pro Aufruf)."""
+    with _pitch_layers_lock:
+        if style not in _pitch_layers:
+            _pitch_layers[style] = _build_pitch_layers(style)
+        return copy.deepcopy(_pitch_layers[style])
+
+
+def zone_label_rows(zone_percentages: Dict[str, float], zone_intervals=None) -> List[Dict[str, Any]]:
+    """Beschriftungen der Zonen (Prozent, optional Konfidenzintervall) wie draw_zone_labels im Dashboard."""
+    rows = []
+    for i, zone in enumerate(ZONES):
+        percentage = zone_percentages[zone["key"]]
+        if percentage <= 0:
+            continue
+        label = f"{percentage:.1f}%"
+        if zone_intervals is not None:
+            label += f"\n{zone_intervals[0][i]:.0f}–{zone_intervals[1][i]:.0f}%"
+        # Goldene Zone / Zone 14 in Zonenfarbe, alle anderen weiß
+        rows.append({"x": zone["label"][0], "y": zone["label"][1], "label": label, "zone": zone["name"],
+                     "color": zone["color"] if zone["highlight"] else '#ffffff'})
+    return rows
+
+
+def field_spec(title: str, series: Sequence[Dict[str, Any]], pairs: Any,
+               zone_labels: List[Dict[str, Any]], hotspots: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+               hotspot_types: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Vega-Lite-Spezifikation eines Spielfelds.
+
+    series: pro Serie {"name", "points" (n x 2), "teams" (Team pro Punkt), "color",
+    "edgecolor", "shape" ("circle"/"square")}; pairs: Passwege (Tor x, Tor y,
+    Assist x, Assist y); zone_labels: zone_label_rows(); hotspots wie
+    team_hotspots(), gezeichnet für die Datenarten in hotspot_types.
+    """
+    # Spaltenweise: eine Zeile pro Serie mit Koordinaten-Listen (Team als Index in "teams"),
+    # im Browser per flatten in eine Zeile pro Punkt zerlegt; spart die Feldnamen pro Punkt
+    events = []
+    for entry in series:
+        points = np.round(np.asarray(entry["points"], dtype=float).reshape(-1, 2), 2)
+        teams, team_index = np.unique(np.asarray(entry["teams"], dtype=object)[:len(points)].astype(str),
+                                      return_inverse=True)
+        events.append({"serie": entry["name"], "teams": teams.tolist(), "x": points[:, 0].tolist(),
+                       "y": points[:, 1].tolist(), "t": team_index.reshape(-1).tolist()})
+    pairs = np.round(np.asarray(pairs, dtype=float).reshape(-1, 4), 2)
+    passes = [{"x": pairs[:, 2].tolist(), "y": pairs[:, 3].tolist(), "x2": pairs[:, 0].tolist(),
+               "y2": pairs[:, 1].tolist()}]
+    names = [entry["name"] for entry in series]
+
+    layers = pitch_layers("field")
+    layers.append({"data": {"name": "passes"}, "transform": [{"flatten": ["x", "y", "x2", "y2"]}],
+                   "mark": {"type": "rule", "clip": True, "color": '#ffffff', "opacity": 0.5, "strokeWidth": 1,
+                            "strokeDash": [4, 3]},
+                   "encoding": {"x2": {"field": "x2"}, "y2": {"field": "y2"}}})
+    layers.append({"data": {"values": zone_labels},
+                   "mark": {"type": "text", "fontSize": 12, "fontWeight": "bold", "lineBreak": "\n", "opacity": 0.8},
+                   "encoding": {"text": {"field": "label"}, "color": {"field": "color", "type": "nominal", "scale": None},
+                                "tooltip": [{"field": "zone", "title": "Zone"}]}})
+    for data_type in hotspot_types:
+        boxes = [{"x": b[0] - 1, "y": b[1] - 1, "x2": b[2] + 1, "y2": b[3] + 1, "cx": h["center"][0],
+                  "cy": h["center"][1], "label": f"{h['count']} ({h['share']:.0f}%)",
+                  "ty": min(b[3] + 2.5, 98)} for h in (hotspots or {}).get(data_type, []) for b in [h["bounds"]]]
+        if not boxes:
+            continue
+        color = HOTSPOT_COLORS[data_type]
+        layers.append({"data": {"values": boxes},
+                       "mark": {"type": "rect", "clip": True, "color": color, "fillOpacity": 0.15, "stroke": color,
+                                "strokeDash": [6, 4], "strokeWidth": 1.5},
+                       "encoding": {"x2": {"field": "x2"}, "y2": {"field": "y2"}}})
+        layers.append({"data": {"values": boxes},
+                       "mark": {"type": "text", "color": color, "fontSize": 10, "fontWeight": "bold"},
+                       "encoding": {"x": {"field": "cx", "type": "quantitative"},
+                                    "y": {"field": "ty", "type": "quantitative"}, "text": {"field": "label"}}})
+    # Tore und Assists zuletzt (oben); Zoom/Verschieben über die Skalen dieser Ebene
+    layers.append({
+        "data": {"name": "events"},
+        "transform": [{"flatten": ["x", "y", "t"]}, {"calculate": "datum.teams[datum.t]", "as": "team"}],
+        "params": [{"name": "zoom", "select": "interval", "bind": "scales"}],
+        "mark": {"type": "point", "filled": True, "clip": True, "size": EVENT_MARK_SIZE, "strokeWidth": 1,
+                 "opacity": 1},
+        "encoding": {
+            "fill": {"field": "serie", "type": "nominal", "title": None,
+                     "scale": {"domain": names, "range": [entry["color"] for entry in series]}},
+            "stroke": {"field": "serie", "type": "nominal", "title": None,
+                       "scale": {"domain": names, "range": [entry["edgecolor"] for entry in series]}},
+            "shape": {"field": "serie", "type": "nominal", "title": None,
+                      "scale": {"domain": names, "range": [entry["shape"] for entry in series]}},
+            "tooltip": [{"field": "serie", "title": "Art"}, {"field": "team", "title": "Team"},
+                        {"field": "x", "title": "x (m)", "format": ".1f"},
+                        {"field": "y", "title": "y (m)", "format": ".1f"}],
+        },
+    })
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "title": {"text": title.split("\n"), "color": '#ffffff', "fontSize": 16},
+        "width": FIELD_WIDTH_PX,
+        "height": FIELD_HEIGHT_PX,
+        "background": '#000000',
+        "view": {"fill": '#1a1a1a', "stroke": None},
+        "datasets": {"events": events, "passes": passes},
+        "encoding": {"x": _X, "y": _Y},
+        "layer": layers,
+        "config": {"legend": {"orient": "bottom-left", "labelColor": '#ffffff', "fillColor": '#000000',
+                              "padding": 6}},
+    }
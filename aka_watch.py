@@ -0,0 +1,208 @@
+"""
+Datei-Watcher für die Team-Dateien.
+
+Meldet Änderungen einzelner Quelldateien ereignisgesteuert (inotify unter Linux,
+ReadDirectoryChangesW unter Windows, FSEvents unter macOS über watchdog). Ist
+watchdog nicht installiert, werden nur die bekannten Quelldateien in kurzen
+Abständen per stat() geprüft.
+
+LiveEventStore hält den aktuellen Event-Store prozessweit und baut bei einem
+Ereignis nur die Segmente der geänderten Dateien neu.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from aka_data import EventStore, build_event_store, file_signature, manifest_dirs, open_event_store
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Fallback auf Polling
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+# Wartezeit nach dem letzten Ereignis, bevor geänderte Dateien gemeldet werden
+# (Editoren schreiben Dateien oft in mehreren Schritten)
+DEBOUNCE_SECONDS = 0.2
+POLL_INTERVAL_SECONDS = 0.5
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Leitet watchdog-Ereignisse für überwachte Dateien an den SourceWatcher weiter."""
+
+    def __init__(self, watcher: "SourceWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        for path in (event.src_path, getattr(event, "dest_path", None)):
+            if path:
+                # Neue/gelöschte Einträge ändern auch den übergeordneten Ordner (neue Teams/Dateien)
+                self.watcher.notify(path)
+                self.watcher.notify(os.path.dirname(path))
+
+
+class SourceWatcher:
+    """
+    Überwacht eine Menge von Dateien und Ordnern und ruft callback(geänderte_pfade) auf.
+    Bei Ordnern zählt das Anlegen, Löschen oder Umbenennen von Einträgen als Änderung.
+    Ereignisse werden gesammelt und nach DEBOUNCE_SECONDS gebündelt gemeldet.
+    """
+
+    def __init__(self, paths: Iterable[str], callback: Callable[[Set[str]], None],
+                 debounce: float = DEBOUNCE_SECONDS, poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.paths: Set[str] = set()
+        self._pending: Set[str] = set()
+        self._last_event = 0.0
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._observer = None
+        self._watched_dirs: Set[str] = set()
+        self._signatures: Dict[str, Optional[List[int]]] = {}
+        self.mode = "watchdog" if Observer is not None else "polling"
+        # Fehler des letzten Callbacks (z.B. fehlgeschlagenes Neu-Einlesen), None wenn ok
+        self.last_error: Optional[str] = None
+        self.set_paths(paths)
+
+    def set_paths(self, paths: Iterable[str]) -> None:
+        """Setzt die überwachten Dateien (z.B. nach dem Hinzufügen eines Teams)."""
+        with self._condition:
+            self.paths = {os.path.abspath(p) for p in paths}
+            self._signatures = {p: self._signatures.get(p, file_signature(p)) for p in self.paths}
+        if self._observer is not None:
+            self._schedule_dirs()
+
+    def notify(self, path: str) -> None:
+        path = os.path.abspath(path)
+        with self._condition:
+            if path not in self.paths:
+                return
+            self._pending.add(path)
+            self._last_event = time.monotonic()
+            self._condition.notify()
+
+    def start(self) -> "SourceWatcher":
+        if Observer is not None:
+            try:
+                self._observer = Observer()
+                self._schedule_dirs()
+                self._observer.daemon = True
+                self._observer.start()
+            except OSError:
+                # z.B. inotify-Limit erreicht -> Polling
+                self._observer = None
+                self.mode = "polling"
+        if self._observer is None:
+            threading.Thread(target=self._poll_loop, name="aka-source-poller", daemon=True).start()
+        threading.Thread(target=self._dispatch_loop, name="aka-source-watcher", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _schedule_dirs(self) -> None:
+        handler = _EventHandler(self)
+        directories = {p for p in self.paths if os.path.isdir(p)}
+        directories |= {os.path.dirname(p) for p in self.paths if not os.path.isdir(p)}
+        for directory in directories - self._watched_dirs:
+            if os.path.isdir(directory):
+                self._observer.schedule(handler, directory, recursive=False)
+                self._watched_dirs.add(directory)
+
+    def _poll_loop(self) -> None:
+        """Fallback: prüft nur die überwachten Dateien per stat()."""
+        while not self._stopped.wait(self.poll_interval):
+            with self._condition:
+                known = dict(self._signatures)
+            for path, previous in known.items():
+                if file_signature(path) != previous:
+                    self.notify(path)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped.is_set():
+                    self._condition.wait()
+                if self._stopped.is_set():
+                    return
+                # Warten, bis für DEBOUNCE_SECONDS keine weiteren Ereignisse eintreffen
+                while time.monotonic() - self._last_event < self.debounce:
+                    self._condition.wait(self.debounce)
+                changed = self._pending
+                self._pending = set()
+
+            current = {p: file_signature(p) for p in changed}
+            with self._condition:
+                changed = {p for p in changed if current[p] != self._signatures.get(p)}
+                for path in changed:
+                    self._signatures[path] = current[path]
+            if changed:
+                try:
+                    self.callback(changed)
+                except Exception as e:
+                    # Ein Fehler im Callback darf den Watcher nicht beenden, wird aber gemeldet
+                    logger.exception("Verarbeitung geänderter Dateien fehlgeschlagen: %s", sorted(changed))
+                    self.last_error = f"{type(e).__name__}: {e}"
+                else:
+                    self.last_error = None
+
+
+class LiveEventStore:
+    """
+    Prozessweiter Event-Store, der sich bei Dateiänderungen selbst aktualisiert.
+
+    version wird bei jeder Änderung erhöht; segment_versions enthält pro
+    Store-Segment (season, team, side) die Version, in der das Segment zuletzt
+    neu eingelesen wurde.
+    Abgeleitete Caches können so gezielt nur für geänderte Teams ungültig werden.
+    """
+
+    def __init__(self, base_path: str = "."):
+        self.base_path = base_path
+        self._lock = threading.Lock()
+        self.store: EventStore = open_event_store(base_path)
+        self.version = 0
+        self.segment_versions: Dict[Tuple[str, str, str], int] = {key: 0 for key in self.store.segments}
+        self.watcher = SourceWatcher(self._source_paths(), self._on_change).start()
+
+    def _source_paths(self) -> List[str]:
+        """
+        Team- und Import-Dateien sowie Datenordner, Saison-Ordner und Team-Ordner
+        (für neu hinzugefügte Teams/Dateien, auch in früheren Saisons).
+        """
+        paths = [self.base_path] + [os.path.join(self.base_path, d) for d in manifest_dirs(self.base_path)]
+        for seg in self.store.segments.values():
+            path = os.path.join(self.base_path, seg["path"])
+            paths += [path, os.path.dirname(path)]
+            if seg.get("import_path"):
+                paths.append(os.path.join(self.base_path, seg["import_path"]))
+        return paths
+
+    def _on_change(self, changed_paths: Set[str]) -> None:
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Liest die Segmente neu ein, deren Quelldatei sich geändert hat (inkl. neuer Teams)."""
+        with self._lock:
+            store = build_event_store(self.base_path, previous=self.store)
+            version = self.version + 1
+            for key, seg in store.segments.items():
+                old = self.store.segments.get(key)
+                if (old is None or old["signature"] != seg["signature"]
+                        or old.get("import_signature") != seg["import_signature"]):
+                    self.segment_versions[key] = version
+            self.store = store
+            self.version = version
+        self.watcher.set_paths(self._source_paths())
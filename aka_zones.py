@@ -0,0 +1,479 @@
+"""
+Zonen-Registry und vektorisierte Zonen-Zuordnung.
+
+Alle Zonen des Spielfelds (Goldene Zone, Zone 14, FDl/FDr, HFAl/HFAr,
+ND2l/ND2r 1/2 und das restliche Spielfeld) sind hier einmal definiert:
+Grenzen, Beschriftungs-Position und Farben. Zählungen, Beschriftungen,
+Zonen-Vorschau und das SQLite-Backend lesen alle aus ZONES.
+
+Die Standard-Zonen teilen das Spielfeld lückenlos auf: classify_zones() ordnet
+jedem Punkt in einem NumPy-Durchlauf genau eine Zonen-Nummer zu (Index in ZONES).
+Eigene Zonen aus der Konfigurationsdatei (zonen.json, Polygone) kommen danach in
+ZONES; sie dürfen sich mit allen anderen Zonen überschneiden, ein Punkt zählt in
+jeder eigenen Zone, die ihn enthält (overlay_membership()). zone_counts() liefert
+die Anzahl für alle Zonen, optional für mehrere Gruppen (z.B. alle Teams) auf einmal.
+
+Für große Datenmengen (Tracking-Daten, Saison-Archive) gibt es ZoneRaster: das
+Spielfeld einmal als Raster von Zonen-Nummern, die Zuordnung ist dann ein
+Array-Index pro Punkt. Das Raster wird aus classify_zones() und
+overlay_membership() erzeugt und ist damit unabhängig von der Form der Zonen.
+
+ZoneHistograms hält die Zählungen pro Segment (Saison, Team, Seite) und passt
+sie bei neuen oder gelöschten Events an, ohne die übrigen Events neu zu zählen.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.colors import is_color_like
+from matplotlib.path import Path as PolygonPath
+
+from aka_data import PITCH_LENGTH, PITCH_WIDTH, SIDES
+
+# Grenzen: (x_min, x_min_inklusiv, x_max, x_max_inklusiv, y_min, y_min_inklusiv, y_max, y_max_inklusiv)
+# Die Rechtecke überschneiden sich nicht: Punkte auf einer gemeinsamen Kante gehören
+# zur weiter innen liegenden Zone (x=14/25/43/54), auf y=84 zentral zur Goldenen Zone
+# und seitlich zu FDl/FDr.
+DEFAULT_ZONES: List[Dict[str, Any]] = [
+    {"name": "Goldene Zone", "key": "goldene_zone", "bounds": (25, True, 43, True, 84, True, 100, True),
+     "label": (34, 100), "highlight": True, "color": "#ffd700", "chart_color": "#ffd700"},
+    {"name": "Zone 14", "key": "rote_zone", "bounds": (25, True, 43, True, 75, True, 84, False),
+     "label": (34, 75), "highlight": True, "color": "#ff4444", "chart_color": "#ff4444"},
+    {"name": "FDl", "key": "zone2", "bounds": (14, True, 25, False, 75, True, 84, True),
+     "label": (19.5, 79.5), "highlight": False, "color": "#ffaa00", "chart_color": "#ffaa00"},
+    {"name": "FDr", "key": "zone3", "bounds": (43, False, 54, True, 75, True, 84, True),
+     "label": (48.5, 79.5), "highlight": False, "color": "#ffaa00", "chart_color": "#ff8800"},
+    {"name": "HFAl", "key": "zone4", "bounds": (0, True, 14, False, 75, True, 90, True),
+     "label": (7, 82.5), "highlight": False, "color": "#ffaa00", "chart_color": "#ff6600"},
+    {"name": "HFAr", "key": "zone5", "bounds": (54, False, 68, True, 75, True, 90, True),
+     "label": (61, 82.5), "highlight": False, "color": "#ffaa00", "chart_color": "#ff4400"},
+    {"name": "ND2l 1/2", "key": "zone6", "bounds": (14, True, 25, False, 84, False, 100, True),
+     "label": (19.5, 92), "highlight": False, "color": "#ffaa00", "chart_color": "#ff2200"},
+    {"name": "ND2r 1/2", "key": "zone7", "bounds": (43, False, 54, True, 84, False, 100, True),
+     "label": (48.5, 92), "highlight": False, "color": "#ffaa00", "chart_color": "#ff0000"},
+    # Alles außerhalb der Zonen oben; "preview" markiert den Bereich in der Zonen-Vorschau
+    {"name": "Restliches Spielfeld", "key": "restliches_spielfeld", "bounds": None,
+     "label": (34, 55), "highlight": False, "color": "#888888", "chart_color": "#888888",
+     "preview": [(0, 0, 68, 75), (0, 90, 14, 10), (54, 90, 14, 10)]},
+]
+
+# Eigene Zonen (Polygone), relativ zum Arbeitsverzeichnis des Dashboards
+ZONE_CONFIG_FILE = os.environ.get("AKA_ZONES_FILE", "zonen.json")
+# Das Raster speichert die Zugehörigkeit zu eigenen Zonen als 64-Bit-Maske
+MAX_OVERLAY_ZONES = 64
+# Farben für eigene Zonen ohne "color"
+OVERLAY_COLORS = ["#00aaff", "#aa66ff", "#00ddcc", "#ff66cc", "#66ff66", "#ffffff"]
+
+# Datenarten der Zonen-Statistik (Achse 2 von zone_stats()["counts"])
+DATA_TYPES = ("goals", "assists")
+
+# Raster-Auflösung in Metern (muss 1 m ganzzahlig teilen)
+RASTER_RESOLUTION = 0.1
+# Ab dieser Punktzahl zählt zone_counts() über das Raster statt über die Zonen-Grenzen
+RASTER_MIN_POINTS = 50000
+# Raster-Zelle, die von einer Zonengrenze geschnitten wird: Punkte darin werden exakt geprüft
+AMBIGUOUS = -1
+
+
+def _parse_pair(value: Any) -> Tuple[float, float]:
+    """Ein Punkt [x, y] aus der Konfiguration (ValueError bei ungültigen Werten)."""
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise ValueError(f"Punkt {value!r} ist kein [x, y]")
+    x, y = (float(v) for v in value)
+    if not (np.isfinite(x) and np.isfinite(y)):
+        raise ValueError(f"Punkt {value!r} ist keine endliche Koordinate")
+    return x, y
+
+
+def load_zone_config(path: str, reserved: Sequence[str] = ()) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Liest eigene Zonen aus einer JSON-Datei:
+
+        {"zones": [{"name": "Halbraum links", "polygon": [[14, 50], [25, 50], [25, 100], [14, 100]],
+                    "color": "#00aaff", "label": [19.5, 60]}]}
+
+    "color" und "label" sind optional (Standard: Farbpalette bzw. Mittelpunkt
+    der Eckpunkte). Ungültige Zonen werden übersprungen und als Fehlermeldung
+    zurückgegeben; fehlt die Datei, gibt es keine eigenen Zonen.
+    """
+    if not os.path.exists(path):
+        return [], []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        return [], [f"{path}: {e}"]
+    entries = config.get("zones") if isinstance(config, dict) else None
+    if not isinstance(entries, list):
+        return [], [f"{path}: Eintrag \"zones\" (Liste) fehlt"]
+
+    zones: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    names = set(reserved)
+    for i, entry in enumerate(entries, start=1):
+        name = entry.get("name") if isinstance(entry, dict) else None
+        where = f"{path}: Zone {i}" + (f" ({name})" if isinstance(name, str) and name else "")
+        try:
+            if not isinstance(name, str) or not name.strip():
+                raise ValueError("\"name\" fehlt")
+            if name in names:
+                raise ValueError("Name ist bereits vergeben")
+            polygon = entry.get("polygon")
+            if not isinstance(polygon, list) or len(polygon) < 3:
+                raise ValueError("\"polygon\" braucht mindestens 3 Eckpunkte")
+            vertices = [_parse_pair(point) for point in polygon]
+            color = entry.get("color", OVERLAY_COLORS[len(zones) % len(OVERLAY_COLORS)])
+            if not is_color_like(color):
+                raise ValueError(f"Farbe {color!r} unbekannt")
+            label = _parse_pair(entry["label"]) if "label" in entry else tuple(np.mean(vertices, axis=0).tolist())
+        except (TypeError, ValueError) as e:
+            errors.append(f"{where}: {e}")
+            continue
+        if len(zones) == MAX_OVERLAY_ZONES:
+            errors.append(f"{where}: mehr als {MAX_OVERLAY_ZONES} eigene Zonen")
+            break
+        names.add(name)
+        zones.append({"name": name, "key": name, "bounds": None, "polygon": vertices,
+                      "label": label, "highlight": False, "color": color, "chart_color": color})
+    return zones, errors
+
+
+OVERLAY_ZONES, ZONE_CONFIG_ERRORS = load_zone_config(ZONE_CONFIG_FILE, [zone["name"] for zone in DEFAULT_ZONES])
+ZONES: List[Dict[str, Any]] = DEFAULT_ZONES + OVERLAY_ZONES
+
+REST_ZONE = DEFAULT_ZONES[-1]["name"]
+REST_ID = len(DEFAULT_ZONES) - 1
+# Zonen-Nummern 0..PARTITION_SIZE-1: Standard-Zonen, danach eigene Zonen
+PARTITION_SIZE = len(DEFAULT_ZONES)
+ZONE_NAMES = [zone["name"] for zone in ZONES]
+ZONE_IDS = {zone["name"]: i for i, zone in enumerate(ZONES)}
+ZONE_BY_NAME = {zone["name"]: zone for zone in ZONES}
+
+# Grenzen der Rechteck-Zonen als Spalten für den Broadcast in classify_zones
+_RECT_BOUNDS = np.array([zone["bounds"] for zone in DEFAULT_ZONES[:REST_ID]], dtype=np.float64)
+_OVERLAY_PATHS = [PolygonPath(zone["polygon"]) for zone in OVERLAY_ZONES]
+
+
+def as_points(points: Any) -> np.ndarray:
+    """Punkte (Liste, Tuple oder Array von (x, y)) als float-Array der Form (n, 2)."""
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def classify_zones(points: Any) -> np.ndarray:
+    """
+    Zonen-Nummer der Standard-Zonen für jeden Punkt; Punkte außerhalb aller
+    Rechtecke erhalten REST_ID. Ein Broadcast über alle Punkte und Zonen.
+    """
+    xy = as_points(points)
+    x, y = xy[:, :1], xy[:, 1:]
+    b = _RECT_BOUNDS
+    inside = (np.where(b[:, 1] > 0, x >= b[:, 0], x > b[:, 0])
+              & np.where(b[:, 3] > 0, x <= b[:, 2], x < b[:, 2])
+              & np.where(b[:, 5] > 0, y >= b[:, 4], y > b[:, 4])
+              & np.where(b[:, 7] > 0, y <= b[:, 6], y < b[:, 6]))
+    # Erste passende Zone gewinnt; ohne Treffer: restliches Spielfeld
+    ids = np.argmax(inside, axis=1)
+    ids[~inside.any(axis=1)] = REST_ID
+    return ids.astype(np.int8)
+
+
+def overlay_membership(points: Any) -> np.ndarray:
+    """Zugehörigkeit zu den eigenen Zonen: bool-Array (n, len(OVERLAY_ZONES))."""
+    xy = as_points(points)
+    member = np.zeros((len(xy), len(_OVERLAY_PATHS)), dtype=bool)
+    for j, path in enumerate(_OVERLAY_PATHS):
+        member[:, j] = path.contains_points(xy)
+    return member
+
+
+def _membership_bits(member: np.ndarray) -> np.ndarray:
+    """Zugehörigkeits-Matrix als uint64-Bitmaske pro Punkt."""
+    bits = np.zeros(len(member), dtype=np.uint64)
+    for j in range(member.shape[1]):
+        bits[member[:, j]] |= np.uint64(1) << np.uint64(j)
+    return bits
+
+
+class ZoneRaster:
+    """
+    Vorberechnetes Raster der Zonen-Nummern über das Spielfeld.
+
+    Zelle (i, j) deckt [i, i+1) x [j, j+1) in Rastereinheiten ab. Ihr Wert wird
+    an 3 x 3 Stützpunkten (Ecken, Kantenmitten, Mitte) mit classify_zones()
+    bestimmt, die eigenen Zonen als Bitmaske aus overlay_membership(); liefern
+    die Stützpunkte verschiedene Werte, liegt eine Zonengrenze in der Zelle und
+    sie wird als AMBIGUOUS markiert. Punkte in solchen Zellen und außerhalb des
+    Spielfelds werden exakt nachgeprüft, das Ergebnis ist damit identisch zur
+    direkten Prüfung.
+    """
+
+    def __init__(self, resolution: float = RASTER_RESOLUTION,
+                 width: float = PITCH_WIDTH, length: float = PITCH_LENGTH):
+        scale = round(1 / resolution)
+        if scale < 1 or abs(scale * resolution - 1) > 1e-9:
+            raise ValueError(f"Raster-Auflösung {resolution} m teilt 1 m nicht ganzzahlig")
+        self.resolution = resolution
+        self.scale = scale
+        # Eine Zelle mehr als nötig, damit Punkte genau auf der Seiten-/Torlinie im Raster liegen
+        nx, ny = int(round(width * scale)) + 1, int(round(length * scale)) + 1
+        # Stützpunkte im Abstand einer halben Zelle; Koordinaten als Bruch, damit
+        # Gitterpunkte exakt auf ganzen Metern liegen (84 statt 84.00000000000001)
+        xs = np.arange(2 * nx + 1) / (2 * scale)
+        ys = np.arange(2 * ny + 1) / (2 * scale)
+        gx, gy = np.meshgrid(xs, ys, indexing="ij")
+        sample_points = np.column_stack((gx.ravel(), gy.ravel()))
+        samples = classify_zones(sample_points).reshape(gx.shape)
+        sample_bits = _membership_bits(overlay_membership(sample_points)).reshape(gx.shape)
+
+        def mixed(values: np.ndarray) -> np.ndarray:
+            windows = [values[dx:dx + 2 * nx:2, dy:dy + 2 * ny:2] for dx in range(3) for dy in range(3)]
+            return np.min(windows, axis=0) != np.max(windows, axis=0)
+
+        grid = samples[1::2, 1::2].copy()
+        grid[mixed(samples) | mixed(sample_bits)] = AMBIGUOUS
+        self.grid = grid
+        self.overlay_bits = sample_bits[1::2, 1::2].copy()
+        # Rand aus AMBIGUOUS-Zellen: Punkte außerhalb landen dort und werden exakt geprüft
+        self._padded = np.pad(grid, 1, constant_values=AMBIGUOUS)
+        self._padded_bits = np.pad(self.overlay_bits, 1)
+
+    def lookup(self, points: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Zonen-Nummer und Zugehörigkeit zu eigenen Zonen (wie overlay_membership) per Raster-Index."""
+        xy = as_points(points)
+        cells = np.floor(xy * self.scale)
+        np.nan_to_num(cells, copy=False, nan=-1)
+        np.clip(cells, -1, self.grid.shape, out=cells)
+        cells += 1
+        cells = cells.astype(np.intp)
+        ids = self._padded[cells[:, 0], cells[:, 1]]
+        member = np.zeros((len(xy), len(_OVERLAY_PATHS)), dtype=bool)
+        if _OVERLAY_PATHS:
+            bits = self._padded_bits[cells[:, 0], cells[:, 1]]
+            for j in range(len(_OVERLAY_PATHS)):
+                member[:, j] = (bits >> np.uint64(j)) & np.uint64(1)
+        exact = ids == AMBIGUOUS
+        if exact.any():
+            ids[exact] = classify_zones(xy[exact])
+            member[exact] = overlay_membership(xy[exact])
+        return ids, member
+
+    def classify(self, points: Any) -> np.ndarray:
+        """Zonen-Nummer für jeden Punkt per Raster-Index (wie classify_zones)."""
+        return self.lookup(points)[0]
+
+
+_rasters: Dict[float, ZoneRaster] = {}
+_rasters_lock = threading.Lock()
+
+
+def get_zone_raster(resolution: float = RASTER_RESOLUTION) -> ZoneRaster:
+    """Zonen-Raster einer Auflösung (wird beim ersten Aufruf einmal erzeugt)."""
+    with _rasters_lock:
+        if resolution not in _rasters:
+            _rasters[resolution] = ZoneRaster(resolution)
+        return _rasters[resolution]
+
+
+def zone_membership(points: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Zonen-Nummer der Standard-Zonen (int64) und Zugehörigkeit zu den eigenen Zonen
+    (bool-Array) pro Punkt; ab RASTER_MIN_POINTS über das Zonen-Raster.
+    """
+    xy = as_points(points)
+    if len(xy) >= RASTER_MIN_POINTS:
+        ids, member = get_zone_raster().lookup(xy)
+    else:
+        ids, member = classify_zones(xy), overlay_membership(xy)
+    return ids.astype(np.int64), member
+
+
+def zone_counts(points: Any, groups: Optional[Sequence[int]] = None, n_groups: int = 1) -> np.ndarray:
+    """
+    Anzahl Punkte pro Zone (Länge len(ZONES)). Mit groups (Gruppen-Nummer pro
+    Punkt, z.B. Team-Index) ein Array (n_groups, len(ZONES)) für alle Gruppen.
+    """
+    ids, member = zone_membership(points)
+    if groups is None:
+        return np.concatenate((np.bincount(ids, minlength=PARTITION_SIZE), member.sum(axis=0)))
+    groups = np.asarray(groups, dtype=np.int64)
+    counts = np.zeros((n_groups, len(ZONES)), dtype=np.int64)
+    counts[:, :PARTITION_SIZE] = np.bincount(groups * PARTITION_SIZE + ids,
+                                             minlength=n_groups * PARTITION_SIZE).reshape(n_groups, PARTITION_SIZE)
+    for j in range(member.shape[1]):
+        counts[:, PARTITION_SIZE + j] = np.bincount(groups[member[:, j]], minlength=n_groups)
+    return counts
+
+
+def grouped_zone_counts(point_sets: Sequence[Any]) -> np.ndarray:
+    """Zonen-Zählung für mehrere Punktmengen (z.B. ein Eintrag pro Team) in einem Durchlauf."""
+    arrays = [as_points(points) for points in point_sets]
+    sizes = [len(points) for points in arrays]
+    stacked = np.concatenate(arrays) if arrays else np.empty((0, 2))
+    groups = np.repeat(np.arange(len(arrays)), sizes)
+    return zone_counts(stacked, groups, len(arrays))
+
+
+def zone_count(points: Any, zone_name: str) -> int:
+    """Anzahl Punkte in einer Zone."""
+    return int(zone_counts(points)[ZONE_IDS[zone_name]])
+
+
+def percentages_from_counts(counts: Sequence[int], total: int) -> Dict[str, float]:
+    """Prozentanteil pro Zone aus Zählungen, nach Zonen-Schlüssel ("goldene_zone", ...), plus "total"."""
+    result = {zone["key"]: (count / total * 100) if total > 0 else 0 for zone, count in zip(ZONES, list(counts))}
+    result["total"] = total
+    return result
+
+
+def percentages_by_zone(points: Any) -> Dict[str, float]:
+    """Prozentanteil pro Zone, nach Zonen-Schlüssel ("goldene_zone", ...), plus "total"."""
+    counts = zone_counts(points)
+    return percentages_from_counts(counts.tolist(), int(counts[:PARTITION_SIZE].sum()))
+
+
+def make_zone_stats(teams: List[str], counts: np.ndarray, totals: np.ndarray) -> Dict[str, Any]:
+    """Zonen-Statistik aus Zählungen (Teams x Seiten x Datenarten x Zonen) und Gesamtzahlen."""
+    percentages = np.divide(counts * 100.0, totals[..., None], out=np.zeros(counts.shape),
+                            where=totals[..., None] > 0)
+    return {"teams": list(teams), "sides": list(SIDES), "data_types": list(DATA_TYPES), "zones": list(ZONE_NAMES),
+            "counts": counts, "totals": totals, "percentages": percentages}
+
+
+def zone_stats(teams_data: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Zonen-Statistik aller Teams in einem Durchlauf: "counts" und "percentages"
+    haben die Form (Teams, Seiten, Datenarten, Zonen), "totals" (Teams, Seiten,
+    Datenarten); die Achsen-Beschriftungen stehen unter "teams", "sides",
+    "data_types" und "zones".
+    """
+    teams = list(teams_data)
+    point_sets = [teams_data[team][side][data_type] for team in teams for side in SIDES for data_type in DATA_TYPES]
+    shape = (len(teams), len(SIDES), len(DATA_TYPES))
+    counts = grouped_zone_counts(point_sets).reshape(shape + (len(ZONES),))
+    totals = np.array([len(points) for points in point_sets], dtype=np.int64).reshape(shape)
+    return make_zone_stats(teams, counts, totals)
+
+
+def select_zone_stats(stats: Dict[str, Any], side: str, data_type: str,
+                      team: Optional[str] = None) -> Tuple[np.ndarray, int]:
+    """
+    Zählungen pro Zone und Gesamtzahl aus zone_stats() für eine Seite.
+    team=None summiert über alle Teams, data_type="both" über Tore und Assists.
+    """
+    team_index = slice(None) if team is None else stats["teams"].index(team)
+    type_index = slice(None) if data_type == "both" else stats["data_types"].index(data_type)
+    side_index = stats["sides"].index(side)
+    counts = stats["counts"][team_index, side_index, type_index]
+    totals = stats["totals"][team_index, side_index, type_index]
+    return counts.reshape(-1, len(stats["zones"])).sum(axis=0), int(np.sum(totals))
+
+
+class ZoneHistograms:
+    """
+    Zonen-Zählungen pro Segment (Saison, Team, Seite) und Datenart, inkrementell gepflegt.
+
+    append() zählt nur die neuen Punkte, truncate() zieht die entfernten ab; update()
+    vergleicht die neuen Punkte eines Segments mit den gespeicherten und zählt nur ab
+    der ersten Abweichung neu (ein neues Tor am Ende der Liste: ein Punkt). sync()
+    gleicht alle geänderten Segmente eines Event-Stores ab. Die Zonen-Definitionen
+    werden nur beim Import geladen (zonen.json), Änderungen gelten nach einem Neustart.
+    """
+
+    def __init__(self):
+        self.generation = None
+        # (Saison, Team, Seite, Datenart) -> Punkte-Puffer, Anzahl, Zählung pro Zone
+        self._buffers: Dict[Tuple[str, str, str, str], np.ndarray] = {}
+        self._sizes: Dict[Tuple[str, str, str, str], int] = {}
+        self._counts: Dict[Tuple[str, str, str, str], np.ndarray] = {}
+        self._signatures: Dict[Tuple[str, str, str], Any] = {}
+        self._lock = threading.RLock()
+
+    def points(self, key: Tuple[str, str, str], data_type: str) -> np.ndarray:
+        """Gespeicherte Punkte eines Segments (View auf den Puffer)."""
+        cell = key + (data_type,)
+        return self._buffers.get(cell, np.empty((0, 2)))[:self._sizes.get(cell, 0)]
+
+    def counts(self, key: Tuple[str, str, str], data_type: str) -> np.ndarray:
+        """Zählung pro Zone (Länge len(ZONES)) eines Segments."""
+        return self._counts.get(key + (data_type,), np.zeros(len(ZONES), dtype=np.int64))
+
+    def append(self, key: Tuple[str, str, str], data_type: str, points: Any) -> None:
+        """Fügt Punkte am Ende eines Segments hinzu (Aufwand nur für die neuen Punkte)."""
+        new = as_points(points)
+        cell = key + (data_type,)
+        with self._lock:
+            size = self._sizes.get(cell, 0)
+            buffer = self._buffers.get(cell, np.empty((0, 2)))
+            if size + len(new) > len(buffer):
+                # Puffer verdoppeln, damit einzelne Events im Mittel O(1) angehängt werden
+                grown = np.empty((max(2 * len(buffer), size + len(new), 16), 2))
+                grown[:size] = buffer[:size]
+                buffer = self._buffers[cell] = grown
+            buffer[size:size + len(new)] = new
+            self._sizes[cell] = size + len(new)
+            self._counts[cell] = self.counts(key, data_type) + zone_counts(new)
+
+    def truncate(self, key: Tuple[str, str, str], data_type: str, size: int) -> None:
+        """Entfernt alle Punkte ab Position size und zieht sie von der Zählung ab."""
+        cell = key + (data_type,)
+        with self._lock:
+            removed = self.points(key, data_type)[size:]
+            if len(removed):
+                self._counts[cell] = self.counts(key, data_type) - zone_counts(removed)
+                self._sizes[cell] = size
+
+    def update(self, key: Tuple[str, str, str], data_type: str, points: Any) -> None:
+        """Setzt die Punkte eines Segments; neu gezählt wird nur ab der ersten Abweichung."""
+        new = as_points(points)
+        with self._lock:
+            old = self.points(key, data_type)
+            common = min(len(old), len(new))
+            # Vergleich der Bitmuster (NaN-Punkte gelten so als unverändert)
+            differs = np.flatnonzero(np.any(old[:common].view(np.int64) != new[:common].view(np.int64), axis=1))
+            prefix = int(differs[0]) if len(differs) else common
+            self.truncate(key, data_type, prefix)
+            self.append(key, data_type, new[prefix:])
+
+    def remove(self, key: Tuple[str, str, str]) -> None:
+        """Entfernt ein Segment (z.B. gelöschte Team-Datei)."""
+        with self._lock:
+            for data_type in DATA_TYPES:
+                cell = key + (data_type,)
+                for table in (self._buffers, self._sizes, self._counts):
+                    table.pop(cell, None)
+            self._signatures.pop(key, None)
+
+    def sync(self, store: Any) -> None:
+        """Gleicht die Histogramme mit einem Event-Store ab (nur geänderte Segmente)."""
+        with self._lock:
+            if self.generation == store.generation:
+                return
+            for key in set(self._signatures) - set(store.segments):
+                self.remove(key)
+            for key, seg in store.segments.items():
+                signature = (seg["signature"], seg.get("import_signature"))
+                if self._signatures.get(key) == signature:
+                    continue
+                season, team, side = key
+                self.update(key, "goals", store.goals(team, side, season))
+                self.update(key, "assists", store.assists(team, side, season))
+                self._signatures[key] = signature
+            self.generation = store.generation
+
+    def zone_stats(self, teams: List[str], season: Optional[str] = None) -> Dict[str, Any]:
+        """Zonen-Statistik wie zone_stats() aus den Histogrammen (season=None: alle Saisons)."""
+        shape = (len(teams), len(SIDES), len(DATA_TYPES))
+        counts = np.zeros(shape + (len(ZONES),), dtype=np.int64)
+        totals = np.zeros(shape, dtype=np.int64)
+        team_pos = {team: i for i, team in enumerate(teams)}
+        with self._lock:
+            for seg_season, team, side in self._signatures:
+                if team not in team_pos or (season is not None and seg_season != season):
+                    continue
+                for k, data_type in enumerate(DATA_TYPES):
+                    pos = (team_pos[team], SIDES.index(side), k)
+                    counts[pos] += self.counts((seg_season, team, side), data_type)
+                    totals[pos] += self._sizes.get((seg_season, team, side, data_type), 0)
+        return make_zone_stats(teams, counts, totals)
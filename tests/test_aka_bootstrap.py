@@ -0,0 +1,69 @@
+import numpy as np
+
+from aka_bootstrap import select_zone_intervals, zone_bootstrap
+from aka_zones import PARTITION_SIZE, ZONE_IDS, ZONES
+
+GOLDEN = (34, 90)
+REST = (34, 40)
+
+
+def team(goals=(), assists=(), conceded=()):
+    empty = np.empty((0, 2))
+    return {"eigene_tore": {"goals": np.array(goals, dtype=float).reshape(-1, 2),
+                            "assists": np.array(assists, dtype=float).reshape(-1, 2)},
+            "gegentore": {"goals": np.array(conceded, dtype=float).reshape(-1, 2), "assists": empty}}
+
+
+# 20 von 29 Toren in der Goldenen Zone (69,0%), Beispiel aus dem README
+TEAMS = {"U18": team(goals=[GOLDEN] * 20 + [REST] * 9, assists=[(30, 80)] * 5 + [REST] * 5,
+                     conceded=[GOLDEN] * 3),
+         "U16": team(goals=[GOLDEN] * 2 + [REST] * 8)}
+
+
+def test_zone_bootstrap_shapes():
+    bootstrap = zone_bootstrap(TEAMS, resamples=500)
+    assert bootstrap["teams"] == ["U18", "U16"]
+    assert bootstrap["totals"].shape == (2, 2, 2)
+    assert bootstrap["resampled"].shape == (500, 2, 2, 2, len(ZONES))
+    assert bootstrap["totals"][0, 0].tolist() == [29, 10]
+    # Jede Stichprobe zieht genau so viele Punkte wie die Gruppe hat (Standard-Zonen teilen das Feld auf)
+    np.testing.assert_array_equal(bootstrap["resampled"][..., :PARTITION_SIZE].sum(axis=-1),
+                                  np.broadcast_to(bootstrap["totals"], (500, 2, 2, 2)))
+    lower, upper = select_zone_intervals(bootstrap, "eigene_tore", "goals", "U18")
+    assert lower.shape == upper.shape == (len(ZONES),)
+    assert np.all(lower <= upper)
+
+
+def test_zone_bootstrap_is_reproducible():
+    first = zone_bootstrap(TEAMS)
+    second = zone_bootstrap(TEAMS)
+    np.testing.assert_array_equal(first["resampled"], second["resampled"])
+    np.testing.assert_array_equal(select_zone_intervals(first, "eigene_tore", "goals", "U18"),
+                                  select_zone_intervals(second, "eigene_tore", "goals", "U18"))
+
+
+def test_zone_interval_brackets_observed_share():
+    lower, upper = select_zone_intervals(zone_bootstrap(TEAMS), "eigene_tore", "goals", "U18")
+    golden = ZONE_IDS["Goldene Zone"]
+    observed = 20 / 29 * 100
+    assert lower[golden] < observed < upper[golden]
+    # Fester Startwert: 15 bis 24 von 29 Toren (vgl. README: "69.0%" mit "52–86%" bei 29 Toren der U15)
+    np.testing.assert_allclose([lower[golden], upper[golden]], [15 / 29 * 100, 24 / 29 * 100])
+    # Zonen ohne Tore: Intervall [0, 0]
+    assert lower[ZONE_IDS["Zone 14"]] == upper[ZONE_IDS["Zone 14"]] == 0
+
+
+def test_zone_intervals_pool_teams_and_data_types():
+    bootstrap = zone_bootstrap(TEAMS)
+    # U16 hat keine Gegentore: "Alle Teams" entspricht dort genau U18
+    np.testing.assert_array_equal(select_zone_intervals(bootstrap, "gegentore", "goals"),
+                                  select_zone_intervals(bootstrap, "gegentore", "goals", "U18"))
+    # Geschichtet: die Summe der Stichproben beider Teams, geteilt durch 39 Tore
+    resampled = bootstrap["resampled"][:, :, 0, 0, ZONE_IDS["Goldene Zone"]].sum(axis=1) * 100.0 / 39
+    lower, upper = select_zone_intervals(bootstrap, "eigene_tore", "goals")
+    np.testing.assert_allclose([lower[ZONE_IDS["Goldene Zone"]], upper[ZONE_IDS["Goldene Zone"]]],
+                               np.percentile(resampled, [2.5, 97.5]))
+    lower, upper = select_zone_intervals(bootstrap, "eigene_tore", "both", "U18")
+    assert upper[ZONE_IDS["Zone 14"]] > 0  # Assists in Zone 14 zählen bei "both" mit
+    empty_lower, empty_upper = select_zone_intervals(zone_bootstrap({"U15": team()}), "eigene_tore", "goals")
+    assert not empty_lower.any() and not empty_upper.any()
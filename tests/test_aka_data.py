@@ -0,0 +1,33 @@
+import json
+
+import numpy as np
+
+from aka_data import build_event_store
+
+TEAM_FILE = """\
+import matplotlib.pyplot as plt
+
+goals = [(22, 98), (30, 90), (34, 95)]
+assists = [(10, 80), (12, 85)]
+
+plt.title("Eigene Tore U18")
+"""
+
+
+def test_import_pairs_stay_aligned_with_unequal_file_lists(tmp_path):
+    team_dir = tmp_path / "U18"
+    team_dir.mkdir()
+    (team_dir / "EigeneToreU18.py").write_text(TEAM_FILE, encoding="utf-8")
+    (team_dir / "EigeneToreU18.import.jsonl").write_text(
+        json.dumps({"goal": [25, 92], "assist": [20, 80]}) + "\n", encoding="utf-8")
+
+    store = build_event_store(str(tmp_path))
+
+    pairs = store.pairs("U18", "eigene_tore")
+    assert pairs.tolist()[-1] == [25, 92, 20, 80]
+    assert [34, 95, 20, 80] not in pairs.tolist()
+
+    goals = store.goals("U18", "eigene_tore")
+    assists = store.assists("U18", "eigene_tore")
+    assert len(goals) == 4 and len(assists) == 3
+    assert not np.isnan(goals).any() and not np.isnan(assists).any()
@@ -0,0 +1,43 @@
+from aka_figures import ImageCache, new_figure
+
+
+def test_image_cache_evicts_least_recently_used_within_budget():
+    cache = ImageCache(max_bytes=25)
+    cache.put("a", b"a" * 10)
+    cache.put("b", b"b" * 10)
+    assert cache.get("a") == b"a" * 10  # "a" zuletzt benutzt, "b" wird zuerst verdrängt
+
+    cache.put("c", b"c" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a" * 10 and cache.get("c") == b"c" * 10
+    assert cache.stats() == {"entries": 2, "bytes": 20, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_image_cache_replaces_key_and_skips_images_over_budget():
+    cache = ImageCache(max_bytes=25)
+    cache.put("a", b"a" * 10)
+    cache.put("a", b"A" * 20)
+    cache.put("big", b"x" * 26)
+
+    assert cache.get("a") == b"A" * 20
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] == 20 and cache.stats()["evictions"] == 0
+
+
+def test_get_or_render_builds_only_on_miss():
+    cache = ImageCache()
+    built = []
+
+    def build():
+        built.append(1)
+        fig, ax = new_figure((1, 1))
+        ax.plot([0, 1], [0, 1])
+        return fig
+
+    first = cache.get_or_render(("key",), build)
+    second = cache.get_or_render(("key",), build)
+
+    assert first == second and first.startswith(b"\x89PNG")
+    assert len(built) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
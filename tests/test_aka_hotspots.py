@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from aka_hotspots import HOTSPOT_RADIUS, HOTSPOT_RESOLUTION, cluster_labels, team_hotspots
+
+CLUSTER_A = [(34, 90), (35, 90), (34, 91), (33, 90), (34, 89)]
+CLUSTER_B = [(10, 40), (11, 40), (10, 41), (11, 41)]
+# Genau HOTSPOT_RADIUS vom Rand von A (35, 90) entfernt: Randpunkt von A
+EDGE_POINT = (38, 90)
+# 3,5 m vom nächsten Punkt von A (34, 89) entfernt und weitere Einzelpunkte: kein Hotspot
+NOISE = [(34, 85.5), (60, 10), (50, 60), (20, 70)]
+
+
+def test_team_hotspots_two_clusters_with_noise():
+    goals = np.array(CLUSTER_A + [EDGE_POINT] + CLUSTER_B + NOISE, dtype=float)
+    teams_data = {"U18": {"eigene_tore": {"goals": goals, "assists": np.empty((0, 2))},
+                          "gegentore": {"goals": np.empty((0, 2)), "assists": np.empty((0, 2))}}}
+
+    hotspots = team_hotspots(teams_data, "eigene_tore")
+
+    assert hotspots["assists"] == []
+    assert [h["count"] for h in hotspots["goals"]] == [6, 4]
+    a, b = hotspots["goals"]
+    assert a["center"] == pytest.approx((208 / 6, 90))
+    assert a["bounds"] == (33, 89, 38, 91)
+    assert b["center"] == pytest.approx((10.5, 40.5))
+    assert b["bounds"] == (10, 40, 11, 41)
+    assert a["share"] == pytest.approx(6 / 14 * 100)
+    with pytest.raises(ValueError):
+        team_hotspots(teams_data, "heim")
+
+
+def pairwise_labels(points, radius, min_points):
+    """Referenz: DBSCAN mit paarweisen Abständen auf den gerundeten Punkten (O(n²))."""
+    rounded = np.round(points / HOTSPOT_RESOLUTION) * HOTSPOT_RESOLUTION
+    near = np.linalg.norm(rounded[:, None] - rounded[None], axis=2) <= radius
+    core = near.sum(axis=1) >= min_points
+    labels = np.full(len(points), -1)
+    for start in np.flatnonzero(core):
+        if labels[start] >= 0:
+            continue
+        labels[start] = start
+        stack = [start]
+        while stack:
+            for j in np.flatnonzero(near[stack.pop()] & core & (labels < 0)):
+                labels[j] = start
+                stack.append(j)
+    border = ~core & (near[:, core].any(axis=1))
+    return core, border, labels
+
+
+def test_cluster_labels_match_pairwise_check():
+    rng = np.random.default_rng(19)
+    centers = rng.uniform([5, 5], [63, 95], (6, 2))
+    points = np.concatenate([rng.normal(c, 1.5, (25, 2)) for c in centers] + [rng.uniform([0, 0], [68, 100], (60, 2))])
+
+    labels = cluster_labels(points, HOTSPOT_RADIUS, 5)
+    core, border, reference = pairwise_labels(points, HOTSPOT_RADIUS, 5)
+
+    # Gleiche Zuordnung der Kernpunkte (bis auf die Nummerierung), Randpunkte in einem Hotspot, Rest ohne
+    pairs = set(zip(labels[core].tolist(), reference[core].tolist()))
+    assert len(pairs) == len(set(labels[core].tolist())) == len(set(reference[core].tolist()))
+    assert (labels[border] >= 0).all()
+    assert (labels[~core & ~border] == -1).all()
@@ -0,0 +1,61 @@
+import json
+import time
+
+import numpy as np
+
+from aka_data import SIDES, build_event_store
+from aka_sqlite import SqliteEventIndex
+from aka_zones import zone_stats
+
+# Randpunkte der Zonen, Ecken-Assists (0/100 bzw. 68/100) und ein Tor ohne Assist
+OWN_GOALS = [(34, 84), (34, 90), (25, 75), (14, 84), (50, 88), (34, 95), (60, 40)]
+OWN_ASSISTS = [(0, 100), (30, 80), (68, 100), (54, 90), (0.5, 99.5), (10, 60)]
+CONCEDED_GOALS = [(43, 84), (30, 99), (20, 80)]
+CONCEDED_ASSISTS = [(68, 99), (34, 60), (0, 100)]
+
+
+def write_team(directory, team, own, conceded):
+    directory.mkdir(parents=True)
+    for prefix, (goals, assists) in (("EigeneTore", own), ("Gegentore", conceded)):
+        (directory / f"{prefix}{team}.py").write_text(f"goals = {goals!r}\nassists = {assists!r}\n", encoding="utf-8")
+
+
+def build_store(tmp_path):
+    write_team(tmp_path / "U18", "U18", (OWN_GOALS, OWN_ASSISTS), (CONCEDED_GOALS, CONCEDED_ASSISTS))
+    # Import an eine Team-Datei mit mehr Toren als Assists: Ecken-Assist gehört zum importierten Tor
+    (tmp_path / "U18" / "EigeneToreU18.import.jsonl").write_text(
+        json.dumps({"goal": [40, 92], "assist": [68, 100]}) + "\n", encoding="utf-8")
+    write_team(tmp_path / "2024-25" / "U16", "U16", (CONCEDED_GOALS, CONCEDED_ASSISTS), (OWN_GOALS, OWN_ASSISTS))
+    return build_event_store(str(tmp_path))
+
+
+def test_sqlite_zone_stats_and_corners_match_memory(tmp_path):
+    store = build_store(tmp_path)
+    index = SqliteEventIndex(str(tmp_path / "events.sqlite"))
+    index.sync(store)
+
+    for season in [None] + store.seasons:
+        teams_data = store.teams_data(season)
+        expected = zone_stats(teams_data)
+        actual = index.zone_stats(list(teams_data), season)
+        np.testing.assert_array_equal(actual["counts"], expected["counts"])
+        np.testing.assert_array_equal(actual["totals"], expected["totals"])
+        for team in teams_data:
+            for side in SIDES:
+                goals, assists = index.corner_pairs(side, team, season)
+                np.testing.assert_array_equal(np.hstack((goals, assists)),
+                                              store.pairs(team, side, season, set_piece="Ecke"))
+
+    goals, assists = index.corner_pairs("eigene_tore", "U18")
+    assert [40, 92, 68, 100] in np.hstack((goals, assists)).tolist()
+
+
+def test_sqlite_request_sync_runs_in_background(tmp_path):
+    store = build_store(tmp_path)
+    index = SqliteEventIndex(str(tmp_path / "events.sqlite"))
+    index.request_sync(store)
+    deadline = time.monotonic() + 10
+    while index.generation != store.generation and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert index.generation == store.generation and index.last_error is None
+    assert index.total("goals", "eigene_tore", "U18") == len(OWN_GOALS) + 1
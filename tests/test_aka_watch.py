@@ -0,0 +1,37 @@
+import time
+
+import aka_watch
+from aka_watch import LiveEventStore
+
+TEAM_FILE = "goals = [(34, 90)]\nassists = [(30, 80)]\n"
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_new_squad_in_existing_season_folder_is_picked_up(tmp_path, monkeypatch):
+    # Polling statt watchdog: unabhängig von inotify-Limits der Testumgebung
+    monkeypatch.setattr(aka_watch, "Observer", None)
+    season_dir = tmp_path / "2024-25"
+    (season_dir / "U15").mkdir(parents=True)
+    (season_dir / "U15" / "EigeneToreU15.py").write_text(TEAM_FILE, encoding="utf-8")
+    live = LiveEventStore(str(tmp_path))
+    try:
+        assert live.watcher.mode == "polling"
+        assert str(season_dir) in live.watcher.paths
+
+        (season_dir / "U14").mkdir()
+        assert wait_for(lambda: str(season_dir / "U14") in live.watcher.paths)
+        (season_dir / "U14" / "EigeneToreU14.py").write_text(TEAM_FILE, encoding="utf-8")
+
+        assert wait_for(lambda: ("2024-25", "U14", "eigene_tore") in live.store.segments)
+        assert live.store.goals("U14", "eigene_tore", "2024-25").tolist() == [[34, 90]]
+        assert live.watcher.last_error is None
+    finally:
+        live.watcher.stop()
@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pytest
+from matplotlib.path import Path as PolygonPath
+
+import aka_zones
+from aka_data import CURRENT_SEASON, SIDES, build_event_store
+from aka_zones import (AMBIGUOUS, DEFAULT_ZONES, RASTER_MIN_POINTS, REST_ID, REST_ZONE, ZONE_IDS, ZoneHistograms,
+                       ZoneRaster, classify_zones, get_zone_raster, overlay_membership, zone_counts, zone_membership,
+                       zone_stats)
+
+# Kanten der Standard-Zonen (x bzw. y), auf denen die Raster-Zellen exakt nachgeprüft werden müssen
+EDGES_X = [0, 14, 25, 34, 43, 54, 68]
+EDGES_Y = [0, 75, 84, 90, 100]
+
+# Erwartete Zone für Punkte auf Zonengrenzen: die Ecken aller Rechtecke und
+# Kantenpunkte, an denen sich Zonen berühren (siehe Kommentar zu DEFAULT_ZONES)
+BOUNDARY_POINTS = [
+    # Goldene Zone: alle Kanten inklusiv, y=84 zentral gehört zur Goldenen Zone
+    ((34, 84), "Goldene Zone"), ((25, 84), "Goldene Zone"), ((43, 84), "Goldene Zone"),
+    ((25, 100), "Goldene Zone"), ((43, 100), "Goldene Zone"),
+    # Zone 14: y=84 exklusiv
+    ((34, 83.99), "Zone 14"), ((25, 75), "Zone 14"), ((43, 75), "Zone 14"),
+    # FDl / FDr: Kante zur Zone 14 gehört zur Zone 14, y=84 seitlich zu FDl/FDr
+    ((14, 75), "FDl"), ((14, 84), "FDl"), ((24.99, 84), "FDl"),
+    ((54, 75), "FDr"), ((54, 84), "FDr"), ((43.01, 84), "FDr"),
+    # HFAl / HFAr: x=14 bzw. x=54 gehört zur weiter innen liegenden Zone
+    ((0, 75), "HFAl"), ((0, 90), "HFAl"), ((13.99, 90), "HFAl"), ((14, 90), "ND2l 1/2"),
+    ((68, 75), "HFAr"), ((68, 90), "HFAr"), ((54.01, 90), "HFAr"), ((54, 90), "ND2r 1/2"),
+    # ND2l / ND2r: y=84 exklusiv
+    ((14, 84.01), "ND2l 1/2"), ((14, 100), "ND2l 1/2"), ((25, 100), "Goldene Zone"),
+    ((54, 84.01), "ND2r 1/2"), ((54, 100), "ND2r 1/2"), ((43, 100), "Goldene Zone"),
+    # Knapp außerhalb der Rechtecke
+    ((34, 74.99), REST_ZONE), ((0, 90.01), REST_ZONE), ((68, 90.01), REST_ZONE), ((0, 100), REST_ZONE),
+]
+
+
+@pytest.mark.parametrize("point, zone", BOUNDARY_POINTS)
+def test_classify_zones_boundary_points(point, zone):
+    assert classify_zones([point]).tolist() == [ZONE_IDS[zone]]
+
+
+def test_classify_zones_rectangle_corners_match_bounds():
+    # Jede Ecke eines Rechtecks, deren beide Kanten inklusiv sind, gehört zu diesem Rechteck
+    for zone_id, zone in enumerate(DEFAULT_ZONES[:REST_ID]):
+        x_min, x_min_inc, x_max, x_max_inc, y_min, y_min_inc, y_max, y_max_inc = zone["bounds"]
+        for x, x_inc in ((x_min, x_min_inc), (x_max, x_max_inc)):
+            for y, y_inc in ((y_min, y_min_inc), (y_max, y_max_inc)):
+                if x_inc and y_inc:
+                    assert classify_zones([(x, y)])[0] == zone_id, (zone["name"], x, y)
+
+
+def test_classify_zones_rest_zone_fallback():
+    points = [(34, 50), (0, 0), (68, 74.99), (-5, 95), (70, 80), (34, 101), (np.nan, np.nan)]
+    assert classify_zones(points).tolist() == [REST_ID] * len(points)
+    assert REST_ZONE == DEFAULT_ZONES[REST_ID]["name"]
+    assert classify_zones(np.empty((0, 2))).shape == (0,)
+
+
+def raster_test_points(n_random: int) -> np.ndarray:
+    """Zufällige Punkte (auch außerhalb des Spielfelds) plus Punkte genau auf und knapp neben den Zonenkanten."""
+    rng = np.random.default_rng(12)
+    random_points = np.column_stack((rng.uniform(-2, 70, n_random), rng.uniform(-2, 102, n_random)))
+    offsets = np.array([-1e-9, 0, 1e-9, -0.05, 0.05])
+    along = rng.uniform(-1, 101, 200)
+    on_x = np.array([(x + d, y) for x in EDGES_X for d in offsets for y in along])
+    on_y = np.array([(x, y + d) for y in EDGES_Y for d in offsets for x in along * 0.68])
+    corners = np.array([(x, y) for x in EDGES_X for y in EDGES_Y])
+    return np.concatenate((random_points, on_x, on_y, corners))
+
+
+def test_zone_raster_matches_classify_zones():
+    points = raster_test_points(RASTER_MIN_POINTS)
+    assert len(points) >= RASTER_MIN_POINTS
+
+    ids, member = zone_membership(points)  # ab RASTER_MIN_POINTS über das Raster
+    raster_ids, raster_member = get_zone_raster().lookup(points)
+
+    expected = classify_zones(points)
+    np.testing.assert_array_equal(ids, expected)
+    np.testing.assert_array_equal(raster_ids, expected)
+    np.testing.assert_array_equal(member, overlay_membership(points))
+    np.testing.assert_array_equal(raster_member, overlay_membership(points))
+
+
+def test_zone_raster_marks_boundary_cells_ambiguous():
+    raster = ZoneRaster(resolution=0.5)
+    points = raster_test_points(5000)
+    np.testing.assert_array_equal(raster.classify(points), classify_zones(points))
+    # Zelle [84, 84.5) liegt ganz in der Goldenen Zone; in Zelle [83.5, 84) fällt der
+    # Stützpunkt y=84 in die Goldene Zone, der Rest in Zone 14 -> exakte Nachprüfung
+    assert raster.grid[68, 168] == ZONE_IDS["Goldene Zone"]
+    assert raster.grid[68, 167] == AMBIGUOUS
+    assert raster.grid[68, 166] == ZONE_IDS["Zone 14"]
+    with pytest.raises(ValueError):
+        ZoneRaster(resolution=0.3)
+
+
+def test_zone_raster_matches_overlay_membership(monkeypatch):
+    # Eigene Zone mit schrägen Kanten (Dreieck) statt zonen.json
+    monkeypatch.setattr(aka_zones, "_OVERLAY_PATHS", [PolygonPath([(10, 60), (58, 60), (34, 100)])])
+    raster = ZoneRaster(resolution=0.5)
+    points = np.concatenate((raster_test_points(5000), [(34, 100), (10, 60), (22, 80), (34, 60)]))
+    ids, member = raster.lookup(points)
+    np.testing.assert_array_equal(ids, classify_zones(points))
+    np.testing.assert_array_equal(member, overlay_membership(points))
+    assert member.any() and not member.all()
+
+
+def write_team_file(path, goals, assists, mtime_ns):
+    path.write_text(f"goals = {goals!r}\nassists = {assists!r}\n", encoding="utf-8")
+    # Eigene mtime pro Schritt, damit die Änderung auch bei grober Zeitauflösung erkannt wird
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def assert_histograms_match(histograms, store):
+    histograms.sync(store)
+    teams_data = store.teams_data()
+    expected = zone_stats(teams_data)
+    actual = histograms.zone_stats(list(teams_data))
+    np.testing.assert_array_equal(actual["counts"], expected["counts"])
+    np.testing.assert_array_equal(actual["totals"], expected["totals"])
+
+
+def test_zone_histograms_follow_store_changes(tmp_path):
+    team_dir = tmp_path / "U18"
+    team_dir.mkdir()
+    own = team_dir / "EigeneToreU18.py"
+    conceded = team_dir / "GegentoreU18.py"
+    goals = [(34, 90), (30, 80), (20, 95), (60, 85), (34, 84)]
+    assists = [(10, 80), (34, 78), (50, 60), (5, 99), (25, 75)]
+    write_team_file(own, goals, assists, 1_000_000_000)
+    write_team_file(conceded, [(34, 95), (40, 70)], [(60, 88), (14, 75)], 1_000_000_000)
+    store = build_event_store(str(tmp_path))
+    histograms = ZoneHistograms()
+    assert_histograms_match(histograms, store)
+
+    # Neues Tor am Ende
+    goals.append((43, 84))
+    assists.append((54, 90))
+    write_team_file(own, goals, assists, 2_000_000_000)
+    store = build_event_store(str(tmp_path), previous=store)
+    assert_histograms_match(histograms, store)
+    assert histograms.points((CURRENT_SEASON, "U18", "eigene_tore"), "goals").tolist()[-1] == [43, 84]
+
+    # Tor aus der Mitte gelöscht
+    del goals[2], assists[2]
+    write_team_file(own, goals, assists, 3_000_000_000)
+    store = build_event_store(str(tmp_path), previous=store)
+    assert_histograms_match(histograms, store)
+
+    # Segment gelöscht (Gegentore-Datei entfernt)
+    conceded.unlink()
+    store = build_event_store(str(tmp_path), previous=store)
+    assert_histograms_match(histograms, store)
+    assert histograms.zone_stats(["U18"])["totals"][0, SIDES.index("gegentore")].tolist() == [0, 0]
+
+
+def test_zone_histograms_update_recounts_from_first_difference():
+    histograms = ZoneHistograms()
+    key = ("2024-25", "U18", "eigene_tore")
+    points = [(34, 90), (30, 80), (20, 95), (60, 85)]
+    histograms.update(key, "goals", points)
+    np.testing.assert_array_equal(histograms.counts(key, "goals"), zone_counts(points))
+
+    del points[1]
+    histograms.update(key, "goals", points)
+    np.testing.assert_array_equal(histograms.counts(key, "goals"), zone_counts(points))
+    assert histograms.points(key, "goals").tolist() == [list(p) for p in points]
+
+    histograms.remove(key)
+    assert histograms.counts(key, "goals").sum() == 0
+    assert len(histograms.points(key, "goals")) == 0